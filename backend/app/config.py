@@ -1,5 +1,5 @@
 import os
-from typing import List, Union
+from typing import Dict, List, Union
 from pydantic import AnyHttpUrl, field_validator
 from pydantic_settings import BaseSettings
 
@@ -8,11 +8,31 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = os.getenv("DATABASE_URL", "")
+    # Pool do engine assíncrono (conexões por worker do uvicorn)
+    DATABASE_POOL_SIZE: int = 20
+    DATABASE_MAX_OVERFLOW: int = 20
+    # Réplicas de leitura (app.core.database.RoteadorReplicas), separadas por vírgula.
+    # Para testar localmente: make replica-local (segundo banco na mesma instância)
+    DATABASE_REPLICA_URLS: str = os.getenv("DATABASE_REPLICA_URLS", "")
+    REPLICA_ATRASO_MAX_S: float = 5.0  # acima disso a réplica sai da rotação
+    REPLICA_VERIFICACAO_S: float = 5.0
+    REPLICA_TIMEOUT_S: float = 2.0
     
     # Security
     SECRET_KEY: str = os.getenv("SECRET_KEY", "CHANGE_THIS_IN_PRODUCTION_SECRET_KEY")
     ALGORITHM: str = "HS256"
+    # Rotação de chaves JWT (app.core.tokens): JSON {"kid": "segredo", ...}
+    JWT_KEYS: Dict[str, str] = {}
+    JWT_KID_ATUAL: str = "padrao"
+    # Aceita tokens sem `kid` (anteriores à rotação) verificando com SECRET_KEY.
+    # Só durante a transição: desligue depois de ACCESS_TOKEN_EXPIRE_MINUTES
+    JWT_ACEITAR_SEM_KID: bool = False
+    JWT_CACHE_TAMANHO: int = 10_000
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8  # 8 dias
+    # Bcrypt: custo dos hashes e pool de processos que os calcula
+    BCRYPT_ROUNDS: int = 12
+    HASH_PROCESSOS: int = 2
+    HASH_FILA_POR_PROCESSO: int = 4  # acima disso: 429
     
     # CORS
     # Lista de origens permitidas (frontend)
@@ -26,6 +46,62 @@ class Settings(BaseSettings):
             return v
         raise ValueError(v)
 
+    # Fuso do negócio: expediente da agenda e "hoje" da varredura de parcelas
+    FUSO_HORARIO: str = os.getenv("FUSO_HORARIO", "America/Sao_Paulo")
+
+    # Redis (cache de respostas)
+    REDIS_URL: str = os.getenv("REDIS_URL", "redis://redis:6379/1")
+    DASHBOARD_CACHE_TTL: int = 300  # segundos
+
+    # Cache em disco dos PDFs de pedidos (LRU por tamanho)
+    PDF_CACHE_DIR: str = os.getenv("PDF_CACHE_DIR", "/tmp/marcenaria-pdf-cache")
+    PDF_CACHE_MAX_MB: int = 256
+    # Processos do pool que renderiza a exportação em ZIP
+    PDF_EXPORT_PROCESSOS: int = 2
+
+    # E-mail (app.core.email / app.tasks.email)
+    EMAIL_TRANSPORTE: str = os.getenv("EMAIL_TRANSPORTE", "sendgrid")  # sendgrid | smtp | console
+    MAIL_FROM: str = os.getenv("MAIL_FROM", "noreply@microsaasmarcenaria.com")
+    SENDGRID_API_KEY: str = os.getenv("SENDGRID_API_KEY", "")
+    SENDGRID_API_URL: str = "https://api.sendgrid.com/v3/mail/send"
+    SMTP_HOST: str = "localhost"
+    SMTP_PORT: int = 1025
+    SMTP_USER: str = ""
+    SMTP_PASSWORD: str = ""
+    SMTP_TLS: bool = False
+    EMAIL_LIMITE_POR_MINUTO: int = 60  # por tenant
+
+    # Varredura de parcelas vencidas (app.tasks.parcelas): linhas por UPDATE
+    PARCELAS_ATRASO_LOTE: int = 5000
+
+    # Instrumentação SQL por requisição (app.core.instrumentacao_sql)
+    SQL_N_MAIS_1_REPETICOES: int = 5  # mesmo formato de statement N vezes = provável N+1
+    SQL_ORCAMENTO_PADRAO: int = 20  # consultas por requisição
+    # Rotas que fazem lotes de propósito ("MÉTODO /caminho/do/template")
+    SQL_ORCAMENTO_ROTAS: Dict[str, int] = {
+        "POST /api/clientes/import": 200,
+        "GET /api/documentos/pedidos/exportar": 200,
+    }
+    # Nos testes: estourar o orçamento levanta OrcamentoConsultasExcedido
+    SQL_ORCAMENTO_ESTRITO: bool = False
+
+    # Rate limiting (Redis, janela deslizante por tenant + rota), req/janela
+    RATE_LIMIT_JANELA_S: int = 60
+    RATE_LIMIT_PLANOS: Dict[str, int] = {"anonimo": 60, "padrao": 600, "pro": 1800}
+    # Plano do tenant em cache no Redis: mudança de plano vale em até este prazo
+    # (ou na hora, com invalidar_plano)
+    RATE_LIMIT_PLANO_TTL_S: int = 60
+    # Cotas por rota ("MÉTODO /caminho/do/template") e plano; "padrao" vale
+    # para os planos não listados na rota
+    RATE_LIMIT_ROTAS: Dict[str, Dict[str, int]] = {
+        "POST /api/auth/login": {"padrao": 20},
+        "POST /api/auth/register": {"padrao": 5},
+        "POST /api/clientes/import": {"padrao": 5, "pro": 15},
+        "GET /api/documentos/pedidos/exportar": {"padrao": 5, "pro": 15},
+        "GET /api/export/{entidade}": {"padrao": 10, "pro": 30},
+        "GET /api/test/rate-limit": {"padrao": 3},
+    }
+
     # Sentry & Environment
     SENTRY_DSN: str = os.getenv("SENTRY_DSN", "")
     ENVIRONMENT: str = os.getenv("ENVIRONMENT", "local")
@@ -0,0 +1,154 @@
+# backend/app/core/cache.py
+import asyncio
+import functools
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict
+from uuid import UUID
+
+import redis as redis_sync
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_cliente: redis.Redis | None = None
+_cliente_sync: redis_sync.Redis | None = None
+
+
+def get_redis() -> redis.Redis:
+    """Cliente Redis compartilhado (o pool de conexões é interno ao cliente)."""
+    global _cliente
+    if _cliente is None:
+        _cliente = redis.from_url(settings.REDIS_URL, decode_responses=True)
+    return _cliente
+
+
+def get_redis_sync() -> redis_sync.Redis:
+    """Cliente Redis síncrono, para workers Celery."""
+    global _cliente_sync
+    if _cliente_sync is None:
+        _cliente_sync = redis_sync.from_url(settings.REDIS_URL, decode_responses=True)
+    return _cliente_sync
+
+
+class CacheTenant:
+    """
+    Cache de respostas por tenant no Redis, com TTL e invalidação por geração.
+
+    - Chave do valor: `{namespace}:{tenant}:{geracao}`. Invalidar = INCR na
+      geração, então um recálculo que termina depois da invalidação grava numa
+      geração antiga que nunca mais é lida.
+    - Single-flight: misses concorrentes do mesmo tenant no mesmo processo
+      aguardam o mesmo recálculo, que roda numa task própria: cancelar quem o
+      iniciou (cliente desconectou) não cancela os demais, e se ele falhar um
+      dos que aguardavam recalcula. Entre processos, um lock SET NX faz os
+      demais esperarem o valor ficar pronto.
+    - Se o Redis estiver fora, calcula direto (o cache nunca derruba a rota).
+    """
+
+    def __init__(self, namespace: str, ttl: int, lock_ttl_ms: int = 10_000, espera_lock_s: float = 5.0):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.lock_ttl_ms = lock_ttl_ms
+        self.espera_lock_s = espera_lock_s
+        self._em_voo: Dict[str, asyncio.Task] = {}
+        # Contadores deste processo (expostos em /health/cache)
+        self.metricas = {"hits": 0, "misses": 0, "coalescidas": 0, "erros": 0}
+
+    def _chave_geracao(self, tenant_id: UUID) -> str:
+        return f"{self.namespace}:{tenant_id}:geracao"
+
+    async def obter_ou_calcular(self, tenant_id: UUID, calcular: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            geracao = await get_redis().get(self._chave_geracao(tenant_id)) or "0"
+            chave = f"{self.namespace}:{tenant_id}:{geracao}"
+            bruto = await get_redis().get(chave)
+        except RedisError as exc:
+            self.metricas["erros"] += 1
+            logger.warning("Cache %s indisponível: %s", self.namespace, exc)
+            return await calcular()
+
+        if bruto is not None:
+            self.metricas["hits"] += 1
+            return json.loads(bruto)
+
+        retentou = False
+        while True:
+            tarefa = self._em_voo.get(chave)
+            lider = tarefa is None
+            if lider:
+                self.metricas["misses"] += 1
+                tarefa = asyncio.create_task(self._calcular_com_lock(chave, calcular))
+                self._em_voo[chave] = tarefa
+                tarefa.add_done_callback(functools.partial(self._fim_do_voo, chave))
+            else:
+                self.metricas["coalescidas"] += 1
+            try:
+                return await asyncio.shield(tarefa)
+            except asyncio.CancelledError:
+                if lider and not tarefa.done():
+                    # `calcular` usa a sessão deste chamador: ela só pode
+                    # fechar depois do cálculo (os demais recebem o valor)
+                    await asyncio.wait({tarefa})
+                raise
+            except Exception:
+                if lider or retentou:
+                    raise
+                # Falhou o cálculo de outro chamador: o primeiro a acordar
+                # recalcula com o próprio `calcular` e os demais se juntam a ele
+                retentou = True
+
+    def _fim_do_voo(self, chave: str, tarefa: asyncio.Task) -> None:
+        if self._em_voo.get(chave) is tarefa:
+            del self._em_voo[chave]
+        if not tarefa.cancelled():
+            # Evita "Task exception was never retrieved" quando ninguém aguardava
+            tarefa.exception()
+
+    async def _calcular_com_lock(self, chave: str, calcular: Callable[[], Awaitable[Any]]) -> Any:
+        cliente = get_redis()
+        chave_lock = f"{chave}:lock"
+        try:
+            adquirido = await cliente.set(chave_lock, "1", nx=True, px=self.lock_ttl_ms)
+            if not adquirido:
+                # Outro processo está recalculando: espera o valor aparecer
+                prazo = asyncio.get_running_loop().time() + self.espera_lock_s
+                while asyncio.get_running_loop().time() < prazo:
+                    await asyncio.sleep(0.05)
+                    bruto = await cliente.get(chave)
+                    if bruto is not None:
+                        self.metricas["coalescidas"] += 1
+                        return json.loads(bruto)
+        except RedisError as exc:
+            self.metricas["erros"] += 1
+            logger.warning("Cache %s indisponível: %s", self.namespace, exc)
+            return await calcular()
+
+        try:
+            valor = await calcular()
+        except BaseException:
+            # Libera o lock: quem recalcular não precisa esperar ele expirar
+            if adquirido:
+                try:
+                    await cliente.delete(chave_lock)
+                except RedisError:
+                    pass
+            raise
+        try:
+            await cliente.set(chave, json.dumps(valor), ex=self.ttl)
+            if adquirido:
+                await cliente.delete(chave_lock)
+        except RedisError as exc:
+            self.metricas["erros"] += 1
+            logger.warning("Falha ao gravar cache %s: %s", self.namespace, exc)
+        return valor
+
+    async def invalidar(self, tenant_id: UUID) -> None:
+        try:
+            await get_redis().incr(self._chave_geracao(tenant_id))
+        except RedisError as exc:
+            self.metricas["erros"] += 1
+            logger.warning("Falha ao invalidar cache %s: %s", self.namespace, exc)
@@ -1,5 +1,7 @@
 import os
 from celery import Celery
+from celery.schedules import crontab
+from app.config import settings
 from app.core.sentry import init_sentry
 
 broker_url = os.getenv("CELERY_BROKER_URL", "redis://redis:6379/0")
@@ -9,15 +11,24 @@ celery_app = Celery(
     "microsaas_worker",
     broker=broker_url,
     backend=result_backend,
-    include=["app.tasks.email"]  # Lista de módulos com tarefas
+    include=["app.tasks.email", "app.tasks.pdf", "app.tasks.parcelas"]  # Lista de módulos com tarefas
 )
 
 celery_app.conf.update(
     task_serializer="json",
     accept_content=["json"],
     result_serializer="json",
-    timezone="America/Sao_Paulo",
+    timezone=settings.FUSO_HORARIO,
     enable_utc=True,
+    # Renderização de PDF tem fila e worker próprios (ver celery_pdf no compose)
+    task_routes={"renderizar_pdf_pedido": {"queue": "pdf"}},
+    task_track_started=True,
+    result_expires=3600,
+    # Agendamentos do `celery beat` (um único processo beat; ver docker-compose)
+    beat_schedule={
+        # De hora em hora: a virada do dia é pega logo e a tarefa é idempotente
+        "varrer-parcelas-atrasadas": {"task": "varrer_parcelas_atrasadas", "schedule": crontab(minute=5)},
+    },
 )
 
 # Inicializa o Sentry para o processo do Worker
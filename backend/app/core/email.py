@@ -1,13 +1,206 @@
-import time
-from app.core.celery_app import celery_app
+# backend/app/core/email.py
+"""
+Transportes de e-mail usados pelas tarefas de app.tasks.email.
 
-@celery_app.task(name="enviar_email_boas_vindas")
-def enviar_email_boas_vindas(email: str, nome: str):
+O transporte é escolhido por EMAIL_TRANSPORTE ("sendgrid", "smtp" ou
+"console") e criado uma vez por processo, reaproveitando as conexões entre
+mensagens. Para testar contra um servidor local (MailHog, aiosmtpd, um stub
+HTTP), aponte SMTP_HOST ou SENDGRID_API_URL para ele.
+"""
+import abc
+import base64
+import logging
+import smtplib
+import threading
+from dataclasses import dataclass, field
+from email.message import EmailMessage
+from itertools import groupby
+from typing import Dict, List, Optional
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ErroTransitorioEmail(Exception):
+    """Falha que vale a pena tentar de novo (rede, 429, 5xx)."""
+
+
+class ErroPermanenteEmail(Exception):
+    """Falha que não melhora com retry (destinatário inválido, 4xx)."""
+
+
+@dataclass
+class Anexo:
+    nome: str
+    conteudo: bytes
+    tipo: str = "application/pdf"
+
+
+@dataclass
+class Mensagem:
+    para: str
+    assunto: str
+    html: str
+    anexos: List[Anexo] = field(default_factory=list)
+
+    def conteudo_compartilhado(self) -> tuple:
+        """Mensagens com o mesmo conteúdo podem ir numa só chamada (lote)."""
+        return (self.assunto, self.html, tuple((a.nome, a.conteudo) for a in self.anexos))
+
+
+class TransporteEmail(abc.ABC):
+    @abc.abstractmethod
+    def enviar_lote(self, mensagens: List[Mensagem]) -> None:
+        """Envia as mensagens; levanta ErroTransitorioEmail ou ErroPermanenteEmail."""
+
+    def enviar(self, mensagem: Mensagem) -> None:
+        self.enviar_lote([mensagem])
+
+
+class TransporteConsole(TransporteEmail):
+    """Só registra no log (dev local sem provedor configurado)."""
+
+    def enviar_lote(self, mensagens: List[Mensagem]) -> None:
+        for mensagem in mensagens:
+            logger.info("Email (console) para %s: %s", mensagem.para, mensagem.assunto)
+
+
+class TransporteSendGrid(TransporteEmail):
     """
-    Simula o envio de um e-mail de boas-vindas em background.
+    API v3 do SendGrid num httpx.Client compartilhado (keep-alive). Um lote
+    com o mesmo conteúdo vira uma única chamada com uma personalization por
+    destinatário (até 1000), sem que um veja o endereço do outro.
     """
-    print(f"Iniciando envio de email para {nome} <{email}>...")
-    # Simula delay de rede/SMTP
-    time.sleep(5)
-    print(f"Email enviado com sucesso para {email}!")
-    return {"status": "sent", "email": email}
\ No newline at end of file
+
+    MAX_PERSONALIZATIONS = 1000
+
+    def __init__(self, api_key: str, remetente: str, url: str):
+        self.remetente = remetente
+        self.url = url
+        self.cliente = httpx.Client(
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=httpx.Timeout(10.0, connect=5.0),
+            limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
+        )
+
+    def _payload(self, mensagens: List[Mensagem]) -> Dict:
+        modelo = mensagens[0]
+        payload = {
+            "personalizations": [{"to": [{"email": m.para}]} for m in mensagens],
+            "from": {"email": self.remetente},
+            "subject": modelo.assunto,
+            "content": [{"type": "text/html", "value": modelo.html}],
+        }
+        if modelo.anexos:
+            payload["attachments"] = [
+                {
+                    "content": base64.b64encode(a.conteudo).decode(),
+                    "filename": a.nome,
+                    "type": a.tipo,
+                    "disposition": "attachment",
+                }
+                for a in modelo.anexos
+            ]
+        return payload
+
+    def enviar_lote(self, mensagens: List[Mensagem]) -> None:
+        ordenadas = sorted(mensagens, key=lambda m: m.conteudo_compartilhado())
+        for _, grupo in groupby(ordenadas, key=lambda m: m.conteudo_compartilhado()):
+            grupo = list(grupo)
+            for inicio in range(0, len(grupo), self.MAX_PERSONALIZATIONS):
+                self._post(self._payload(grupo[inicio:inicio + self.MAX_PERSONALIZATIONS]))
+
+    def _post(self, payload: Dict) -> None:
+        try:
+            resposta = self.cliente.post(self.url, json=payload)
+        except httpx.HTTPError as exc:
+            raise ErroTransitorioEmail(str(exc)) from exc
+        if resposta.status_code == 429 or resposta.status_code >= 500:
+            raise ErroTransitorioEmail(f"SendGrid {resposta.status_code}: {resposta.text[:200]}")
+        if resposta.status_code >= 400:
+            raise ErroPermanenteEmail(f"SendGrid {resposta.status_code}: {resposta.text[:200]}")
+
+
+class TransporteSMTP(TransporteEmail):
+    """SMTP com conexão persistente por processo (reconecta se o servidor cair)."""
+
+    def __init__(self, host: str, porta: int, usuario: str, senha: str, tls: bool, remetente: str):
+        self.host, self.porta = host, porta
+        self.usuario, self.senha, self.tls = usuario, senha, tls
+        self.remetente = remetente
+        self._conexao: Optional[smtplib.SMTP] = None
+        self._lock = threading.Lock()
+
+    def _conectar(self) -> smtplib.SMTP:
+        conexao = smtplib.SMTP(self.host, self.porta, timeout=10)
+        if self.tls:
+            conexao.starttls()
+        if self.usuario:
+            conexao.login(self.usuario, self.senha)
+        return conexao
+
+    def _montar(self, mensagem: Mensagem) -> EmailMessage:
+        email = EmailMessage()
+        email["From"] = self.remetente
+        email["To"] = mensagem.para
+        email["Subject"] = mensagem.assunto
+        email.set_content(mensagem.html, subtype="html")
+        for anexo in mensagem.anexos:
+            principal, sub = anexo.tipo.split("/", 1)
+            email.add_attachment(anexo.conteudo, maintype=principal, subtype=sub, filename=anexo.nome)
+        return email
+
+    def enviar_lote(self, mensagens: List[Mensagem]) -> None:
+        with self._lock:
+            for mensagem in mensagens:
+                self._enviar_uma(self._montar(mensagem))
+
+    def _enviar_uma(self, email: EmailMessage) -> None:
+        for tentativa in range(2):
+            try:
+                if self._conexao is None:
+                    self._conexao = self._conectar()
+                self._conexao.send_message(email)
+                return
+            except smtplib.SMTPRecipientsRefused as exc:
+                raise ErroPermanenteEmail(str(exc)) from exc
+            except smtplib.SMTPResponseException as exc:
+                if exc.smtp_code >= 500:
+                    raise ErroPermanenteEmail(str(exc)) from exc
+                raise ErroTransitorioEmail(str(exc)) from exc
+            except OSError as exc:
+                # Conexão ociosa derrubada pelo servidor (SMTPServerDisconnected
+                # também é OSError): reconecta uma vez
+                self._conexao = None
+                if tentativa == 1:
+                    raise ErroTransitorioEmail(str(exc)) from exc
+
+
+_transporte: Optional[TransporteEmail] = None
+
+
+def get_transporte() -> TransporteEmail:
+    """Transporte configurado, um por processo (conexões reaproveitadas)."""
+    global _transporte
+    if _transporte is None:
+        if settings.EMAIL_TRANSPORTE == "sendgrid" and settings.SENDGRID_API_KEY:
+            _transporte = TransporteSendGrid(settings.SENDGRID_API_KEY, settings.MAIL_FROM, settings.SENDGRID_API_URL)
+        elif settings.EMAIL_TRANSPORTE == "smtp":
+            _transporte = TransporteSMTP(
+                settings.SMTP_HOST, settings.SMTP_PORT, settings.SMTP_USER,
+                settings.SMTP_PASSWORD, settings.SMTP_TLS, settings.MAIL_FROM
+            )
+        else:
+            if settings.EMAIL_TRANSPORTE != "console":
+                logger.warning("EMAIL_TRANSPORTE=%s sem credenciais; usando console", settings.EMAIL_TRANSPORTE)
+            _transporte = TransporteConsole()
+    return _transporte
+
+
+def definir_transporte(transporte: TransporteEmail) -> None:
+    """Troca o transporte do processo (stand-ins locais, benchmarks)."""
+    global _transporte
+    _transporte = transporte
@@ -0,0 +1,94 @@
+# backend/app/core/instrumentacao_sql.py
+"""
+Contagem de consultas SQL e tempo de banco por requisição.
+
+Hooks before/after_cursor_execute nos engines (primário, síncrono e
+réplicas) somam cada statement no registro da requisição atual, guardado
+numa ContextVar que o InstrumentacaoSQLMiddleware abre e fecha. Fora de uma
+requisição (Celery, scripts) os hooks não fazem nada.
+
+Formato do statement = SQL com os placeholders normalizados (listas IN de
+qualquer tamanho viram uma só). O mesmo formato repetido
+SQL_N_MAIS_1_REPETICOES vezes ou mais na mesma requisição é um provável N+1
+(ex.: um SELECT por linha de uma listagem).
+"""
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+
+_PLACEHOLDER = re.compile(r"\$\d+|%\(\w+\)s|%s|\?")
+_LISTA = re.compile(r"\(\?(?:::\w+)?(?:, \?(?:::\w+)?)*\)")
+_ESPACOS = re.compile(r"\s+")
+
+
+class OrcamentoConsultasExcedido(AssertionError):
+    """A rota fez mais consultas que o orçamento (só levantada com SQL_ORCAMENTO_ESTRITO, nos testes)."""
+
+
+def formato_statement(statement: str) -> str:
+    sql = _PLACEHOLDER.sub("?", statement)
+    sql = _LISTA.sub("(?...)", sql)
+    return _ESPACOS.sub(" ", sql).strip()
+
+
+@dataclass
+class ConsultasRequisicao:
+    quantidade: int = 0
+    tempo_ms: float = 0.0
+    formatos: Counter = field(default_factory=Counter)
+
+    def registrar(self, statement: str, duracao_ms: float) -> None:
+        self.quantidade += 1
+        self.tempo_ms += duracao_ms
+        self.formatos[formato_statement(statement)] += 1
+
+    def suspeitas_n_mais_1(self) -> List[Tuple[str, int]]:
+        """(formato, repetições) dos statements repetidos acima do limite, mais repetido primeiro."""
+        return [
+            (formato, vezes) for formato, vezes in self.formatos.most_common()
+            if vezes >= settings.SQL_N_MAIS_1_REPETICOES
+        ]
+
+
+_consultas: ContextVar[Optional[ConsultasRequisicao]] = ContextVar("consultas_sql", default=None)
+
+
+def iniciar_registro() -> Tuple[ConsultasRequisicao, object]:
+    registro = ConsultasRequisicao()
+    return registro, _consultas.set(registro)
+
+
+def encerrar_registro(token) -> None:
+    _consultas.reset(token)
+
+
+def orcamento_da_rota(rota: str) -> int:
+    """Orçamento de consultas de "MÉTODO /template" (SQL_ORCAMENTO_ROTAS ou o padrão)."""
+    return settings.SQL_ORCAMENTO_ROTAS.get(rota, settings.SQL_ORCAMENTO_PADRAO)
+
+
+def _antes(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _consultas.get() is not None:
+        context._inicio_consulta = time.perf_counter()
+
+
+def _depois(conn, cursor, statement, parameters, context, executemany):
+    registro = _consultas.get()
+    inicio = getattr(context, "_inicio_consulta", None)
+    if registro is not None and inicio is not None:
+        registro.registrar(statement, (time.perf_counter() - inicio) * 1000)
+
+
+def instrumentar(engine: Engine) -> None:
+    """Liga os hooks num engine síncrono (para AsyncEngine, passe `.sync_engine`)."""
+    if not event.contains(engine, "before_cursor_execute", _antes):
+        event.listen(engine, "before_cursor_execute", _antes)
+        event.listen(engine, "after_cursor_execute", _depois)
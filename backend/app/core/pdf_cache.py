@@ -0,0 +1,146 @@
+# backend/app/core/pdf_cache.py
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from typing import Optional
+from uuid import UUID
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CachePDF:
+    """
+    Cache em disco dos PDFs renderizados, endereçado pelo conteúdo.
+
+    - Caminho: `{diretorio}/{tenant}/{pedido}/{chave}.pdf`, onde a chave já
+      embute updated_at do pedido/cliente e o hash do template; uma versão
+      nova do pedido nunca lê um PDF antigo.
+    - LRU limitado por tamanho: cada leitura atualiza o mtime do arquivo e,
+      quando o total passa de `max_bytes`, os menos usados são apagados. O
+      total é um contador em memória atualizado a cada gravação/invalidação;
+      a árvore só é percorrida na primeira gravação do processo e quando o
+      contador passa do limite (aí o total é recontado, o que também corrige
+      o que outros processos gravaram no mesmo diretório).
+    - Invalidação antecipada: apagar o diretório do pedido quando ele ou seus
+      itens mudam libera o espaço sem esperar a evicção.
+
+    Métodos síncronos (I/O de disco): chamar via run_in_threadpool nas rotas.
+    """
+
+    def __init__(self, diretorio: str, max_bytes: int):
+        self.diretorio = diretorio
+        self.max_bytes = max_bytes
+        self._total: Optional[int] = None  # bytes no diretório; None = ainda não contado
+        self._lock_total = threading.Lock()
+        self._lock_evicao = threading.Lock()
+
+    def _diretorio_pedido(self, tenant_id: UUID, pedido_id: UUID) -> str:
+        return os.path.join(self.diretorio, str(tenant_id), str(pedido_id))
+
+    def obter(self, tenant_id: UUID, pedido_id: UUID, chave: str) -> Optional[bytes]:
+        caminho = os.path.join(self._diretorio_pedido(tenant_id, pedido_id), f"{chave}.pdf")
+        try:
+            with open(caminho, "rb") as arquivo:
+                conteudo = arquivo.read()
+            os.utime(caminho)  # marca como usado recentemente (LRU)
+            return conteudo
+        except FileNotFoundError:
+            return None
+        except OSError as exc:
+            logger.warning("Falha ao ler PDF em cache %s: %s", caminho, exc)
+            return None
+
+    def gravar(self, tenant_id: UUID, pedido_id: UUID, chave: str, conteudo: bytes) -> None:
+        diretorio = self._diretorio_pedido(tenant_id, pedido_id)
+        try:
+            os.makedirs(diretorio, exist_ok=True)
+            # Versões anteriores do mesmo pedido não serão mais lidas (nem a
+            # própria chave, que o os.replace sobrescreve)
+            liberados = 0
+            for nome in os.listdir(diretorio):
+                caminho = os.path.join(diretorio, nome)
+                liberados += self._tamanho(caminho)
+                if nome != f"{chave}.pdf":
+                    os.unlink(caminho)
+            # Escrita atômica: leitores concorrentes nunca veem arquivo pela metade
+            fd, temporario = tempfile.mkstemp(dir=diretorio, suffix=".tmp")
+            with os.fdopen(fd, "wb") as arquivo:
+                arquivo.write(conteudo)
+            os.replace(temporario, os.path.join(diretorio, f"{chave}.pdf"))
+            if self._somar(len(conteudo) - liberados):
+                self._aplicar_limite()
+        except OSError as exc:
+            logger.warning("Falha ao gravar PDF em cache do pedido %s: %s", pedido_id, exc)
+
+    def invalidar(self, tenant_id: UUID, pedido_id: UUID) -> None:
+        diretorio = self._diretorio_pedido(tenant_id, pedido_id)
+        try:
+            liberados = sum(self._tamanho(os.path.join(diretorio, nome)) for nome in os.listdir(diretorio))
+        except OSError:
+            return
+        shutil.rmtree(diretorio, ignore_errors=True)
+        self._somar(-liberados)
+
+    @staticmethod
+    def _tamanho(caminho: str) -> int:
+        try:
+            return os.stat(caminho).st_size
+        except FileNotFoundError:
+            return 0
+
+    def _somar(self, delta: int) -> bool:
+        """Atualiza o contador; True se é preciso recontar (primeira vez ou acima do limite)."""
+        with self._lock_total:
+            if self._total is None:
+                return True
+            self._total = max(0, self._total + delta)
+            return self._total > self.max_bytes
+
+    def _aplicar_limite(self) -> None:
+        """
+        Reconta o diretório e apaga os PDFs menos usados até o total ficar
+        abaixo de 90% do limite. Uma thread por vez; as demais seguem sem
+        esperar (o contador volta a disparar na próxima gravação, se preciso).
+        """
+        if not self._lock_evicao.acquire(blocking=False):
+            return
+        try:
+            total = self._evictar()
+            with self._lock_total:
+                self._total = total
+        finally:
+            self._lock_evicao.release()
+
+    def _evictar(self) -> int:
+        arquivos = []
+        total = 0
+        for raiz, _, nomes in os.walk(self.diretorio):
+            for nome in nomes:
+                caminho = os.path.join(raiz, nome)
+                try:
+                    info = os.stat(caminho)
+                except FileNotFoundError:
+                    continue
+                arquivos.append((info.st_mtime, info.st_size, caminho))
+                total += info.st_size
+
+        if total <= self.max_bytes:
+            return total
+
+        alvo = self.max_bytes * 0.9
+        for _, tamanho, caminho in sorted(arquivos):
+            if total <= alvo:
+                break
+            try:
+                os.unlink(caminho)
+                total -= tamanho
+            except FileNotFoundError:
+                continue
+        return total
+
+
+pdf_cache = CachePDF(settings.PDF_CACHE_DIR, settings.PDF_CACHE_MAX_MB * 1024 * 1024)
@@ -1,26 +1,24 @@
-from datetime import datetime, timedelta
-from typing import Any, Union
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
+from fastapi import HTTPException, status
 from passlib.context import CryptContext
-import jwt
 from app.config import settings
 
 # Configuração do contexto de criptografia (Bcrypt)
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-def create_access_token(subject: Union[str, Any], tenant_id: str, expires_delta: timedelta = None) -> str:
-    """Cria um token JWT de acesso."""
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    
-    to_encode = {
-        "exp": expire, 
-        "sub": str(subject),
-        "tenant_id": str(tenant_id)
-    }
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-    return encoded_jwt
+# min = max = default: hashes com outro custo são regravados no próximo login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+# Pool dedicado ao bcrypt (CPU puro): não segura threads nem o GIL da API
+_pool_hash: Optional[ProcessPoolExecutor] = None
+_hash_em_voo = 0
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifica se a senha em texto plano corresponde ao hash."""
@@ -28,4 +26,54 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     """Gera o hash da senha."""
-    return pwd_context.hash(password)
\ No newline at end of file
+    return pwd_context.hash(password)
+
+
+def _verificar_e_atualizar(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+def _get_pool_hash() -> ProcessPoolExecutor:
+    global _pool_hash
+    if _pool_hash is None:
+        _pool_hash = ProcessPoolExecutor(
+            max_workers=settings.HASH_PROCESSOS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool_hash
+
+
+def encerrar_pool_hash():
+    global _pool_hash
+    if _pool_hash is not None:
+        _pool_hash.shutdown(wait=False, cancel_futures=True)
+        _pool_hash = None
+
+
+async def _no_pool_hash(funcao, *args):
+    """
+    Executa no pool de hash com backpressure: acima de HASH_PROCESSOS *
+    HASH_FILA_POR_PROCESSO operações em andamento responde 429 em vez de
+    enfileirar sem limite.
+    """
+    global _hash_em_voo
+    if _hash_em_voo >= settings.HASH_PROCESSOS * settings.HASH_FILA_POR_PROCESSO:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Muitas autenticações simultâneas, tente novamente",
+            headers={"Retry-After": "1"},
+        )
+    _hash_em_voo += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_get_pool_hash(), funcao, *args)
+    finally:
+        _hash_em_voo -= 1
+
+
+async def verificar_senha(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """(senha confere, novo hash se o armazenado usa parâmetros antigos)."""
+    return await _no_pool_hash(_verificar_e_atualizar, plain_password, hashed_password)
+
+
+async def gerar_hash_senha(password: str) -> str:
+    return await _no_pool_hash(get_password_hash, password)
\ No newline at end of file
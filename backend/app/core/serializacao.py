@@ -0,0 +1,51 @@
+# backend/app/core/serializacao.py
+"""
+Caminho rápido de serialização das respostas.
+
+- validar_lista: ORM -> modelos *Read em uma única validação, por um
+  TypeAdapter(List[X]) criado uma vez por tipo (lru_cache).
+- RespostaJSON: codifica com orjson (UUID, datetime, date e Enum nativos;
+  Decimal como string, igual ao JSON do Pydantic).
+
+Uma rota que devolve RespostaJSON pula a revalidação contra o
+response_model e o jsonable_encoder do FastAPI; o response_model continua
+no decorator só para o OpenAPI.
+"""
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, List, Sequence, Type, TypeVar
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+M = TypeVar("M", bound=BaseModel)
+
+
+@lru_cache(maxsize=None)
+def adaptador_lista(modelo: Type[M]) -> TypeAdapter:
+    return TypeAdapter(List[modelo])
+
+
+def validar_lista(modelo: Type[M], linhas: Sequence[Any]) -> List[M]:
+    """Converte linhas ORM em modelos com from_attributes, sem laço em Python."""
+    return adaptador_lista(modelo).validate_python(linhas, from_attributes=True)
+
+
+def _padrao(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f"Tipo não serializável: {type(obj).__name__}")
+
+
+def para_json(conteudo: Any) -> bytes:
+    return orjson.dumps(conteudo, default=_padrao, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
+
+
+class RespostaJSON(JSONResponse):
+    """JSONResponse com orjson; aceita modelos Pydantic já validados."""
+
+    def render(self, content: Any) -> bytes:
+        return para_json(content)
@@ -0,0 +1,118 @@
+# backend/app/core/tokens.py
+"""
+Emissão e verificação de JWTs (único módulo de tokens da aplicação).
+
+- Chaves por `kid`: JWT_KEYS mapeia kid -> segredo e JWT_KID_ATUAL assina
+  os tokens novos. Para rotacionar, adicione a chave nova, troque o kid
+  atual e remova a antiga depois que os tokens dela expirarem. Tokens sem
+  `kid` (emitidos antes da rotação existir) são recusados, a menos que
+  JWT_ACEITAR_SEM_KID esteja ligado; aí são verificados com SECRET_KEY.
+- Cache LRU limitado das claims já verificadas, pela digest SHA-256 do
+  token e válido só até o `exp`: a assinatura de um token é conferida uma
+  vez por processo, não a cada requisição.
+
+Sem dependência de FastAPI: usado pelo auth_middleware e por tarefas Celery.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple, Union
+
+from jose import JWTError, jwt
+
+from app.config import settings
+
+
+class TokenInvalido(Exception):
+    """Assinatura, kid, expiração ou claims obrigatórias inválidas."""
+
+
+def _chaves() -> Dict[str, str]:
+    return settings.JWT_KEYS or {settings.JWT_KID_ATUAL: settings.SECRET_KEY}
+
+
+def criar_token(
+    subject: Union[str, Any],
+    tenant_id: Union[str, Any],
+    expires_delta: Optional[timedelta] = None,
+    plano: Optional[str] = None
+) -> str:
+    """JWT de acesso assinado com a chave atual (kid no header)."""
+    expire = datetime.utcnow() + (expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
+    claims = {"exp": expire, "sub": str(subject), "tenant_id": str(tenant_id)}
+    if plano:
+        claims["plano"] = plano
+    kid = settings.JWT_KID_ATUAL
+    return jwt.encode(claims, _chaves()[kid], algorithm=settings.ALGORITHM, headers={"kid": kid})
+
+
+class _CacheClaims:
+    """LRU thread-safe (threadpool da API, threads de worker) de claims verificadas."""
+
+    def __init__(self, tamanho: int):
+        self.tamanho = tamanho
+        self._itens: "OrderedDict[bytes, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obter(self, digest: bytes) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            item = self._itens.get(digest)
+            if item is None:
+                return None
+            claims, exp = item
+            if exp <= time.time():
+                del self._itens[digest]
+                return None
+            self._itens.move_to_end(digest)
+            return claims
+
+    def guardar(self, digest: bytes, claims: Dict[str, Any], exp: float) -> None:
+        with self._lock:
+            self._itens[digest] = (claims, exp)
+            self._itens.move_to_end(digest)
+            while len(self._itens) > self.tamanho:
+                self._itens.popitem(last=False)
+
+    def limpar(self) -> None:
+        with self._lock:
+            self._itens.clear()
+
+
+_cache = _CacheClaims(settings.JWT_CACHE_TAMANHO)
+
+
+def _verificar_assinatura(token: str) -> Dict[str, Any]:
+    try:
+        kid = jwt.get_unverified_header(token).get("kid")
+        if kid:
+            chave = _chaves().get(kid)
+            if chave is None:
+                raise TokenInvalido("kid desconhecido")
+        elif settings.JWT_ACEITAR_SEM_KID:
+            chave = settings.SECRET_KEY
+        else:
+            raise TokenInvalido("Token sem kid")
+        claims = jwt.decode(token, chave, algorithms=[settings.ALGORITHM])
+    except JWTError as exc:
+        raise TokenInvalido(str(exc)) from exc
+
+    if not claims.get("sub") or not claims.get("tenant_id") or "exp" not in claims:
+        raise TokenInvalido("Claims obrigatórias ausentes")
+    return claims
+
+
+def verificar_token(token: str) -> Dict[str, Any]:
+    """Claims do token (sub, tenant_id, exp); levanta TokenInvalido."""
+    digest = hashlib.sha256(token.encode()).digest()
+    claims = _cache.obter(digest)
+    if claims is None:
+        claims = _verificar_assinatura(token)
+        _cache.guardar(digest, claims, float(claims["exp"]))
+    return claims
+
+
+def limpar_cache_tokens() -> None:
+    """Esquece as claims em cache (ex.: depois de remover uma chave comprometida)."""
+    _cache.limpar()
@@ -1,26 +1,44 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from app.routes import clientes, auth, pedidos, pagamentos, compromissos, test_rate_limit
-from app.middleware.cors import setup_cors
-from app.middleware.auth import auth_middleware
+from app.routes import clientes, auth, pedidos, pagamentos, compromissos, financeiro, documentos, exportacao, rate_limit_demo
+from app.middleware.pipeline import montar_middlewares
 from app.middleware.rate_limiter import setup_rate_limiter
-from app.middleware.security import setup_security_headers
-from app.middleware.error_handler import http_error_handler
-from starlette.exceptions import ExceptionMiddleware
 from app.core.sentry import init_sentry
 from app.core.logging import setup_logging
+from app.services.financeiro_service import dashboard_cache
+from app.services.exportacao_service import encerrar_pool
+from app.core.security import encerrar_pool_hash
+from app.core.serializacao import RespostaJSON
+from app.core.database import encerrar_monitor_replicas, iniciar_monitor_replicas
+from app.services.notificacao_service import NotificacaoService
 
 setup_logging() # Configura logs antes de tudo
 init_sentry() # Chame antes de criar a instância 'app = FastAPI()'
 
 
-app = FastAPI(title="MicroSaaS Marcenaria API", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    iniciar_monitor_replicas()  # verificação periódica das réplicas de leitura
+    try:
+        yield
+    finally:
+        encerrar_pool()  # processos de render da exportação em ZIP
+        encerrar_pool_hash()  # processos do bcrypt
+        await encerrar_monitor_replicas()
+
+
+# Middlewares: pilha ASGI pura, em ordem (ver app/middleware/pipeline.py)
+app = FastAPI(
+    title="MicroSaaS Marcenaria API",
+    version="1.0.0",
+    lifespan=lifespan,
+    middleware=montar_middlewares(),
+    default_response_class=RespostaJSON,  # orjson (app/core/serializacao.py)
+)
 
-# Middlewares
-setup_cors(app)
+# Erros não tratados -> 500 JSON: ErrosInesperadosMiddleware, na pipeline
 setup_rate_limiter(app)
-setup_security_headers(app)
-app.add_middleware(ExceptionMiddleware, handlers={500: http_error_handler})
-app.middleware("http")(auth_middleware)
 
 # Routers
 app.include_router(auth.router, prefix="/api/auth")
@@ -28,9 +46,22 @@ app.include_router(clientes.router, prefix="/api")
 app.include_router(pedidos.router, prefix="/api")
 app.include_router(pagamentos.router, prefix="/api")
 app.include_router(compromissos.router, prefix="/api")
-app.include_router(test_rate_limit.router, prefix="/api/test")
+app.include_router(financeiro.router, prefix="/api")
+app.include_router(documentos.router, prefix="/api")
+app.include_router(exportacao.router, prefix="/api")
+app.include_router(rate_limit_demo.router, prefix="/api/test")
 
 @app.get("/health", tags=["Health"])
 async def health_check():
     """Verifica se a API está online."""
     return {"status": "ok"}
+
+@app.get("/health/cache", tags=["Health"])
+async def cache_metrics():
+    """Contadores de hit/miss do cache do dashboard (por processo)."""
+    return {"financeiro_dashboard": dashboard_cache.metricas}
+
+@app.get("/health/email", tags=["Health"])
+async def email_metrics():
+    """Vazão, latência de fila e falhas do pipeline de e-mails."""
+    return await NotificacaoService().metricas()
@@ -1,45 +1,55 @@
 # app/middleware/auth.py
-from fastapi import Request, HTTPException
-from fastapi.security import HTTPBearer
-import jwt
-from app.config import settings
-from app.core.database import SessionLocal
+import json
 
-async def auth_middleware(request: Request, call_next):
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.tokens import TokenInvalido, verificar_token
+
+_RESPOSTA_401 = json.dumps({"detail": "Invalid token"}).encode()
+
+
+class AuthMiddleware:
     """
+    Middleware ASGI puro:
     1. Extrai JWT do header
-    2. Valida assinatura
-    3. Injeta tenant_id e user_id no request.state
-    4. Define variável PostgreSQL app.current_tenant_id para RLS
+    2. Valida assinatura (cacheada por token em app.core.tokens)
+    3. Injeta tenant_id, user_id e plano no scope["state"] (request.state)
+
+    O app.current_tenant_id (RLS) é definido por transação na própria sessão
+    entregue à rota (ver TenantSession em app/core/database.py).
     """
-    token = request.headers.get("Authorization", "")
-    if not token.startswith("Bearer "):
-        # Bypass for public endpoints if needed, or raise error
-        return await call_next(request)
-
-    token = token.replace("Bearer ", "")
-    
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        request.state.tenant_id = payload.get("tenant_id")
-        request.state.user_id = payload.get("sub")
-        
-        if not request.state.tenant_id or not request.state.user_id:
-            raise HTTPException(status_code=401, detail="Invalid token payload")
-
-        # Define o tenant_id para a sessão do banco de dados (RLS)
-        # Esta é uma abordagem simplificada. Em produção, isso deve ser
-        # gerenciado de forma mais robusta, talvez em uma dependência.
-        db = SessionLocal()
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        autorizacao = next((valor for nome, valor in scope["headers"] if nome == b"authorization"), b"")
+        if not autorizacao.startswith(b"Bearer "):
+            # Rotas públicas seguem sem tenant; as protegidas barram em get_current_tenant_id
+            await self.app(scope, receive, send)
+            return
+
         try:
-            # O ideal é fazer isso por transação, não globalmente.
-            db.execute(f"SET app.current_tenant_id = '{request.state.tenant_id}'")
-        finally:
-            db.close()
-        
-    except jwt.PyJWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
-    
-    response = await call_next(request)
-    return response
+            payload = verificar_token(autorizacao[7:].decode("latin-1"))
+        except TokenInvalido:
+            await send({
+                "type": "http.response.start",
+                "status": 401,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(_RESPOSTA_401)).encode()),
+                    (b"www-authenticate", b"Bearer"),
+                ],
+            })
+            await send({"type": "http.response.body", "body": _RESPOSTA_401})
+            return
 
+        estado = scope.setdefault("state", {})
+        estado["tenant_id"] = payload["tenant_id"]
+        estado["user_id"] = payload["sub"]
+        estado["plano"] = payload.get("plano", "padrao")
+        await self.app(scope, receive, send)
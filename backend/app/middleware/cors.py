@@ -1,18 +1,18 @@
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi import FastAPI
+from starlette.middleware import Middleware
 from app.config import settings
 
-def setup_cors(app: FastAPI) -> None:
+def cors_middleware() -> Middleware:
     """
-    Configura o middleware de CORS com base nas configurações.
+    Middleware de CORS com base nas configurações.
     """
     # Converte para lista de strings para o FastAPI
     origins = [str(origin) for origin in settings.BACKEND_CORS_ORIGINS]
 
-    app.add_middleware(
+    return Middleware(
         CORSMiddleware,
         allow_origins=origins,
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
-    )
\ No newline at end of file
+    )
@@ -1,13 +1,57 @@
 # backend/app/middleware/error_handler.py
+import json
 import logging
-from fastapi import Request, status
-from fastapi.responses import JSONResponse
+
+import sentry_sdk
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 logger = logging.getLogger(__name__)
 
-async def http_error_handler(request: Request, exc: Exception):
-    logger.exception(exc)
-    return JSONResponse(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content={"detail": "Internal Server Error"},
-    )
+_RESPOSTA_500 = json.dumps({"detail": "Internal Server Error"}).encode()
+
+
+class ErrosInesperadosMiddleware:
+    """
+    Middleware ASGI puro: erro não tratado -> 500 JSON, dentro da pilha.
+
+    Um exception handler de `Exception` no app roda no ServerErrorMiddleware,
+    por fora de todas as middlewares: o 500 sairia sem headers CORS (o
+    navegador esconderia o erro do frontend) e sem os de segurança. Aqui,
+    logo abaixo do CORS e dos headers de segurança, o 500 passa pelos dois.
+
+    Se a resposta já tinha começado (ex.: streaming), não há o que mandar:
+    o erro é relançado e a conexão é encerrada pelo servidor.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        iniciada = False
+
+        async def send_marcando(message: Message):
+            nonlocal iniciada
+            if message["type"] == "http.response.start":
+                iniciada = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_marcando)
+        except Exception as exc:
+            if iniciada:
+                raise
+            logger.exception("Erro não tratado em %s %s", scope.get("method"), scope.get("path"))
+            sentry_sdk.capture_exception(exc)
+            await send({
+                "type": "http.response.start",
+                "status": 500,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(_RESPOSTA_500)).encode()),
+                ],
+            })
+            await send({"type": "http.response.body", "body": _RESPOSTA_500})
@@ -0,0 +1,78 @@
+# backend/app/middleware/instrumentacao_sql.py
+import time
+
+import structlog
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.core.instrumentacao_sql import (
+    OrcamentoConsultasExcedido,
+    encerrar_registro,
+    iniciar_registro,
+    orcamento_da_rota,
+)
+
+logger = structlog.get_logger(__name__)
+
+
+class InstrumentacaoSQLMiddleware:
+    """
+    Middleware ASGI puro: conta as consultas SQL e o tempo de banco da
+    requisição (app.core.instrumentacao_sql) e devolve em `Server-Timing`
+    (db = banco, app = total até o início da resposta).
+
+    Ao fim da requisição registra no log a rota, as consultas, o tempo e os
+    prováveis N+1. Acima do orçamento da rota (SQL_ORCAMENTO_ROTAS /
+    SQL_ORCAMENTO_PADRAO) vira warning; com SQL_ORCAMENTO_ESTRITO (testes)
+    levanta OrcamentoConsultasExcedido e o teste falha.
+
+    Respostas em streaming: o header só tem o que rodou antes do primeiro
+    byte; o log tem tudo.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        inicio = time.perf_counter()
+        registro, token = iniciar_registro()
+
+        async def send_com_timing(message: Message):
+            if message["type"] == "http.response.start":
+                total_ms = (time.perf_counter() - inicio) * 1000
+                timing = (
+                    f'db;dur={registro.tempo_ms:.1f};desc="{registro.quantidade} consultas", '
+                    f"app;dur={total_ms:.1f}"
+                )
+                message["headers"] = list(message.get("headers", [])) + [(b"server-timing", timing.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_com_timing)
+        finally:
+            encerrar_registro(token)
+
+        rota_atual = scope.get("route")
+        rota = f"{scope['method']} {rota_atual.path if rota_atual is not None else scope['path']}"
+        orcamento = orcamento_da_rota(rota)
+        suspeitas = registro.suspeitas_n_mais_1()
+        excedeu = registro.quantidade > orcamento
+
+        nivel = logger.warning if excedeu or suspeitas else logger.info
+        nivel(
+            "consultas_sql",
+            rota=rota,
+            consultas=registro.quantidade,
+            tempo_db_ms=round(registro.tempo_ms, 1),
+            orcamento=orcamento,
+            n_mais_1=[{"vezes": vezes, "sql": formato[:200]} for formato, vezes in suspeitas],
+        )
+        if excedeu and settings.SQL_ORCAMENTO_ESTRITO:
+            raise OrcamentoConsultasExcedido(
+                f"{rota}: {registro.quantidade} consultas (orçamento {orcamento}); "
+                f"mais repetidas: {registro.formatos.most_common(3)}"
+            )
@@ -0,0 +1,38 @@
+# backend/app/middleware/pipeline.py
+from typing import List
+
+from starlette.middleware import Middleware
+
+from app.middleware.auth import AuthMiddleware
+from app.middleware.cors import cors_middleware
+from app.middleware.error_handler import ErrosInesperadosMiddleware
+from app.middleware.instrumentacao_sql import InstrumentacaoSQLMiddleware
+from app.middleware.rate_limiter import RateLimitHeadersMiddleware
+from app.middleware.security import SecurityHeadersMiddleware
+
+
+def montar_middlewares() -> List[Middleware]:
+    """
+    Pilha de middlewares, da mais externa para a mais interna (todas ASGI
+    puras: nenhuma bufferiza o corpo nem cria task extra por requisição).
+
+    1. CORS: responde preflights e põe os headers CORS até em 401/429/500.
+    2. Headers de segurança (SEC-05).
+    3. Erros não tratados: 500 JSON ainda dentro da pilha (com CORS e os
+       headers de segurança).
+    4. Instrumentação SQL: consultas/tempo de banco, Server-Timing e N+1.
+    5. Autenticação: tenant/usuário/plano do JWT em request.state.
+    6. Headers X-RateLimit-*, calculados depois pelo rate limiter.
+
+    Depois do roteamento vêm o rate limiter (dependência global, precisa do
+    template da rota; guarda os headers em request.state) e os exception
+    handlers registrados no app.
+    """
+    return [
+        cors_middleware(),
+        Middleware(SecurityHeadersMiddleware),
+        Middleware(ErrosInesperadosMiddleware),
+        Middleware(InstrumentacaoSQLMiddleware),
+        Middleware(AuthMiddleware),
+        Middleware(RateLimitHeadersMiddleware),
+    ]
@@ -1,17 +1,192 @@
-from fastapi import FastAPI
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
-from slowapi.middleware import SlowAPIMiddleware
+# backend/app/middleware/rate_limiter.py
+import logging
+import time
+from dataclasses import dataclass
+
+from fastapi import Depends, FastAPI, HTTPException, Request, status
+from redis.exceptions import RedisError
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.core.cache import get_redis
+from app.core.database import AsyncSessionLocal
+from app.models.tenant import Tenant
+
+logger = logging.getLogger(__name__)
+
+# Janela deslizante aproximada (contador da janela atual + anterior ponderada),
+# verificada e incrementada atomicamente numa única ida ao Redis.
+# KEYS[1] = janela atual, KEYS[2] = janela anterior
+# ARGV[1] = limite, ARGV[2] = tamanho da janela (ms), ARGV[3] = ms decorridos na atual
+LUA_JANELA_DESLIZANTE = """
+local limite = tonumber(ARGV[1])
+local janela = tonumber(ARGV[2])
+local decorrido = tonumber(ARGV[3])
+local atual = tonumber(redis.call('GET', KEYS[1]) or '0')
+local anterior = tonumber(redis.call('GET', KEYS[2]) or '0')
+local estimado = anterior * (janela - decorrido) / janela + atual
+if estimado + 1 > limite then
+    return {0, 0}
+end
+if redis.call('INCR', KEYS[1]) == 1 then
+    redis.call('PEXPIRE', KEYS[1], janela * 2)
+end
+return {1, math.floor(limite - estimado - 1)}
+"""
+
+_script = None
+
+
+def _get_script():
+    """Script registrado uma vez: EVALSHA nas chamadas seguintes."""
+    global _script
+    if _script is None:
+        _script = get_redis().register_script(LUA_JANELA_DESLIZANTE)
+    return _script
+
+
+@dataclass
+class ResultadoLimite:
+    permitido: bool
+    limite: int
+    restante: int
+    reset_s: int
+
+
+async def verificar_limite(identidade: str, rota: str, limite: int) -> ResultadoLimite:
+    janela_ms = settings.RATE_LIMIT_JANELA_S * 1000
+    agora_ms = int(time.time() * 1000)
+    indice, decorrido = divmod(agora_ms, janela_ms)
+    # Hash tag {...}: as duas janelas caem no mesmo slot num Redis Cluster
+    base = f"rl:{{{identidade}|{rota}}}"
+    permitido, restante = await _get_script()(
+        keys=[f"{base}:{indice}", f"{base}:{indice - 1}"],
+        args=[limite, janela_ms, decorrido],
+    )
+    reset_s = max(1, -(-(janela_ms - decorrido) // 1000))
+    return ResultadoLimite(bool(permitido), limite, max(0, int(restante)), reset_s)
+
+
+def _chave_plano(tenant_id) -> str:
+    return f"plano:{tenant_id}"
+
+
+async def _plano_no_banco(tenant_id) -> str | None:
+    async with AsyncSessionLocal(info={"tenant_id": tenant_id}) as db:
+        return (await db.execute(select(Tenant.plano).where(Tenant.id == tenant_id))).scalar_one_or_none()
+
+
+async def plano_do_tenant(tenant_id, padrao: str = "padrao") -> str:
+    """
+    Plano atual do tenant, do Redis (TTL curto) ou do banco no miss. O claim
+    `plano` do JWT vale 8 dias e só serve de `padrao` se o banco falhar.
+    RedisError sobe para o chamador (o limitador libera a requisição).
+    """
+    cliente = get_redis()
+    plano = await cliente.get(_chave_plano(tenant_id))
+    if plano is not None:
+        return plano
+    try:
+        plano = await _plano_no_banco(tenant_id)
+    except SQLAlchemyError as exc:
+        logger.warning("Plano do tenant %s indisponível: %s", tenant_id, exc)
+        return padrao
+    plano = plano or padrao
+    await cliente.set(_chave_plano(tenant_id), plano, ex=settings.RATE_LIMIT_PLANO_TTL_S)
+    return plano
+
+
+async def invalidar_plano(tenant_id) -> None:
+    """Chamar ao mudar tenants.plano: a cota nova vale na próxima requisição."""
+    try:
+        await get_redis().delete(_chave_plano(tenant_id))
+    except RedisError as exc:
+        logger.warning("Falha ao invalidar plano do tenant %s: %s", tenant_id, exc)
+
+
+def _cota(request: Request, rota: str) -> tuple[str, int]:
+    tenant_id = getattr(request.state, "tenant_id", None)
+    if tenant_id:
+        identidade = f"t:{tenant_id}"
+        plano = getattr(request.state, "plano", "padrao")
+    else:
+        # Sem token: por IP (atrás de proxy, rode o uvicorn com --proxy-headers)
+        identidade = f"ip:{request.client.host if request.client else 'desconhecido'}"
+        plano = "anonimo"
+    # Cota da rota para o plano, senão a da rota para "padrao", senão a do plano
+    por_plano = settings.RATE_LIMIT_ROTAS.get(rota, {})
+    planos = settings.RATE_LIMIT_PLANOS
+    limite = por_plano.get(plano) or por_plano.get("padrao") or planos.get(plano) or planos["padrao"]
+    return identidade, limite
+
+
+async def limitar_requisicao(request: Request):
+    """
+    Dependência global: cota por tenant (plano atual, ver plano_do_tenant) e
+    rota. Os headers X-RateLimit-* ficam em request.state e o
+    RateLimitHeadersMiddleware os põe na resposta. Se o Redis cair, libera a
+    requisição.
+    """
+    rota_atual = request.scope.get("route")
+    if rota_atual is None or rota_atual.path.startswith("/health"):
+        return
+    rota = f"{request.method} {rota_atual.path}"
+
+    try:
+        tenant_id = getattr(request.state, "tenant_id", None)
+        if tenant_id:
+            request.state.plano = await plano_do_tenant(tenant_id, getattr(request.state, "plano", "padrao"))
+        identidade, limite = _cota(request, rota)
+        resultado = await verificar_limite(identidade, rota, limite)
+    except RedisError as exc:
+        logger.warning("Rate limiter indisponível: %s", exc)
+        return
+
+    request.state.rate_limit_headers = [
+        (b"x-ratelimit-limit", str(resultado.limite).encode()),
+        (b"x-ratelimit-remaining", str(resultado.restante).encode()),
+        (b"x-ratelimit-reset", str(resultado.reset_s).encode()),
+    ]
+    if not resultado.permitido:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Limite de requisições excedido",
+            headers={"Retry-After": str(resultado.reset_s)},
+        )
+
+
+class RateLimitHeadersMiddleware:
+    """
+    Middleware ASGI puro que copia os headers X-RateLimit-* guardados pelo
+    limitar_requisicao (scope["state"]) para o http.response.start. Fica na
+    camada ASGI porque o `response.headers` da dependência só vale quando a
+    rota devolve um dict/modelo; Response própria (RespostaJSON, PDF, ZIP,
+    streaming) o ignoraria.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_com_headers(message: Message):
+            if message["type"] == "http.response.start":
+                headers = scope.get("state", {}).get("rate_limit_headers")
+                if headers:
+                    message["headers"] = list(message.get("headers", [])) + headers
+            await send(message)
+
+        await self.app(scope, receive, send_com_headers)
 
-# Instância global do Limiter para ser importada nos routers (ex: auth)
-# key_func=get_remote_address usa o IP do cliente como chave de identificação
-limiter = Limiter(key_func=get_remote_address)
 
 def setup_rate_limiter(app: FastAPI):
     """
-    Configura o Rate Limiting na aplicação FastAPI.
+    Configura o Rate Limiting na aplicação FastAPI (Redis, compartilhado
+    entre workers). Chamar antes de incluir os routers.
     """
-    app.state.limiter = limiter
-    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-    app.add_middleware(SlowAPIMiddleware)
\ No newline at end of file
+    app.router.dependencies.append(Depends(limitar_requisicao))
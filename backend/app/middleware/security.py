@@ -1,22 +1,38 @@
-from fastapi import FastAPI, Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-def setup_security_headers(app: FastAPI):
+# Recomendação do relatório de auditoria de segurança (SEC-05)
+HEADERS_SEGURANCA = [
+    # Proteção contra Clickjacking (impede que o site seja aberto em iframe)
+    (b"x-frame-options", b"DENY"),
+    # Proteção contra MIME Sniffing
+    (b"x-content-type-options", b"nosniff"),
+    # HSTS (HTTP Strict Transport Security) - Força HTTPS por 1 ano
+    # Nota: Em ambiente local (HTTP), navegadores modernos podem ignorar para localhost
+    (b"strict-transport-security", b"max-age=31536000; includeSubDomains"),
+]
+
+
+class SecurityHeadersMiddleware:
     """
-    Configura middleware para adicionar headers de segurança HTTP nas respostas.
-    Recomendação do relatório de auditoria de segurança (SEC-05).
+    Middleware ASGI puro que adiciona headers de segurança HTTP nas respostas.
+    Só altera a mensagem http.response.start; o corpo passa direto (inclusive
+    respostas em streaming).
     """
-    @app.middleware("http")
-    async def add_security_headers(request: Request, call_next):
-        response = await call_next(request)
-        
-        # Proteção contra Clickjacking (impede que o site seja aberto em iframe)
-        response.headers["X-Frame-Options"] = "DENY"
-        
-        # Proteção contra MIME Sniffing
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        
-        # HSTS (HTTP Strict Transport Security) - Força HTTPS por 1 ano
-        # Nota: Em ambiente local (HTTP), navegadores modernos podem ignorar para localhost
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-        
-        return response
\ No newline at end of file
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_com_headers(message: Message):
+            if message["type"] == "http.response.start":
+                nomes = {nome for nome, _ in HEADERS_SEGURANCA}
+                message["headers"] = [
+                    (nome, valor) for nome, valor in message.get("headers", []) if nome.lower() not in nomes
+                ] + HEADERS_SEGURANCA
+            await send(message)
+
+        await self.app(scope, receive, send_com_headers)
@@ -1,6 +1,6 @@
 # app/models/base.py
 import uuid
-from sqlalchemy import Column, DateTime, UUID
+from sqlalchemy import Column, DateTime, Integer, UUID
 from sqlalchemy.orm import declarative_base
 from datetime import datetime
 
@@ -13,4 +13,13 @@ class BaseModel(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     tenant_id = Column(UUID(as_uuid=True), nullable=False, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
\ No newline at end of file
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class VersaoMixin:
+    """Versão da linha para controle otimista de concorrência (ver app/repos/escrita.py)"""
+    versao = Column(Integer, nullable=False, default=1, server_default="1")
+
+
+def valores_enum(enum_cls):
+    """Grava o valor ("Pendente") e não o nome do membro (pendente) nas colunas Enum."""
+    return [membro.value for membro in enum_cls]
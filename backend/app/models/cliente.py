@@ -1,7 +1,7 @@
 from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Enum
-from .base import BaseModel
+from .base import BaseModel, VersaoMixin
 
-class Cliente(BaseModel):
+class Cliente(VersaoMixin, BaseModel):
     """Cliente do marceneiro"""
     __tablename__ = "clientes"
     
@@ -1,9 +1,9 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Computed
 from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID
-from app.models.base import BaseModel
+from sqlalchemy.dialects.postgresql import UUID, TSRANGE
+from app.models.base import BaseModel, VersaoMixin
 
-class Compromisso(BaseModel):
+class Compromisso(VersaoMixin, BaseModel):
     """Compromissos da agenda (Visitas, Instalações, Medições)"""
     __tablename__ = "compromissos"
 
@@ -13,6 +13,8 @@ class Compromisso(BaseModel):
     status = Column(String(50), default='Agendado')  # Ex: 'Agendado', 'Concluído', 'Cancelado'
     data_hora_inicio = Column(DateTime, nullable=False)
     data_hora_fim = Column(DateTime, nullable=False)
+    # Intervalo [inicio, fim) gerado pelo banco; indexado com GiST (tenant_id, periodo)
+    periodo = Column(TSRANGE, Computed("tsrange(data_hora_inicio, data_hora_fim, '[)')", persisted=True))
     
     local = Column(String(255))
     endereco = Column(String(500))
@@ -2,7 +2,7 @@
 from sqlalchemy import Column, String, DECIMAL, Integer, ForeignKey
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
-from uuid import UUID
+from sqlalchemy.dialects.postgresql import UUID
 
 class ItemPedido(BaseModel):
     __tablename__ = "itens_pedido"
@@ -1,8 +1,9 @@
 # backend/app/models/pagamento.py
-from sqlalchemy import Column, String, Enum, DateTime, Numeric, ForeignKey
+from sqlalchemy import Column, String, Enum as SAEnum, DateTime, Numeric, ForeignKey
 from sqlalchemy.orm import relationship
-from app.models.base import BaseModel
-from uuid import UUID
+from app.models.base import BaseModel, VersaoMixin, valores_enum
+from sqlalchemy.dialects.postgresql import UUID
+from enum import Enum
 from datetime import datetime
 
 class MetodoPagamento(str, Enum):
@@ -18,15 +19,15 @@ class StatusPagamento(str, Enum):
     cancelado = "Cancelado"
     estornado = "Estornado"
 
-class Pagamento(BaseModel):
+class Pagamento(VersaoMixin, BaseModel):
     """Representa um pagamento realizado para um pedido."""
     __tablename__ = "pagamentos"
 
     pedido_id = Column(UUID(as_uuid=True), ForeignKey('pedidos.id'), nullable=False)
     valor = Column(Numeric(12, 2), nullable=False)
     data_pagamento = Column(DateTime, default=datetime.utcnow, nullable=False)
-    metodo = Column(Enum(MetodoPagamento), nullable=False)
-    status = Column(Enum(StatusPagamento), default=StatusPagamento.pago, nullable=False)
+    metodo = Column(SAEnum(MetodoPagamento, values_callable=valores_enum), nullable=False)
+    status = Column(SAEnum(StatusPagamento, values_callable=valores_enum), default=StatusPagamento.pago, nullable=False)
     comprovante_url = Column(String, nullable=True) # URL do comprovante em S3, por exemplo
 
     pedido = relationship("Pedido", back_populates="pagamentos")
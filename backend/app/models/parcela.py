@@ -1,8 +1,9 @@
 # backend/app/models/parcela.py
-from sqlalchemy import Column, String, Enum, Date, Numeric, ForeignKey, Integer
+from sqlalchemy import Column, String, Enum as SAEnum, Date, Numeric, ForeignKey, Integer
 from sqlalchemy.orm import relationship
-from app.models.base import BaseModel
-from uuid import UUID
+from app.models.base import BaseModel, VersaoMixin, valores_enum
+from sqlalchemy.dialects.postgresql import UUID
+from enum import Enum
 from datetime import date
 
 class StatusParcela(str, Enum):
@@ -11,7 +12,7 @@ class StatusParcela(str, Enum):
     atrasada = "Atrasada"
     cancelada = "Cancelada"
 
-class Parcela(BaseModel):
+class Parcela(VersaoMixin, BaseModel):
     """Representa uma parcela de pagamento de um pedido."""
     __tablename__ = "parcelas"
 
@@ -20,6 +21,6 @@ class Parcela(BaseModel):
     valor_parcela = Column(Numeric(12, 2), nullable=False)
     data_vencimento = Column(Date, nullable=False)
     data_pagamento = Column(Date, nullable=True) # Data em que a parcela foi realmente paga
-    status = Column(Enum(StatusParcela), default=StatusParcela.pendente, nullable=False)
+    status = Column(SAEnum(StatusParcela, values_callable=valores_enum), default=StatusParcela.pendente, nullable=False)
     
     pedido = relationship("Pedido", back_populates="parcelas")
@@ -1,8 +1,8 @@
 from sqlalchemy import Column, String, Enum, Date, DateTime, Numeric, ForeignKey, Integer, UUID
 from sqlalchemy.orm import relationship
-from .base import BaseModel
+from .base import BaseModel, VersaoMixin
 
-class Pedido(BaseModel):
+class Pedido(VersaoMixin, BaseModel):
     """Pedido/Ordem de trabalho"""
     __tablename__ = "pedidos"
     
@@ -26,6 +26,8 @@ class Pedido(BaseModel):
     valor_desconto = Column(Numeric(12, 2), default=0)
     valor_total = Column(Numeric(12, 2), default=0)
 
+    # Relação com Cliente (usada na geração do PDF)
+    cliente = relationship("Cliente")
     # Relação com ItemPedido
     itens = relationship("ItemPedido", back_populates="pedido", cascade="all, delete-orphan")
     # Relação com Pagamento
@@ -8,4 +8,6 @@ class Tenant(Base):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String, nullable=False)
-    # Outros campos específicos do tenant, como plano, etc.
+    # Plano contratado: define a cota do rate limiter (RATE_LIMIT_PLANOS)
+    plano = Column(String(50), nullable=False, default="padrao", server_default="padrao")
+    # Outros campos específicos do tenant
@@ -0,0 +1,18 @@
+# backend/app/models/venda_mensal.py
+from sqlalchemy import Column, String, Date, Integer, Numeric, UUID
+from app.models.base import Base
+
+class VendaMensal(Base):
+    """
+    Rollup mensal de pedidos por tenant e status (dashboard financeiro).
+
+    Mantido pelos triggers de `pedidos` (migration 011); não deve ser escrito
+    pela aplicação. Reconstrução/verificação: `python rollup_vendas.py`.
+    """
+    __tablename__ = "vendas_mensais"
+
+    tenant_id = Column(UUID(as_uuid=True), primary_key=True)
+    mes = Column(Date, primary_key=True)  # Primeiro dia do mês (created_at do pedido)
+    status = Column(String(50), primary_key=True)
+    qtd_pedidos = Column(Integer, nullable=False, default=0)
+    valor_total = Column(Numeric(14, 2), nullable=False, default=0)
@@ -1,51 +1,109 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import somente_leitura
 from app.models.cliente import Cliente
+from app.repos import escrita
 from app.schemas.cliente import ClienteCreate, ClienteUpdate
+from app.utils.paginacao import paginar
 from uuid import UUID
+from typing import Optional, Sequence, Tuple
+from datetime import datetime
+
+# Colunas da tabela temporária de importação (ordem dos registros do COPY)
+COLUNAS_IMPORTACAO = ("linha", "nome", "tipo", "cpf_cnpj", "email", "telefone_ddd", "endereco", "cep", "cidade", "uf")
 
 class ClienteRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
-    
-    def criar(self, tenant_id: UUID, schema: ClienteCreate) -> Cliente:
-        db_cliente = Cliente(
-            tenant_id=tenant_id,
-            **schema.model_dump()
-        )
-        self.db.add(db_cliente)
-        self.db.commit()
-        self.db.refresh(db_cliente)
+
+    async def criar(self, tenant_id: UUID, schema: ClienteCreate) -> Cliente:
+        db_cliente = await escrita.inserir(self.db, Cliente, {"tenant_id": tenant_id, **schema.model_dump()})
+        await self.db.commit()
         return db_cliente
-    
-    def listar(self, tenant_id: UUID, skip: int = 0, limit: int = 10) -> list[Cliente]:
-        return self.db.query(Cliente).filter(
-            Cliente.tenant_id == tenant_id
-        ).offset(skip).limit(limit).all()
-    
-    def obter_por_id(self, tenant_id: UUID, cliente_id: UUID) -> Cliente | None:
-        return self.db.query(Cliente).filter(
-            Cliente.tenant_id == tenant_id,
-            Cliente.id == cliente_id
-        ).first()
-    
-    def atualizar(self, tenant_id: UUID, cliente_id: UUID, schema: ClienteUpdate) -> Cliente | None:
-        db_cliente = self.obter_por_id(tenant_id, cliente_id)
-        if not db_cliente:
-            return None
-        
-        update_data = schema.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(db_cliente, key, value)
-        
-        self.db.commit()
-        self.db.refresh(db_cliente)
+
+    @somente_leitura
+    async def listar(self, tenant_id: UUID, skip: int = 0, limit: int = 10, cursor: Optional[str] = None) -> list[Cliente]:
+        query = select(Cliente).where(Cliente.tenant_id == tenant_id)
+        result = await self.db.execute(paginar(query, Cliente, skip, limit, cursor))
+        return list(result.scalars().all())
+
+    @somente_leitura
+    async def obter_por_id(self, tenant_id: UUID, cliente_id: UUID) -> Cliente | None:
+        result = await self.db.execute(
+            select(Cliente).where(
+                Cliente.tenant_id == tenant_id,
+                Cliente.id == cliente_id
+            )
+        )
+        return result.scalars().first()
+
+    async def atualizar(self, tenant_id: UUID, cliente_id: UUID, schema: ClienteUpdate) -> Cliente | None:
+        """UPDATE ... RETURNING; levanta escrita.ConflitoVersao se `schema.versao` estiver desatualizada."""
+        db_cliente = await escrita.atualizar(
+            self.db, Cliente, tenant_id, cliente_id,
+            schema.model_dump(exclude_unset=True, exclude={'versao'}), schema.versao
+        )
+        await self.db.commit()
         return db_cliente
-    
-    def deletar(self, tenant_id: UUID, cliente_id: UUID) -> bool:
-        db_cliente = self.obter_por_id(tenant_id, cliente_id)
-        if not db_cliente:
-            return False
-        
-        self.db.delete(db_cliente)
-        self.db.commit()
-        return True
+
+    async def deletar(self, tenant_id: UUID, cliente_id: UUID) -> bool:
+        removido = await escrita.remover(self.db, Cliente, tenant_id, cliente_id)
+        await self.db.commit()
+        return removido
+
+    # --- Importação em massa (COPY -> tabela temporária -> merge) ---
+
+    async def preparar_importacao(self):
+        """Tabela temporária com os tipos de `clientes` (inclusive o enum de tipo), descartada no COMMIT."""
+        await self.db.execute(text("""
+            CREATE TEMP TABLE clientes_importacao ON COMMIT DROP AS
+            SELECT 0 AS linha, nome, tipo, cpf_cnpj, email, telefone_ddd, endereco, cep, cidade, uf
+            FROM clientes WITH NO DATA
+        """))
+
+    async def copiar_para_importacao(self, registros: Sequence[tuple]):
+        """COPY binário (asyncpg) de um lote, na mesma transação da sessão."""
+        conexao = await self.db.connection()
+        bruta = await conexao.get_raw_connection()
+        await bruta.driver_connection.copy_records_to_table(
+            "clientes_importacao", records=registros, columns=COLUNAS_IMPORTACAO
+        )
+
+    async def mesclar_importacao(self, tenant_id: UUID) -> Tuple[int, int]:
+        """
+        Aplica a importação em `clientes` e faz o commit; devolve (inseridos, atualizados).
+
+        O CPF/CNPJ identifica o cliente dentro do tenant: os já cadastrados
+        são atualizados, os demais inseridos. Repetidos na planilha: vale a
+        última linha.
+        """
+        # Estatísticas da tabela temporária logo após os COPYs: sem elas o
+        # planejador não sabe o tamanho dela nem no self-join do DELETE
+        await self.db.execute(text("ANALYZE clientes_importacao"))
+        await self.db.execute(text("""
+            DELETE FROM clientes_importacao a
+            USING clientes_importacao b
+            WHERE a.cpf_cnpj = b.cpf_cnpj AND a.linha < b.linha
+        """))
+
+        parametros = {"tenant_id": tenant_id, "agora": datetime.utcnow()}
+        atualizados = await self.db.execute(text("""
+            UPDATE clientes c
+            SET nome = i.nome, tipo = i.tipo, email = i.email, telefone_ddd = i.telefone_ddd,
+                endereco = i.endereco, cep = i.cep, cidade = i.cidade, uf = i.uf, updated_at = :agora,
+                versao = c.versao + 1
+            FROM clientes_importacao i
+            WHERE c.tenant_id = :tenant_id AND c.cpf_cnpj = i.cpf_cnpj
+        """), parametros)
+        inseridos = await self.db.execute(text("""
+            INSERT INTO clientes (id, tenant_id, nome, tipo, cpf_cnpj, email, telefone_ddd,
+                                  endereco, cep, cidade, uf, ativo, created_at, updated_at)
+            SELECT gen_random_uuid(), :tenant_id, i.nome, i.tipo, i.cpf_cnpj, i.email, i.telefone_ddd,
+                   i.endereco, i.cep, i.cidade, i.uf, true, :agora, :agora
+            FROM clientes_importacao i
+            WHERE NOT EXISTS (
+                SELECT 1 FROM clientes c WHERE c.tenant_id = :tenant_id AND c.cpf_cnpj = i.cpf_cnpj
+            )
+        """), parametros)
+        await self.db.commit()
+        return inseridos.rowcount, atualizados.rowcount
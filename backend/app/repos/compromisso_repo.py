@@ -1,36 +1,32 @@
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_, between
+from sqlalchemy import select, and_, func, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import somente_leitura
+from sqlalchemy.orm import joinedload
 from app.models.compromisso import Compromisso
+from app.repos import escrita
 from app.schemas.compromisso import CompromissoCreate, CompromissoUpdate
+from app.utils.paginacao import paginar
 from uuid import UUID
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime
 
 class CompromissoRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def criar(self, tenant_id: UUID, schema: CompromissoCreate) -> Compromisso:
-        db_compromisso = Compromisso(
-            tenant_id=tenant_id,
-            titulo=schema.titulo,
-            descricao=schema.descricao,
-            tipo=schema.tipo,
-            status=schema.status,
-            data_hora_inicio=schema.data_hora_inicio,
-            data_hora_fim=schema.data_hora_fim,
-            cliente_id=schema.cliente_id,
-            pedido_id=schema.pedido_id,
-            local=schema.local,
-            endereco=schema.endereco,
-            observacoes=schema.observacoes,
+    def _query_base(self):
+        return select(Compromisso).options(
+            joinedload(Compromisso.cliente),
+            joinedload(Compromisso.pedido)
         )
-        self.db.add(db_compromisso)
-        self.db.commit()
-        self.db.refresh(db_compromisso)
+
+    async def criar(self, tenant_id: UUID, schema: CompromissoCreate) -> Compromisso:
+        db_compromisso = await escrita.inserir(self.db, Compromisso, {"tenant_id": tenant_id, **schema.model_dump()})
+        await self.db.commit()
         return db_compromisso
 
-    def listar(
+    @somente_leitura
+    async def listar(
         self,
         tenant_id: UUID,
         skip: int = 0,
@@ -40,88 +36,107 @@ class CompromissoRepository:
         status: Optional[str] = None,
         tipo: Optional[str] = None,
         data_inicio: Optional[datetime] = None,
-        data_fim: Optional[datetime] = None
+        data_fim: Optional[datetime] = None,
+        cursor: Optional[str] = None
     ) -> List[Compromisso]:
-        query = self.db.query(Compromisso).options(
-            joinedload(Compromisso.cliente),
-            joinedload(Compromisso.pedido)
-        ).filter(Compromisso.tenant_id == tenant_id)
+        query = self._query_base().where(Compromisso.tenant_id == tenant_id)
 
         if cliente_id:
-            query = query.filter(Compromisso.cliente_id == cliente_id)
+            query = query.where(Compromisso.cliente_id == cliente_id)
 
         if pedido_id:
-            query = query.filter(Compromisso.pedido_id == pedido_id)
+            query = query.where(Compromisso.pedido_id == pedido_id)
 
         if status:
-            query = query.filter(Compromisso.status == status)
+            query = query.where(Compromisso.status == status)
 
         if tipo:
-            query = query.filter(Compromisso.tipo == tipo)
+            query = query.where(Compromisso.tipo == tipo)
 
         if data_inicio and data_fim:
-            query = query.filter(
+            query = query.where(
                 and_(
                     Compromisso.data_hora_inicio >= data_inicio,
                     Compromisso.data_hora_inicio <= data_fim
                 )
             )
 
-        return query.offset(skip).limit(limit).all()
+        result = await self.db.execute(paginar(query, Compromisso, skip, limit, cursor))
+        return list(result.scalars().all())
 
-    def obter_por_id(self, tenant_id: UUID, compromisso_id: UUID) -> Optional[Compromisso]:
-        return self.db.query(Compromisso).options(
-            joinedload(Compromisso.cliente),
-            joinedload(Compromisso.pedido)
-        ).filter(
-            Compromisso.tenant_id == tenant_id,
-            Compromisso.id == compromisso_id
-        ).first()
-
-    def atualizar(self, tenant_id: UUID, compromisso_id: UUID, schema: CompromissoUpdate) -> Optional[Compromisso]:
-        db_compromisso = self.obter_por_id(tenant_id, compromisso_id)
-        if not db_compromisso:
-            return None
-
-        update_data = schema.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(db_compromisso, key, value)
+    @somente_leitura
+    async def obter_por_id(self, tenant_id: UUID, compromisso_id: UUID) -> Optional[Compromisso]:
+        result = await self.db.execute(
+            self._query_base().where(
+                Compromisso.tenant_id == tenant_id,
+                Compromisso.id == compromisso_id
+            )
+        )
+        return result.scalars().first()
 
-        self.db.commit()
-        self.db.refresh(db_compromisso)
+    async def atualizar(self, tenant_id: UUID, compromisso_id: UUID, schema: CompromissoUpdate) -> Optional[Compromisso]:
+        """UPDATE ... RETURNING; levanta escrita.ConflitoVersao se `schema.versao` estiver desatualizada."""
+        db_compromisso = await escrita.atualizar(
+            self.db, Compromisso, tenant_id, compromisso_id,
+            schema.model_dump(exclude_unset=True, exclude={'versao'}), schema.versao
+        )
+        await self.db.commit()
         return db_compromisso
 
-    def deletar(self, tenant_id: UUID, compromisso_id: UUID) -> bool:
-        db_compromisso = self.obter_por_id(tenant_id, compromisso_id)
-        if not db_compromisso:
-            return False
-
-        self.db.delete(db_compromisso)
-        self.db.commit()
-        return True
+    async def deletar(self, tenant_id: UUID, compromisso_id: UUID) -> bool:
+        removido = await escrita.remover(self.db, Compromisso, tenant_id, compromisso_id)
+        await self.db.commit()
+        return removido
 
-    def listar_por_periodo(self, tenant_id: UUID, data_inicio: datetime, data_fim: datetime) -> List[Compromisso]:
+    @somente_leitura
+    async def listar_por_periodo(self, tenant_id: UUID, data_inicio: datetime, data_fim: datetime) -> List[Compromisso]:
         """Retorna compromissos que ocorrem dentro do período especificado"""
-        return self.db.query(Compromisso).options(
-            joinedload(Compromisso.cliente),
-            joinedload(Compromisso.pedido)
-        ).filter(
+        # Uma única sondagem && no índice GiST (tenant_id, periodo)
+        result = await self.db.execute(
+            self._query_base().where(
+                Compromisso.tenant_id == tenant_id,
+                Compromisso.periodo.overlaps(func.tsrange(data_inicio, data_fim, '[]'))
+            ).order_by(Compromisso.data_hora_inicio)
+        )
+        return list(result.scalars().all())
+
+    @somente_leitura
+    async def listar_intervalos_ocupados(self, tenant_id: UUID, data_inicio: datetime, data_fim: datetime) -> List[Tuple[datetime, datetime]]:
+        """(início, fim) dos compromissos não cancelados no período, ordenados por início."""
+        result = await self.db.execute(
+            select(Compromisso.data_hora_inicio, Compromisso.data_hora_fim).where(
+                Compromisso.tenant_id == tenant_id,
+                Compromisso.periodo.overlaps(func.tsrange(data_inicio, data_fim, '[)')),
+                Compromisso.status != 'Cancelado'
+            ).order_by(Compromisso.data_hora_inicio)
+        )
+        return [tuple(linha) for linha in result.all()]
+
+    async def bloquear_agenda(self, tenant_id: UUID) -> None:
+        """
+        Serializa verificação + escrita de compromissos do tenant até o fim da
+        transação (advisory lock), evitando que dois agendamentos simultâneos
+        passem pela checagem de conflito.
+        """
+        await self.db.execute(
+            text("SELECT pg_advisory_xact_lock(hashtextextended(:chave, 0))"),
+            {"chave": f"agenda:{tenant_id}"}
+        )
+
+    async def obter_conflito(
+        self,
+        tenant_id: UUID,
+        data_inicio: datetime,
+        data_fim: datetime,
+        ignorar_id: Optional[UUID] = None
+    ) -> Optional[Compromisso]:
+        """Primeiro compromisso não cancelado que sobrepõe [data_inicio, data_fim)."""
+        query = select(Compromisso).where(
             Compromisso.tenant_id == tenant_id,
-            or_(
-                # Compromissos que começam dentro do período
-                and_(
-                    Compromisso.data_hora_inicio >= data_inicio,
-                    Compromisso.data_hora_inicio <= data_fim
-                ),
-                # Compromissos que terminam dentro do período
-                and_(
-                    Compromisso.data_hora_fim >= data_inicio,
-                    Compromisso.data_hora_fim <= data_fim
-                ),
-                # Compromissos que abrangem todo o período
-                and_(
-                    Compromisso.data_hora_inicio <= data_inicio,
-                    Compromisso.data_hora_fim >= data_fim
-                )
-            )
-        ).all()
+            Compromisso.periodo.overlaps(func.tsrange(data_inicio, data_fim, '[)')),
+            Compromisso.status != 'Cancelado'
+        )
+        if ignorar_id:
+            query = query.where(Compromisso.id != ignorar_id)
+        result = await self.db.execute(query.order_by(Compromisso.data_hora_inicio).limit(1))
+        return result.scalars().first()
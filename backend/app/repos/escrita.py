@@ -0,0 +1,74 @@
+# backend/app/repos/escrita.py
+"""
+Escritas dos repositórios em um round trip cada.
+
+INSERT ... RETURNING e UPDATE ... WHERE tenant_id = ... RETURNING devolvem a
+linha gravada (defaults, updated_at) sem o ciclo add -> commit -> refresh
+ou obter_por_id -> setattr -> commit -> refresh. Lotes vão num INSERT
+multi-linha (insertmanyvalues). O commit fica com o repositório.
+
+Controle otimista: os modelos com `versao` (VersaoMixin) têm a versão
+incrementada em todo UPDATE; se o cliente enviar a versão que leu, o UPDATE
+só casa com ela e ConflitoVersao indica que o registro mudou no meio tempo.
+"""
+from typing import Any, Dict, List, Optional, Sequence, Type, TypeVar
+from uuid import UUID
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+M = TypeVar("M")
+
+
+class ConflitoVersao(Exception):
+    """A versão enviada não é mais a atual: outra edição foi gravada antes."""
+
+
+async def inserir(db: AsyncSession, modelo: Type[M], valores: Dict[str, Any]) -> M:
+    return await db.scalar(insert(modelo).values(**valores).returning(modelo))
+
+
+async def inserir_em_lote(db: AsyncSession, modelo: Type[M], linhas: Sequence[Dict[str, Any]]) -> List[M]:
+    """Um INSERT multi-linha com RETURNING, na ordem de `linhas`."""
+    if not linhas:
+        return []
+    resultado = await db.scalars(insert(modelo).returning(modelo, sort_by_parameter_order=True), list(linhas))
+    return list(resultado)
+
+
+async def atualizar(
+    db: AsyncSession,
+    modelo: Type[M],
+    tenant_id: UUID,
+    id: UUID,
+    valores: Dict[str, Any],
+    versao: Optional[int] = None
+) -> Optional[M]:
+    """
+    UPDATE da linha do tenant; None se não existir. Com `versao`, levanta
+    ConflitoVersao se a linha existe mas em outra versão (a leitura extra
+    só acontece nesse caso).
+    """
+    condicoes = [modelo.tenant_id == tenant_id, modelo.id == id]
+    if hasattr(modelo, "versao"):
+        valores = {**valores, "versao": modelo.versao + 1}
+        if versao is not None:
+            condicoes.append(modelo.versao == versao)
+
+    obj = await db.scalar(
+        update(modelo).where(*condicoes).values(**valores).returning(modelo)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+    if obj is None and versao is not None:
+        existe = await db.scalar(select(modelo.id).where(modelo.tenant_id == tenant_id, modelo.id == id))
+        if existe:
+            raise ConflitoVersao()
+    return obj
+
+
+async def remover(db: AsyncSession, modelo: Type[M], tenant_id: UUID, id: UUID) -> bool:
+    resultado = await db.execute(
+        delete(modelo).where(modelo.tenant_id == tenant_id, modelo.id == id)
+        .execution_options(synchronize_session=False)
+    )
+    return resultado.rowcount > 0
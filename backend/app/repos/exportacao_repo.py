@@ -0,0 +1,88 @@
+# backend/app/repos/exportacao_repo.py
+from sqlalchemy import Select, select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.cliente import Cliente
+from app.models.pagamento import Pagamento
+from app.models.parcela import Parcela
+from app.models.pedido import Pedido
+from uuid import UUID
+from datetime import date, datetime, time
+from typing import AsyncIterator, List, Optional, Sequence
+
+# Entidade -> (modelo, coluna de data usada no filtro de período)
+ENTIDADES_EXPORTACAO = {
+    "pedidos": (Pedido, Pedido.created_at),
+    "pagamentos": (Pagamento, Pagamento.data_pagamento),
+    "parcelas": (Parcela, Parcela.data_vencimento),
+}
+
+
+def status_validos(entidade: str) -> List[str]:
+    """Valores aceitos no filtro `status` da entidade (os do Enum da coluna)."""
+    modelo, _ = ENTIDADES_EXPORTACAO[entidade]
+    return list(modelo.__table__.c.status.type.enums)
+
+
+class ExportacaoRepository:
+    """Consultas de exportação: só colunas (sem objetos ORM), lidas por cursor no servidor."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    def consulta(
+        self,
+        entidade: str,
+        tenant_id: UUID,
+        pedido_id: Optional[UUID] = None,
+        cliente_id: Optional[UUID] = None,
+        status: Optional[str] = None,
+        data_inicio: Optional[date] = None,
+        data_fim: Optional[date] = None
+    ) -> Select:
+        modelo, coluna_data = ENTIDADES_EXPORTACAO[entidade]
+        if modelo is Pedido:
+            query = select(
+                Pedido.id, Pedido.numero, Pedido.status, Pedido.cliente_id,
+                Cliente.nome.label("cliente_nome"), Pedido.referencia,
+                Pedido.data_inicio, Pedido.data_fim_prevista, Pedido.data_fim_real,
+                Pedido.valor_subtotal, Pedido.valor_desconto, Pedido.valor_total,
+                Pedido.created_at, Pedido.updated_at,
+            ).join(Cliente, Cliente.id == Pedido.cliente_id)
+        elif modelo is Pagamento:
+            query = select(
+                Pagamento.id, Pagamento.pedido_id, Pedido.numero.label("pedido_numero"),
+                Cliente.nome.label("cliente_nome"), Pagamento.valor, Pagamento.data_pagamento,
+                Pagamento.metodo, Pagamento.status, Pagamento.comprovante_url,
+                Pagamento.created_at, Pagamento.updated_at,
+            ).join(Pedido, Pedido.id == Pagamento.pedido_id).join(Cliente, Cliente.id == Pedido.cliente_id)
+        else:
+            query = select(
+                Parcela.id, Parcela.pedido_id, Pedido.numero.label("pedido_numero"),
+                Cliente.nome.label("cliente_nome"), Parcela.numero_parcela, Parcela.valor_parcela,
+                Parcela.data_vencimento, Parcela.data_pagamento, Parcela.status,
+                Parcela.created_at, Parcela.updated_at,
+            ).join(Pedido, Pedido.id == Parcela.pedido_id).join(Cliente, Cliente.id == Pedido.cliente_id)
+
+        query = query.where(modelo.tenant_id == tenant_id)
+        if pedido_id:
+            query = query.where(Pedido.id == pedido_id)
+        if cliente_id:
+            query = query.where(Pedido.cliente_id == cliente_id)
+        if status:
+            query = query.where(modelo.status == status)
+        if data_inicio:
+            query = query.where(coluna_data >= datetime.combine(data_inicio, time.min))
+        if data_fim:
+            query = query.where(coluna_data <= datetime.combine(data_fim, time.max))
+        # Mesma ordenação das listagens (índices de keyset da migration 009)
+        return query.order_by(modelo.created_at, modelo.id)
+
+    async def transmitir(self, query: Select, lote: int) -> AsyncIterator[Sequence[Row]]:
+        """
+        Linhas em lotes de `lote`, por cursor no servidor (stream_results +
+        yield_per): a memória fica em um lote, qualquer que seja o total.
+        """
+        result = await self.db.stream(query.execution_options(yield_per=lote))
+        async for linhas in result.partitions():
+            yield linhas
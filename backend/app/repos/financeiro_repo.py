@@ -0,0 +1,143 @@
+# backend/app/repos/financeiro_repo.py
+from sqlalchemy import select, func, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import somente_leitura
+from app.models.venda_mensal import VendaMensal
+from uuid import UUID
+from typing import List, Optional, Tuple
+from datetime import date
+
+# Status que não contam como venda no dashboard ('' = pedido sem status)
+STATUS_FORA_DAS_VENDAS = ('Cancelado', '')
+
+# Agregação da tabela crua, mesma regra de mês/status dos triggers da migration 011
+_AGREGADO_PEDIDOS = """
+    SELECT tenant_id, vendas_mensais_mes(created_at) AS mes, COALESCE(status::text, '') AS status,
+           count(*) AS qtd_pedidos, COALESCE(sum(valor_total), 0) AS valor_total
+    FROM pedidos
+    WHERE (CAST(:tenant_id AS uuid) IS NULL OR tenant_id = CAST(:tenant_id AS uuid))
+    GROUP BY 1, 2, 3
+"""
+
+# Fluxo de caixa: um round trip, uma linha com arrays paralelos (dias desde
+# :inicio, centavos) do que cai na janela; o atraso anterior a :inicio já vem somado.
+_EM_ABERTO = "tenant_id = :tenant_id AND status::text IN ('Pendente', 'Atrasada')"
+_COLUNAS_FLUXO_CAIXA = f"""
+    WITH previstas AS (
+        SELECT data_vencimento - CAST(:inicio AS date) AS dia, (valor_parcela * 100)::bigint AS centavos
+        FROM parcelas
+        WHERE {_EM_ABERTO}
+          AND data_vencimento >= CAST(:inicio AS date) AND data_vencimento < CAST(:fim AS date)
+    ), recebidos AS (
+        SELECT CAST(data_pagamento AS date) - CAST(:inicio AS date) AS dia, (valor * 100)::bigint AS centavos
+        FROM pagamentos
+        WHERE tenant_id = :tenant_id
+          AND status::text = 'Pago'
+          AND data_pagamento >= CAST(:inicio AS date) AND data_pagamento < CAST(:fim AS date)
+    )
+    SELECT
+        (SELECT COALESCE(array_agg(dia), '{{}}') FROM previstas) AS previstas_dia,
+        (SELECT COALESCE(array_agg(centavos), '{{}}') FROM previstas) AS previstas_centavos,
+        (SELECT COALESCE(array_agg(dia), '{{}}') FROM recebidos) AS recebidos_dia,
+        (SELECT COALESCE(array_agg(centavos), '{{}}') FROM recebidos) AS recebidos_centavos,
+        (SELECT COALESCE(sum(valor_parcela) * 100, 0)::bigint FROM parcelas
+         WHERE {_EM_ABERTO} AND data_vencimento < CAST(:inicio AS date)) AS em_atraso_centavos
+"""
+
+class FinanceiroRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    @somente_leitura
+    async def resumo_vendas(self, tenant_id: UUID) -> tuple:
+        """(total_vendas, qtd_pedidos) de pedidos não cancelados, somando O(meses) linhas."""
+        result = await self.db.execute(
+            select(
+                func.coalesce(func.sum(VendaMensal.valor_total), 0),
+                func.coalesce(func.sum(VendaMensal.qtd_pedidos), 0)
+            ).where(
+                VendaMensal.tenant_id == tenant_id,
+                VendaMensal.status.notin_(STATUS_FORA_DAS_VENDAS)
+            )
+        )
+        return tuple(result.one())
+
+    @somente_leitura
+    async def vendas_por_mes(self, tenant_id: UUID, desde: date) -> List:
+        result = await self.db.execute(
+            select(
+                VendaMensal.mes,
+                func.sum(VendaMensal.valor_total).label('total')
+            ).where(
+                VendaMensal.tenant_id == tenant_id,
+                VendaMensal.mes >= desde,
+                VendaMensal.status.notin_(STATUS_FORA_DAS_VENDAS)
+            ).group_by(VendaMensal.mes).order_by(VendaMensal.mes)
+        )
+        return result.all()
+
+    @somente_leitura
+    async def pedidos_por_status(self, tenant_id: UUID) -> dict:
+        result = await self.db.execute(
+            select(
+                VendaMensal.status,
+                func.sum(VendaMensal.qtd_pedidos)
+            ).where(
+                VendaMensal.tenant_id == tenant_id
+            ).group_by(VendaMensal.status)
+        )
+        return {status: int(qtd) for status, qtd in result.all() if qtd}
+
+    @somente_leitura
+    async def colunas_fluxo_caixa(self, tenant_id: UUID, inicio: date, fim: date) -> Tuple[List[int], List[int], List[int], List[int], int]:
+        """
+        (dias, centavos) das parcelas em aberto que vencem em [inicio, fim) e
+        dos pagamentos recebidos no mesmo intervalo, como listas paralelas,
+        mais o total em aberto vencido antes de `inicio` (centavos).
+        """
+        result = await self.db.execute(
+            text(_COLUNAS_FLUXO_CAIXA), {"tenant_id": tenant_id, "inicio": inicio, "fim": fim}
+        )
+        return tuple(result.one())
+
+    async def reconstruir_rollup(self, tenant_id: Optional[UUID] = None) -> int:
+        """
+        Recalcula o rollup a partir de `pedidos` (todos os tenants se None).
+
+        Bloqueia escritas em pedidos (SHARE) durante a transação para que nenhum
+        trigger rode entre o DELETE e o INSERT. Retorna o nº de buckets gravados.
+        """
+        params = {"tenant_id": str(tenant_id) if tenant_id else None}
+        await self.db.execute(text("LOCK TABLE pedidos IN SHARE MODE"))
+        await self.db.execute(text("""
+            DELETE FROM vendas_mensais
+            WHERE (CAST(:tenant_id AS uuid) IS NULL OR tenant_id = CAST(:tenant_id AS uuid))
+        """), params)
+        result = await self.db.execute(text(
+            "INSERT INTO vendas_mensais (tenant_id, mes, status, qtd_pedidos, valor_total) " + _AGREGADO_PEDIDOS
+        ), params)
+        await self.db.commit()
+        return result.rowcount
+
+    @somente_leitura
+    async def verificar_rollup(self, tenant_id: Optional[UUID] = None) -> List:
+        """Lista os buckets em que o rollup diverge da tabela crua (vazia = consistente)."""
+        result = await self.db.execute(text(f"""
+            WITH bruto AS ({_AGREGADO_PEDIDOS}),
+            rollup AS (
+                SELECT tenant_id, mes, status, qtd_pedidos, valor_total FROM vendas_mensais
+                WHERE (CAST(:tenant_id AS uuid) IS NULL OR tenant_id = CAST(:tenant_id AS uuid))
+                  AND (qtd_pedidos <> 0 OR valor_total <> 0)
+            )
+            SELECT COALESCE(b.tenant_id, r.tenant_id) AS tenant_id,
+                   COALESCE(b.mes, r.mes) AS mes,
+                   COALESCE(b.status, r.status) AS status,
+                   COALESCE(b.qtd_pedidos, 0) AS qtd_esperada, COALESCE(r.qtd_pedidos, 0) AS qtd_rollup,
+                   COALESCE(b.valor_total, 0) AS valor_esperado, COALESCE(r.valor_total, 0) AS valor_rollup
+            FROM bruto b
+            FULL OUTER JOIN rollup r USING (tenant_id, mes, status)
+            WHERE COALESCE(b.qtd_pedidos, 0) <> COALESCE(r.qtd_pedidos, 0)
+               OR COALESCE(b.valor_total, 0) <> COALESCE(r.valor_total, 0)
+            ORDER BY 1, 2, 3
+        """), {"tenant_id": str(tenant_id) if tenant_id else None})
+        return result.all()
@@ -1,100 +1,155 @@
 # backend/app/repos/pedido_repo.py
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import select, insert, update, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import somente_leitura
+from sqlalchemy.orm import selectinload, joinedload
+from sqlalchemy.orm.attributes import set_committed_value
 from app.models.pedido import Pedido
 from app.models.item_pedido import ItemPedido
-from app.schemas.pedido import PedidoCreate, PedidoUpdate, ItemPedidoCreate, ItemPedidoUpdate
+from app.models.pagamento import Pagamento
+from app.models.parcela import Parcela
+from app.models.compromisso import Compromisso
+from app.repos import escrita
+from app.schemas.pedido import PedidoCreate, PedidoUpdate
+from app.utils.paginacao import paginar
+from app.utils.itens_pedido import DiffItens
 from uuid import UUID
+from datetime import date, datetime, time
 from typing import List, Optional
 
 class PedidoRepository:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
-    
-    def criar(self, tenant_id: UUID, schema: PedidoCreate) -> Pedido:
-        db_pedido = Pedido(
-            tenant_id=tenant_id,
-            cliente_id=schema.cliente_id,
-            numero=schema.numero,
-            status=schema.status,
-            referencia=schema.referencia,
-            validade_orcamento_dias=schema.validade_orcamento_dias,
-            prazo_execucao_dias=schema.prazo_execucao_dias,
-            data_inicio=schema.data_inicio,
-            data_fim_prevista=schema.data_fim_prevista,
-            data_fim_real=schema.data_fim_real,
-            valor_subtotal=schema.valor_subtotal,
-            valor_desconto=schema.valor_desconto,
-            valor_total=schema.valor_total,
-        )
-        self.db.add(db_pedido)
-        self.db.flush() # Para que o db_pedido tenha um ID antes de criar os itens
 
-        for item_data in schema.itens:
-            db_item = ItemPedido(
-                tenant_id=tenant_id,
-                pedido_id=db_pedido.id,
-                descricao=item_data.descricao,
-                quantidade=item_data.quantidade,
-                unidade=item_data.unidade,
-                preco_unitario=item_data.preco_unitario,
-                observacoes=item_data.observacoes,
-            )
-            self.db.add(db_item)
-        
-        self.db.commit()
-        self.db.refresh(db_pedido) # Para carregar os itens recém-criados
+    async def criar(self, tenant_id: UUID, schema: PedidoCreate) -> Pedido:
+        """Pedido e itens em dois INSERT ... RETURNING (itens num único INSERT multi-linha)."""
+        db_pedido = await escrita.inserir(self.db, Pedido, {"tenant_id": tenant_id, **schema.model_dump(exclude={'itens'})})
+        itens = await escrita.inserir_em_lote(self.db, ItemPedido, [
+            {"tenant_id": tenant_id, "pedido_id": db_pedido.id, **item.model_dump()} for item in schema.itens
+        ])
+        await self.db.commit()
+        # Coleção já conhecida: sem recarregar (sessões assíncronas não fazem lazy load)
+        set_committed_value(db_pedido, "itens", itens)
         return db_pedido
-    
-    def listar(self, tenant_id: UUID, skip: int = 0, limit: int = 10) -> List[Pedido]:
-        return self.db.query(Pedido).options(joinedload(Pedido.itens)).filter(
+
+    @somente_leitura
+    async def listar(self, tenant_id: UUID, skip: int = 0, limit: int = 10, cursor: Optional[str] = None) -> List[Pedido]:
+        query = select(Pedido).options(selectinload(Pedido.itens)).where(
             Pedido.tenant_id == tenant_id
-        ).offset(skip).limit(limit).all()
-    
-    def obter_por_id(self, tenant_id: UUID, pedido_id: UUID) -> Pedido | None:
-        return self.db.query(Pedido).options(joinedload(Pedido.itens)).filter(
+        )
+        result = await self.db.execute(paginar(query, Pedido, skip, limit, cursor))
+        return list(result.scalars().all())
+
+    @somente_leitura
+    async def obter_por_id(self, tenant_id: UUID, pedido_id: UUID, com_cliente: bool = False) -> Pedido | None:
+        query = select(Pedido).options(selectinload(Pedido.itens)).where(
             Pedido.tenant_id == tenant_id,
             Pedido.id == pedido_id
-        ).first()
-    
-    def atualizar(self, tenant_id: UUID, pedido_id: UUID, schema: PedidoUpdate) -> Pedido | None:
-        db_pedido = self.obter_por_id(tenant_id, pedido_id)
-        if not db_pedido:
-            return None
-        
-        update_data = schema.model_dump(exclude_unset=True, exclude={'itens'})
-        for key, value in update_data.items():
-            setattr(db_pedido, key, value)
+        )
+        if com_cliente:
+            query = query.options(joinedload(Pedido.cliente))
+        # populate_existing: garante itens atualizados mesmo se o pedido já estiver na sessão
+        result = await self.db.execute(query.execution_options(populate_existing=True))
+        return result.scalars().first()
+
+    async def atualizar(self, db_pedido: Pedido, schema: PedidoUpdate, diff: Optional[DiffItens] = None) -> Pedido | None:
+        """
+        Grava a edição de um pedido já carregado (obter_por_id).
+
+        A linha do pedido vai num UPDATE ... RETURNING condicionado à versão
+        lida: se outra edição gravou no meio tempo, levanta
+        escrita.ConflitoVersao antes de tocar nos itens. Os itens vão pelo
+        diff calculado no service: um UPDATE em lote (executemany por chave
+        primária) para os alterados, um INSERT multi-linha para os novos e um
+        DELETE ... IN para os removidos; itens iguais não são tocados.
+        """
+        update_data = schema.model_dump(exclude_unset=True, exclude={'itens', 'versao'})
+        itens_mudaram = diff is not None and not diff.vazio
+        agora = datetime.utcnow()
+        if itens_mudaram:
+            # Mudança só nos itens também gera versão nova e updated_at novo
+            # (usado na chave do cache de PDF)
+            update_data["updated_at"] = agora
 
-        # Atualiza ou cria itens
-        if schema.itens is not None:
-            # Simple approach: delete all existing items and recreate.
-            # More robust: compare and update existing items, delete missing, create new.
-            # For now, let's keep it simple.
-            for existing_item in db_pedido.itens:
-                self.db.delete(existing_item)
-            self.db.flush()
+        itens = db_pedido.itens
+        db_pedido = await escrita.atualizar(
+            self.db, Pedido, db_pedido.tenant_id, db_pedido.id, update_data, db_pedido.versao
+        )
+        if db_pedido is None:  # removido no meio tempo
+            await self.db.rollback()
+            return None
 
-            for item_data in schema.itens:
-                db_item = ItemPedido(
-                    tenant_id=tenant_id,
-                    pedido_id=db_pedido.id,
-                    descricao=item_data.descricao,
-                    quantidade=item_data.quantidade,
-                    unidade=item_data.unidade,
-                    preco_unitario=item_data.preco_unitario,
-                    observacoes=item_data.observacoes,
+        if itens_mudaram:
+            if diff.remover:
+                await self.db.execute(
+                    delete(ItemPedido)
+                    .where(ItemPedido.pedido_id == db_pedido.id, ItemPedido.id.in_(diff.remover))
+                    .execution_options(synchronize_session=False)
                 )
-                self.db.add(db_item)
-        
-        self.db.commit()
-        self.db.refresh(db_pedido)
+            if diff.atualizar:
+                await self.db.execute(update(ItemPedido), [{**item, "updated_at": agora} for item in diff.atualizar])
+            if diff.inserir:
+                await self.db.execute(insert(ItemPedido), [
+                    {**item, "tenant_id": db_pedido.tenant_id, "pedido_id": db_pedido.id} for item in diff.inserir
+                ])
+            result = await self.db.execute(
+                select(ItemPedido).where(ItemPedido.pedido_id == db_pedido.id)
+                .order_by(ItemPedido.created_at, ItemPedido.id)
+                .execution_options(populate_existing=True)
+            )
+            itens = list(result.scalars().all())
+
+        await self.db.commit()
+        set_committed_value(db_pedido, "itens", itens)
         return db_pedido
-    
-    def deletar(self, tenant_id: UUID, pedido_id: UUID) -> bool:
-        db_pedido = self.obter_por_id(tenant_id, pedido_id)
-        if not db_pedido:
-            return False
-        
-        self.db.delete(db_pedido) # A cascata "all, delete-orphan" no modelo Pedido cuidará dos itens.
-        self.db.commit()
-        return True
+
+    async def deletar(self, tenant_id: UUID, pedido_id: UUID) -> bool:
+        """
+        Remove o pedido e os dependentes sem carregá-los: a cascata do ORM
+        faria um SELECT por coleção (e lazy load não existe em sessão assíncrona).
+        Compromissos do pedido ficam sem vínculo, como o ORM fazia.
+        """
+        for modelo in (ItemPedido, Pagamento, Parcela):
+            await self.db.execute(
+                delete(modelo).where(modelo.tenant_id == tenant_id, modelo.pedido_id == pedido_id)
+                .execution_options(synchronize_session=False)
+            )
+        await self.db.execute(
+            update(Compromisso).where(Compromisso.tenant_id == tenant_id, Compromisso.pedido_id == pedido_id)
+            .values(pedido_id=None).execution_options(synchronize_session=False)
+        )
+        removido = await escrita.remover(self.db, Pedido, tenant_id, pedido_id)
+        await self.db.commit()
+        return removido
+
+    @somente_leitura
+    async def listar_para_exportacao(
+        self,
+        tenant_id: UUID,
+        data_inicio: Optional[date] = None,
+        data_fim: Optional[date] = None,
+        status: Optional[str] = None,
+        cliente_id: Optional[UUID] = None,
+        limit: int = 50,
+        cursor: str = ""
+    ) -> List[Pedido]:
+        """
+        Uma página (keyset por created_at, id) dos pedidos do filtro (data de
+        criação), com itens e cliente (tudo que o PDF precisa). Traz limit + 1
+        linhas: use separar_pagina para o próximo cursor.
+        """
+        query = (
+            select(Pedido)
+            .options(selectinload(Pedido.itens), joinedload(Pedido.cliente))
+            .where(Pedido.tenant_id == tenant_id)
+        )
+        if data_inicio:
+            query = query.where(Pedido.created_at >= datetime.combine(data_inicio, time.min))
+        if data_fim:
+            query = query.where(Pedido.created_at <= datetime.combine(data_fim, time.max))
+        if status:
+            query = query.where(Pedido.status == status)
+        if cliente_id:
+            query = query.where(Pedido.cliente_id == cliente_id)
+        result = await self.db.execute(paginar(query, Pedido, 0, limit, cursor))
+        return list(result.scalars().all())
@@ -1,7 +1,7 @@
 # backend/app/routes/auth.py
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
 from app.schemas.user import UserCreate, UserRead
 from app.services import auth_service
 from app.schemas.auth import Token
@@ -9,18 +9,18 @@ from app.schemas.auth import Token
 router = APIRouter(tags=["Authentication"])
 
 @router.post("/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
-def register_user(user: UserCreate, db: Session = Depends(get_db)):
-    db_user = auth_service.get_user_by_email(db, email=user.email)
+async def register_user(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    db_user = await auth_service.get_user_by_email(db, email=user.email)
     if db_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
         )
-    return auth_service.create_user(db=db, user=user)
+    return await auth_service.create_user(db=db, user=user)
 
 @router.post("/login", response_model=Token)
-def login_for_access_token(form_data: auth_service.OAuth2PasswordRequestForm, db: Session = Depends(get_db)):
-    user = auth_service.authenticate_user(db, email=form_data.username, password=form_data.password)
+async def login_for_access_token(form_data: auth_service.OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
+    user = await auth_service.authenticate_user(db, email=form_data.username, password=form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
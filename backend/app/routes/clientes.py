@@ -1,64 +1,76 @@
-from fastapi import APIRouter, Depends, status, Response
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, status, Response, Query, UploadFile, File
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
-from typing import List
+from typing import List, Optional, Union
 
-from app.schemas.cliente import ClienteCreate, ClienteUpdate, ClienteRead
+from app.schemas.cliente import ClienteCreate, ClienteUpdate, ClienteRead, ResultadoImportacao
+from app.schemas.paginacao import PaginaCursor
 from app.services.cliente_service import ClienteService
 from app.repos.cliente_repo import ClienteRepository
-from app.core.database import get_db
+from app.core.database import get_async_db
+from app.core.serializacao import RespostaJSON
 from app.dependencies import get_current_tenant_id
 
 router = APIRouter(prefix="/clientes", tags=["Clientes"])
 
 # Dependency para injetar o serviço
-def get_cliente_service(db: Session = Depends(get_db)) -> ClienteService:
+def get_cliente_service(db: AsyncSession = Depends(get_async_db)) -> ClienteService:
     repo = ClienteRepository(db)
     return ClienteService(repo)
 
 @router.post("/", response_model=ClienteRead, status_code=status.HTTP_201_CREATED)
-def criar_cliente(
+async def criar_cliente(
     schema: ClienteCreate,
     tenant_id: UUID = Depends(get_current_tenant_id),
     service: ClienteService = Depends(get_cliente_service)
 ):
     """Cria um novo cliente para o tenant logado."""
-    return service.criar_cliente(tenant_id, schema)
+    return await service.criar_cliente(tenant_id, schema)
 
-@router.get("/", response_model=List[ClienteRead])
-def listar_clientes(
+@router.post("/import", response_model=ResultadoImportacao)
+async def importar_clientes(
+    arquivo: UploadFile = File(..., description="Planilha .csv ou .xlsx com cabeçalho (nome, tipo, cpf_cnpj, email, ...)"),
+    tenant_id: UUID = Depends(get_current_tenant_id),
+    service: ClienteService = Depends(get_cliente_service)
+):
+    """Importa clientes em massa; CPF/CNPJ já cadastrado atualiza o cliente. Devolve o relatório por linha."""
+    return await service.importar_clientes(tenant_id, arquivo.file, arquivo.filename or "")
+
+@router.get("/", response_model=Union[List[ClienteRead], PaginaCursor[ClienteRead]])
+async def listar_clientes(
     tenant_id: UUID = Depends(get_current_tenant_id),
     service: ClienteService = Depends(get_cliente_service),
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Cursor opaco (next_cursor). Vazio = primeira página em modo cursor")
 ):
-    """Lista os clientes do tenant logado."""
-    return service.listar_clientes(tenant_id, skip, limit)
+    """Lista os clientes do tenant logado (skip/limit ou cursor/limit)."""
+    return RespostaJSON(await service.listar_clientes(tenant_id, skip, limit, cursor))
 
 @router.get("/{cliente_id}", response_model=ClienteRead)
-def obter_cliente(
+async def obter_cliente(
     cliente_id: UUID,
     tenant_id: UUID = Depends(get_current_tenant_id),
     service: ClienteService = Depends(get_cliente_service)
 ):
     """Obtém um cliente específico pelo ID."""
-    return service.obter_cliente(tenant_id, cliente_id)
+    return await service.obter_cliente(tenant_id, cliente_id)
 
 @router.put("/{cliente_id}", response_model=ClienteRead)
-def atualizar_cliente(
+async def atualizar_cliente(
     cliente_id: UUID,
     schema: ClienteUpdate,
     tenant_id: UUID = Depends(get_current_tenant_id),
     service: ClienteService = Depends(get_cliente_service)
 ):
     """Atualiza um cliente específico."""
-    return service.atualizar_cliente(tenant_id, cliente_id, schema)
+    return await service.atualizar_cliente(tenant_id, cliente_id, schema)
 
 @router.delete("/{cliente_id}", status_code=status.HTTP_200_OK)
-def deletar_cliente(
+async def deletar_cliente(
     cliente_id: UUID,
     tenant_id: UUID = Depends(get_current_tenant_id),
     service: ClienteService = Depends(get_cliente_service)
 ):
     """Deleta um cliente específico."""
-    return service.deletar_cliente(tenant_id, cliente_id)
+    return await service.deletar_cliente(tenant_id, cliente_id)
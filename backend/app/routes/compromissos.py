@@ -1,33 +1,35 @@
 from fastapi import APIRouter, Depends, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
-from typing import List, Optional
-from datetime import datetime
+from typing import List, Optional, Union
+from datetime import datetime, time
 
-from app.schemas.compromisso import CompromissoCreate, CompromissoUpdate, CompromissoRead
+from app.schemas.compromisso import CompromissoCreate, CompromissoUpdate, CompromissoRead, JanelaLivre
+from app.schemas.paginacao import PaginaCursor
 from app.services.compromisso_service import CompromissoService
 from app.repos.compromisso_repo import CompromissoRepository
-from app.core.database import get_db
+from app.core.database import get_async_db
+from app.core.serializacao import RespostaJSON
 from app.dependencies import get_current_tenant_id
 
 router = APIRouter(prefix="/compromissos", tags=["Compromissos"])
 
 # Dependency para injetar o serviço
-def get_compromisso_service(db: Session = Depends(get_db)) -> CompromissoService:
+def get_compromisso_service(db: AsyncSession = Depends(get_async_db)) -> CompromissoService:
     repo = CompromissoRepository(db)
     return CompromissoService(repo)
 
 @router.post("/", response_model=CompromissoRead, status_code=status.HTTP_201_CREATED)
-def criar_compromisso(
+async def criar_compromisso(
     schema: CompromissoCreate,
     tenant_id: UUID = Depends(get_current_tenant_id),
     service: CompromissoService = Depends(get_compromisso_service)
 ):
     """Cria um novo compromisso para o tenant logado."""
-    return service.criar_compromisso(tenant_id, schema)
+    return await service.criar_compromisso(tenant_id, schema)
 
-@router.get("/", response_model=List[CompromissoRead])
-def listar_compromissos(
+@router.get("/", response_model=Union[List[CompromissoRead], PaginaCursor[CompromissoRead]])
+async def listar_compromissos(
     tenant_id: UUID = Depends(get_current_tenant_id),
     service: CompromissoService = Depends(get_compromisso_service),
     skip: int = 0,
@@ -37,48 +39,67 @@ def listar_compromissos(
     status: Optional[str] = None,
     tipo: Optional[str] = None,
     data_inicio: Optional[datetime] = None,
-    data_fim: Optional[datetime] = None
+    data_fim: Optional[datetime] = None,
+    cursor: Optional[str] = Query(None, description="Cursor opaco (next_cursor). Vazio = primeira página em modo cursor")
 ):
-    """Lista os compromissos do tenant logado com filtros opcionais."""
-    return service.listar_compromissos(
+    """Lista os compromissos do tenant logado com filtros opcionais (skip/limit ou cursor/limit)."""
+    return RespostaJSON(await service.listar_compromissos(
         tenant_id, skip, limit, cliente_id, pedido_id,
-        status, tipo, data_inicio, data_fim
-    )
+        status, tipo, data_inicio, data_fim, cursor
+    ))
 
 @router.get("/periodo", response_model=List[CompromissoRead])
-def listar_compromissos_por_periodo(
+async def listar_compromissos_por_periodo(
     tenant_id: UUID = Depends(get_current_tenant_id),
     service: CompromissoService = Depends(get_compromisso_service),
     data_inicio: datetime = Query(..., description="Data/hora de início do período"),
     data_fim: datetime = Query(..., description="Data/hora de fim do período")
 ):
     """Lista compromissos que ocorrem dentro do período especificado (útil para calendário)."""
-    return service.listar_por_periodo(tenant_id, data_inicio, data_fim)
+    return RespostaJSON(await service.listar_por_periodo(tenant_id, data_inicio, data_fim))
+
+@router.get("/disponibilidade", response_model=List[JanelaLivre])
+async def buscar_disponibilidade(
+    tenant_id: UUID = Depends(get_current_tenant_id),
+    service: CompromissoService = Depends(get_compromisso_service),
+    data_inicio: datetime = Query(..., description="Início da busca"),
+    data_fim: datetime = Query(..., description="Fim da busca (máx. 180 dias)"),
+    duracao_minutos: int = Query(60, gt=0, le=24 * 60, description="Duração mínima da janela"),
+    hora_inicio: time = Query(time(8, 0), description="Início do expediente"),
+    hora_fim: time = Query(time(18, 0), description="Fim do expediente"),
+    incluir_fim_de_semana: bool = False,
+    fuso: Optional[str] = Query(None, description="Fuso IANA do expediente (padrão America/Sao_Paulo)")
+):
+    """Janelas livres na agenda do tenant para agendar Medições, Instalações etc."""
+    return await service.buscar_disponibilidade(
+        tenant_id, data_inicio, data_fim, duracao_minutos,
+        hora_inicio, hora_fim, incluir_fim_de_semana, fuso
+    )
 
 @router.get("/{compromisso_id}", response_model=CompromissoRead)
-def obter_compromisso(
+async def obter_compromisso(
     compromisso_id: UUID,
     tenant_id: UUID = Depends(get_current_tenant_id),
     service: CompromissoService = Depends(get_compromisso_service)
 ):
     """Obtém um compromisso específico pelo ID."""
-    return service.obter_compromisso(tenant_id, compromisso_id)
+    return await service.obter_compromisso(tenant_id, compromisso_id)
 
 @router.put("/{compromisso_id}", response_model=CompromissoRead)
-def atualizar_compromisso(
+async def atualizar_compromisso(
     compromisso_id: UUID,
     schema: CompromissoUpdate,
     tenant_id: UUID = Depends(get_current_tenant_id),
     service: CompromissoService = Depends(get_compromisso_service)
 ):
     """Atualiza um compromisso específico."""
-    return service.atualizar_compromisso(tenant_id, compromisso_id, schema)
+    return await service.atualizar_compromisso(tenant_id, compromisso_id, schema)
 
 @router.delete("/{compromisso_id}", status_code=status.HTTP_200_OK)
-def deletar_compromisso(
+async def deletar_compromisso(
     compromisso_id: UUID,
     tenant_id: UUID = Depends(get_current_tenant_id),
     service: CompromissoService = Depends(get_compromisso_service)
 ):
     """Deleta um compromisso específico."""
-    return service.deletar_compromisso(tenant_id, compromisso_id)
+    return await service.deletar_compromisso(tenant_id, compromisso_id)
@@ -1,29 +1,77 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import Response
-from sqlalchemy.orm import Session
+import asyncio
+import time
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
+from datetime import date
+from typing import Optional
 from pydantic import BaseModel, EmailStr
 
-from app.services.documento_service import DocumentoService
+from app.services.documento_service import DocumentoService, get_documento_service
+from app.services.exportacao_service import ExportacaoPDFService
+from app.services.notificacao_service import NotificacaoService
 from app.repos.pedido_repo import PedidoRepository
-from app.core.database import get_db
+from app.schemas.documento import JobPDFRead
+from app.core.cache import get_redis
+from app.core.celery_app import celery_app
+from app.core.database import get_async_db
+from app.core.pdf_cache import pdf_cache
 from app.dependencies import get_current_tenant_id
-from app.tasks.email import enviar_pedido_email_task
+from app.tasks.pdf import renderizar_pdf_pedido
+
+# Dono de cada job (tenant), para ninguém consultar job de outro tenant
+JOB_TENANT_KEY = "pdf:job:{job_id}"
+JOB_TTL = 3600  # igual ao result_expires do Celery
+STATUS_JOB = {
+    "PENDING": "pendente",
+    "RECEIVED": "pendente",
+    "RETRY": "pendente",
+    "STARTED": "processando",
+    "SUCCESS": "concluido",
+    "FAILURE": "erro",
+    "REVOKED": "erro",
+}
 
 router = APIRouter(prefix="/documentos", tags=["Documentos"])
 
+@router.get("/pedidos/exportar")
+async def exportar_pedidos_zip(
+    tenant_id: UUID = Depends(get_current_tenant_id),
+    data_inicio: Optional[date] = Query(None, description="Criados a partir de"),
+    data_fim: Optional[date] = Query(None, description="Criados até"),
+    status: Optional[str] = None,
+    cliente_id: Optional[UUID] = None
+):
+    """
+    ZIP com os PDFs dos pedidos/orçamentos do filtro (ex.: fechamento do mês
+    para o contador), transmitido conforme os PDFs ficam prontos.
+    """
+    service = ExportacaoPDFService(tenant_id)
+    service.validar_filtros(data_inicio, data_fim, status)
+    periodo = f"{data_inicio or 'inicio'}_{data_fim or 'hoje'}"
+    return StreamingResponse(
+        service.gerar_zip(data_inicio, data_fim, status, cliente_id),
+        media_type="application/zip",
+        headers={"Content-Disposition": f"attachment; filename=pedidos_{periodo}.zip"}
+    )
+
 @router.get("/pedidos/{pedido_id}/pdf")
-def download_pedido_pdf(
+async def download_pedido_pdf(
     pedido_id: UUID,
+    request: Request,
     tenant_id: UUID = Depends(get_current_tenant_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db),
+    service: DocumentoService = Depends(get_documento_service)
 ):
     """
     Gera e retorna o PDF de um pedido/orçamento.
     """
     # Busca o pedido (garantindo isolamento por tenant)
     pedido_repo = PedidoRepository(db)
-    pedido = pedido_repo.obter_por_id(tenant_id, pedido_id)
+    pedido = await pedido_repo.obter_por_id(tenant_id, pedido_id, com_cliente=True)
     
     if not pedido:
         raise HTTPException(
@@ -31,34 +79,119 @@ def download_pedido_pdf(
             detail="Pedido não encontrado"
         )
 
-    # Gera o PDF
-    service = DocumentoService()
-    pdf_bytes = service.gerar_pdf_pedido(pedido)
+    etag = f'"{service.etag_pedido(pedido)}"'
+    cabecalhos = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    # Cliente já tem esta versão: nem lê o cache
+    if _etag_confere(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cabecalhos)
+
+    # Cache em disco; no miss renderiza fora do event loop (CPU-bound)
+    pdf_bytes = await service.obter_pdf_pedido(pedido, etag.strip('"'))
 
     # Retorna como arquivo para download
     filename = f"pedido_{pedido.numero}.pdf"
     return Response(
         content=pdf_bytes,
         media_type="application/pdf",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
+        headers={**cabecalhos, "Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+def _etag_confere(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidatos = [c.strip().removeprefix("W/") for c in if_none_match.split(",")]
+    return "*" in candidatos or etag in candidatos
+
+@router.post("/pedidos/{pedido_id}/pdf/jobs", response_model=JobPDFRead, status_code=status.HTTP_202_ACCEPTED)
+async def enfileirar_pdf_pedido(
+    pedido_id: UUID,
+    tenant_id: UUID = Depends(get_current_tenant_id),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Enfileira a renderização do PDF na fila `pdf` e devolve o id do job.
+    Consulte com GET /documentos/pdf/jobs/{job_id}?espera=N (long-poll).
+    """
+    pedido = await PedidoRepository(db).obter_por_id(tenant_id, pedido_id)
+    if not pedido:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Pedido não encontrado"
+        )
+
+    job = await run_in_threadpool(renderizar_pdf_pedido.delay, str(tenant_id), str(pedido_id))
+    await get_redis().set(JOB_TENANT_KEY.format(job_id=job.id), str(tenant_id), ex=JOB_TTL)
+    return JobPDFRead(job_id=job.id, status="pendente")
+
+async def _resultado_job(job_id: str, tenant_id: UUID):
+    dono = await get_redis().get(JOB_TENANT_KEY.format(job_id=job_id))
+    if dono != str(tenant_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job não encontrado")
+    return celery_app.AsyncResult(job_id)
+
+@router.get("/pdf/jobs/{job_id}", response_model=JobPDFRead)
+async def consultar_job_pdf(
+    job_id: str,
+    tenant_id: UUID = Depends(get_current_tenant_id),
+    espera: int = Query(0, ge=0, le=30, description="Segundos para aguardar a conclusão (long-poll)")
+):
+    """Status do job de PDF; com `espera`, segura a resposta até concluir ou estourar o tempo."""
+    resultado = await _resultado_job(job_id, tenant_id)
+    limite = time.monotonic() + espera
+    estado = await run_in_threadpool(lambda: resultado.state)
+    while estado not in ("SUCCESS", "FAILURE", "REVOKED") and time.monotonic() < limite:
+        await asyncio.sleep(0.25)
+        estado = await run_in_threadpool(lambda: resultado.state)
+
+    job = JobPDFRead(job_id=job_id, status=STATUS_JOB.get(estado, "pendente"))
+    if estado == "SUCCESS":
+        job.download_url = f"/api/documentos/pdf/jobs/{job_id}/arquivo"
+    elif estado == "FAILURE":
+        job.erro = str(resultado.result)
+    return job
+
+@router.get("/pdf/jobs/{job_id}/arquivo")
+async def baixar_job_pdf(
+    job_id: str,
+    tenant_id: UUID = Depends(get_current_tenant_id)
+):
+    """Baixa o PDF de um job concluído (servido do cache em disco)."""
+    resultado = await _resultado_job(job_id, tenant_id)
+    if await run_in_threadpool(lambda: resultado.state) != "SUCCESS":
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Job ainda não concluído")
+
+    dados = resultado.result
+    pdf_bytes = await run_in_threadpool(pdf_cache.obter, tenant_id, UUID(dados["pedido_id"]), dados["chave"])
+    if pdf_bytes is None:
+        # Pedido mudou (cache invalidado) ou evicção LRU: gere um novo job
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail="PDF expirado, enfileire novamente")
+
+    return Response(
+        content=pdf_bytes,
+        media_type="application/pdf",
+        headers={
+            "ETag": f'"{dados["chave"]}"',
+            "Content-Disposition": f"attachment; filename=pedido_{dados['numero']}.pdf"
+        }
     )
 
 class EmailRequest(BaseModel):
     email: EmailStr
 
 @router.post("/pedidos/{pedido_id}/email", status_code=status.HTTP_202_ACCEPTED)
-def enviar_pedido_por_email(
+async def enviar_pedido_por_email(
     pedido_id: UUID,
     request: EmailRequest,
     tenant_id: UUID = Depends(get_current_tenant_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Dispara o envio do PDF do pedido por e-mail em background.
     """
     # Verifica se o pedido existe antes de enfileirar a task
     pedido_repo = PedidoRepository(db)
-    pedido = pedido_repo.obter_por_id(tenant_id, pedido_id)
+    pedido = await pedido_repo.obter_por_id(tenant_id, pedido_id)
     
     if not pedido:
         raise HTTPException(
@@ -66,7 +199,7 @@ def enviar_pedido_por_email(
             detail="Pedido não encontrado"
         )
 
-    # Enfileira a task no Celery
-    enviar_pedido_email_task.delay(str(tenant_id), str(pedido_id), request.email)
+    # Enfileira render (fila pdf) + envio (fila padrão) no Celery
+    await run_in_threadpool(NotificacaoService().enviar_pedido, tenant_id, pedido_id, request.email)
     
     return {"message": "Envio de e-mail iniciado com sucesso"}
\ No newline at end of file
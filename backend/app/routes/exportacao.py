@@ -0,0 +1,34 @@
+# backend/app/routes/exportacao.py
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from uuid import UUID
+from datetime import date
+from typing import Literal, Optional
+
+from app.services.exportacao_dados_service import ExportacaoDadosService, FORMATOS_EXPORTACAO
+from app.dependencies import get_current_tenant_id
+
+router = APIRouter(prefix="/export", tags=["Exportação"])
+
+@router.get("/{entidade}")
+async def exportar_dados(
+    entidade: Literal["pedidos", "pagamentos", "parcelas"],
+    tenant_id: UUID = Depends(get_current_tenant_id),
+    formato: Literal["csv", "ndjson"] = "csv",
+    pedido_id: Optional[UUID] = None,
+    cliente_id: Optional[UUID] = None,
+    status: Optional[str] = None,
+    data_inicio: Optional[date] = Query(None, description="Início do período (criação do pedido, data do pagamento ou vencimento da parcela)"),
+    data_fim: Optional[date] = Query(None, description="Fim do período (inclusive)")
+):
+    """
+    Exporta todas as linhas do filtro em CSV ou NDJSON (com o nome do cliente),
+    transmitidas por cursor no servidor, sem paginação.
+    """
+    service = ExportacaoDadosService(tenant_id)
+    service.validar_filtros(entidade, status, data_inicio, data_fim)
+    return StreamingResponse(
+        service.gerar(entidade, formato, pedido_id, cliente_id, status, data_inicio, data_fim),
+        media_type=FORMATOS_EXPORTACAO[formato],
+        headers={"Content-Disposition": f"attachment; filename={entidade}_{date.today():%Y%m%d}.{formato}"}
+    )
@@ -1,53 +1,39 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
-from datetime import datetime, timedelta
 
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.dependencies import get_current_tenant_id
-from app.models.pedido import Pedido
+from app.repos.financeiro_repo import FinanceiroRepository
+from app.services.financeiro_service import FinanceiroService
+from app.utils.fluxo_caixa import Agrupamento
 
 router = APIRouter(prefix="/financeiro", tags=["Financeiro"])
 
+# Dependency para injetar o serviço
+def get_financeiro_service(db: AsyncSession = Depends(get_async_db)) -> FinanceiroService:
+    repo = FinanceiroRepository(db)
+    return FinanceiroService(repo)
+
 @router.get("/dashboard")
-def get_dashboard_data(
+async def get_dashboard_data(
     tenant_id: UUID = Depends(get_current_tenant_id),
-    db: Session = Depends(get_db)
+    service: FinanceiroService = Depends(get_financeiro_service)
 ):
     """
     Retorna dados agregados para o dashboard financeiro.
     """
-    # 1. Resumo Geral (KPIs)
-    # Consideramos apenas pedidos não cancelados
-    query_base = db.query(Pedido).filter(
-        Pedido.tenant_id == tenant_id,
-        Pedido.status != 'Cancelado'
-    )
-
-    total_vendas = query_base.with_entities(func.sum(Pedido.valor_total)).scalar() or 0
-    qtd_pedidos = query_base.count()
-    ticket_medio = total_vendas / qtd_pedidos if qtd_pedidos > 0 else 0
+    return await service.obter_dashboard(tenant_id)
 
-    # 2. Gráfico: Evolução últimos 6 meses
-    hoje = datetime.now()
-    seis_meses_atras = hoje - timedelta(days=180)
-    
-    # Agrupamento por mês (PostgreSQL specific: to_char)
-    vendas_por_mes = db.query(
-        func.to_char(Pedido.created_at, 'YYYY-MM').label('mes'),
-        func.sum(Pedido.valor_total).label('total')
-    ).filter(
-        Pedido.tenant_id == tenant_id,
-        Pedido.created_at >= seis_meses_atras,
-        Pedido.status != 'Cancelado'
-    ).group_by('mes').order_by('mes').all()
-
-    return {
-        "resumo": {
-            "total_vendas": float(total_vendas),
-            "qtd_pedidos": qtd_pedidos,
-            "ticket_medio": float(ticket_medio)
-        },
-        "grafico": [{"mes": v.mes, "total": float(v.total)} for v in vendas_por_mes]
-    }
\ No newline at end of file
+@router.get("/fluxo-caixa")
+async def get_fluxo_caixa(
+    tenant_id: UUID = Depends(get_current_tenant_id),
+    meses: int = Query(3, ge=1, le=24, description="Meses projetados, contando o atual"),
+    agrupamento: Agrupamento = "mes",
+    service: FinanceiroService = Depends(get_financeiro_service)
+):
+    """
+    Previsto (parcelas em aberto) x recebido (pagamentos) por dia, semana ou
+    mês, do início do mês atual até `meses` à frente.
+    """
+    return await service.obter_fluxo_caixa(tenant_id, meses, agrupamento)
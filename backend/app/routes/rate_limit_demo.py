@@ -1,13 +1,11 @@
-from fastapi import APIRouter, Request
-from app.middleware.rate_limiter import limiter
+from fastapi import APIRouter
 
 router = APIRouter(tags=["Test"])
 
 @router.get("/rate-limit")
-@limiter.limit("3/minute")
-def test_rate_limit(request: Request):
+async def rate_limit_demo():
     """
     Endpoint de teste para verificar o Rate Limiting.
-    Limite: 3 requisições por minuto.
+    Limite: 3 requisições por minuto (RATE_LIMIT_ROTAS).
     """
-    return {"status": "ok", "message": "Dentro do limite permitido"}
\ No newline at end of file
+    return {"status": "ok", "message": "Dentro do limite permitido"}
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional
+import re
+from pydantic import BaseModel, EmailStr, Field, field_validator
+from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
 from enum import Enum
@@ -19,18 +20,42 @@ class ClienteBase(BaseModel):
     cidade: Optional[str] = None
     uf: Optional[str] = None
 
+    # Normalização única do POST, PUT e da importação; a regra de tamanho
+    # fica em app.services.cliente_service.erro_documento
+    @field_validator("cpf_cnpj", mode="before")
+    @classmethod
+    def _sem_mascara(cls, valor):
+        return re.sub(r"\D", "", valor) if isinstance(valor, str) else valor  # pontos, traço, barra
+
+    @field_validator("tipo", mode="before")
+    @classmethod
+    def _tipo_maiusculo(cls, valor):
+        return valor.strip().upper() if isinstance(valor, str) else valor
+
 class ClienteCreate(ClienteBase):
     pass
 
 class ClienteUpdate(ClienteBase):
-    pass
+    versao: Optional[int] = Field(None, description="Versão lida; se enviada, a edição falha com 409 caso o registro tenha mudado")
 
 class ClienteRead(ClienteBase):
     id: UUID
     tenant_id: UUID
     ativo: bool
+    versao: int
     created_at: datetime
     updated_at: datetime
     
     class Config:
         from_attributes = True
+
+class ErroImportacao(BaseModel):
+    linha: int
+    erros: List[str]
+
+class ResultadoImportacao(BaseModel):
+    total_linhas: int
+    inseridos: int
+    atualizados: int
+    total_erros: int
+    erros: List[ErroImportacao] = Field(default_factory=list, description="Primeiras linhas rejeitadas (limitado)")
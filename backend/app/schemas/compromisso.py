@@ -1,7 +1,8 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional
 from datetime import datetime
 from uuid import UUID
+from app.utils.agenda import para_utc_sem_fuso
 
 class CompromissoBase(BaseModel):
     titulo: str = Field(..., min_length=3, max_length=255)
@@ -17,7 +18,7 @@ class CompromissoBase(BaseModel):
     pedido_id: Optional[UUID] = None
 
 class CompromissoCreate(CompromissoBase):
-    pass
+    _sem_fuso = field_validator("data_hora_inicio", "data_hora_fim")(para_utc_sem_fuso)
 
 class CompromissoUpdate(BaseModel):
     titulo: Optional[str] = Field(None, min_length=3, max_length=255)
@@ -31,12 +32,21 @@ class CompromissoUpdate(BaseModel):
     observacoes: Optional[str] = None
     cliente_id: Optional[UUID] = None
     pedido_id: Optional[UUID] = None
+    versao: Optional[int] = Field(None, description="Versão lida; se enviada, a edição falha com 409 caso o registro tenha mudado")
+
+    _sem_fuso = field_validator("data_hora_inicio", "data_hora_fim")(para_utc_sem_fuso)
 
 class CompromissoRead(CompromissoBase):
     id: UUID
     tenant_id: UUID
+    versao: int
     created_at: datetime
     updated_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class JanelaLivre(BaseModel):
+    inicio: datetime
+    fim: datetime
+    duracao_minutos: int
@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+from typing import Optional
+
+class JobPDFRead(BaseModel):
+    job_id: str
+    status: str  # 'pendente', 'processando', 'concluido', 'erro'
+    download_url: Optional[str] = None
+    erro: Optional[str] = None
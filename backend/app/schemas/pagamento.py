@@ -1,5 +1,5 @@
 # backend/app/schemas/pagamento.py
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 from uuid import UUID
 from datetime import datetime
@@ -18,11 +18,12 @@ class PagamentoCreate(PagamentoBase):
     pass
 
 class PagamentoUpdate(PagamentoBase):
-    pass
+    versao: Optional[int] = Field(None, description="Versão lida; se enviada, a edição falha com 409 caso o registro tenha mudado")
 
 class PagamentoRead(PagamentoBase):
     id: UUID
     tenant_id: UUID
+    versao: int
     created_at: datetime
     updated_at: datetime
 
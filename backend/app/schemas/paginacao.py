@@ -0,0 +1,10 @@
+# backend/app/schemas/paginacao.py
+from pydantic import BaseModel
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+class PaginaCursor(BaseModel, Generic[T]):
+    """Resposta das listagens em modo cursor (?cursor=...&limit=...)."""
+    items: List[T]
+    next_cursor: Optional[str] = None
@@ -1,8 +1,8 @@
 # backend/app/schemas/parcela.py
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 from uuid import UUID
-from datetime import date
+from datetime import date, datetime
 from decimal import Decimal
 from app.models.parcela import StatusParcela # Importar o Enum do modelo
 
@@ -18,11 +18,12 @@ class ParcelaCreate(ParcelaBase):
     pass
 
 class ParcelaUpdate(ParcelaBase):
-    pass
+    versao: Optional[int] = Field(None, description="Versão lida; se enviada, a edição falha com 409 caso o registro tenha mudado")
 
 class ParcelaRead(ParcelaBase):
     id: UUID
     tenant_id: UUID
+    versao: int
     created_at: datetime
     updated_at: datetime
 
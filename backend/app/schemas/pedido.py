@@ -1,5 +1,5 @@
 # backend/app/schemas/pedido.py
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import Optional, List
 from uuid import UUID
 from datetime import datetime, date
@@ -25,7 +25,7 @@ class ItemPedidoCreate(ItemPedidoBase):
     pass
 
 class ItemPedidoUpdate(ItemPedidoBase):
-    pass
+    id: Optional[UUID] = None  # item existente; sem id = item novo
 
 class ItemPedidoRead(ItemPedidoBase):
     id: UUID
@@ -55,10 +55,12 @@ class PedidoCreate(PedidoBase):
 
 class PedidoUpdate(PedidoBase):
     itens: Optional[List[ItemPedidoUpdate]] = None # Para permitir atualizar itens separadamente
+    versao: Optional[int] = Field(None, description="Versão lida; se enviada, a edição falha com 409 caso o registro tenha mudado")
 
 class PedidoRead(PedidoBase):
     id: UUID
     tenant_id: UUID
+    versao: int
     created_at: datetime
     updated_at: datetime
     itens: List[ItemPedidoRead] = []
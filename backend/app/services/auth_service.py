@@ -1,12 +1,14 @@
 # backend/app/services/auth_service.py
 from fastapi import Depends
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from app.models.user import User
 from app.models.tenant import Tenant
 from app.schemas.user import UserCreate
-from app.utils.security import get_password_hash, verify_password, create_access_token
+from app.core.security import gerar_hash_senha, verificar_senha
+from app.core.tokens import criar_token
 import uuid
 
 # Esta dependência do FastAPI extrai o formulário de login
@@ -14,36 +16,43 @@ OAuth2PasswordRequestForm = OAuth2PasswordRequestForm
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
 
-def get_user_by_email(db: Session, email: str) -> User | None:
-    return db.query(User).filter(User.email == email).first()
+async def get_user_by_email(db: AsyncSession, email: str) -> User | None:
+    # Tenant junto: o plano vai no token (reserva da cota se o banco falhar no rate limiter)
+    result = await db.execute(select(User).options(joinedload(User.tenant)).where(User.email == email))
+    return result.scalars().first()
+
+async def create_user(db: AsyncSession, user: UserCreate) -> User:
+    # Hash no pool de processos antes de abrir a transação (pode responder 429)
+    hashed_password = await gerar_hash_senha(user.password)
 
-def create_user(db: Session, user: UserCreate) -> User:
     # 1. Criar um novo Tenant para este usuário/empresa
     new_tenant = Tenant(name=f"Tenant for {user.email}")
     db.add(new_tenant)
-    db.commit()
-    db.refresh(new_tenant)
+    await db.flush()
 
     # 2. Criar o usuário associado a esse Tenant
-    hashed_password = get_password_hash(user.password)
     db_user = User(
         email=user.email,
         hashed_password=hashed_password,
         tenant_id=new_tenant.id,
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
-def authenticate_user(db: Session, email: str, password: str) -> User | None:
-    user = get_user_by_email(db, email)
-    if not user or not verify_password(password, user.hashed_password):
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> User | None:
+    user = await get_user_by_email(db, email)
+    if not user:
+        return None
+    valida, novo_hash = await verificar_senha(password, user.hashed_password)
+    if not valida:
         return None
+    if novo_hash:
+        # Hash com parâmetros antigos: regrava com o custo atual (BCRYPT_ROUNDS)
+        user.hashed_password = novo_hash
+        await db.commit()
     return user
 
 def create_token_for_user(user: User) -> str:
-    access_token = create_access_token(
-        data={"sub": str(user.id), "tenant_id": str(user.tenant_id)}
-    )
-    return access_token
+    return criar_token(user.id, user.tenant_id, plano=user.tenant.plano)
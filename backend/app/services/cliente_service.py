@@ -1,44 +1,174 @@
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from app.models.cliente import Cliente
 from app.repos.cliente_repo import ClienteRepository
-from app.schemas.cliente import ClienteCreate, ClienteUpdate, ClienteRead
+from app.repos.escrita import ConflitoVersao
+from app.schemas.cliente import ClienteBase, ClienteCreate, ClienteUpdate, ClienteRead, ErroImportacao, ResultadoImportacao, TipoCliente
+from app.schemas.paginacao import PaginaCursor
+from app.utils.paginacao import separar_pagina
+from app.core.serializacao import validar_lista
+from app.utils.planilha import Linha, ler_planilha, proximo_lote
 from uuid import UUID
+from typing import BinaryIO, List, Optional, Tuple
+
+# Importação em massa: linhas por lote (parse + validação + COPY) e limites
+IMPORTACAO_LOTE = 5000
+IMPORTACAO_MAX_LINHAS = 200_000
+IMPORTACAO_MAX_ERROS = 1000  # linhas rejeitadas detalhadas na resposta
+COLUNAS_OBRIGATORIAS = {"nome", "tipo", "cpf_cnpj"}
+# Tamanho máximo das colunas texto: uma linha longa demais abortaria o COPY inteiro
+TAMANHOS_COLUNAS = {
+    coluna.name: coluna.type.length
+    for coluna in Cliente.__table__.columns
+    if coluna.name in ClienteCreate.model_fields and getattr(coluna.type, "length", None)
+}
+
+
+def erro_documento(cliente: ClienteBase) -> Optional[str]:
+    """
+    Regra de CPF/CNPJ do cadastro, a mesma no POST, no PUT e na importação
+    (o schema já tirou a máscara do documento e pôs o tipo em maiúsculas).
+    """
+    if cliente.tipo == TipoCliente.pessoa_fisica and len(cliente.cpf_cnpj) != 11:
+        return "CPF deve ter 11 dígitos"
+    if cliente.tipo == TipoCliente.pessoa_juridica and len(cliente.cpf_cnpj) != 14:
+        return "CNPJ deve ter 14 dígitos"
+    return None
+
+
+def _validar_documento(cliente: ClienteBase):
+    erro = erro_documento(cliente)
+    if erro:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=erro)
+
 
 class ClienteService:
     def __init__(self, repo: ClienteRepository):
         self.repo = repo
     
-    def criar_cliente(self, tenant_id: UUID, schema: ClienteCreate) -> ClienteRead:
+    async def criar_cliente(self, tenant_id: UUID, schema: ClienteCreate) -> ClienteRead:
         # Validações de negócio
-        if schema.tipo == 'PF' and len(schema.cpf_cnpj) != 11:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="CPF deve ter 11 dígitos")
-        
-        if schema.tipo == 'PJ' and len(schema.cpf_cnpj) != 14:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="CNPJ deve ter 14 dígitos")
-        
+        _validar_documento(schema)
+
         # Poderia verificar duplicidade de CPF/CNPJ aqui
         
-        db_cliente = self.repo.criar(tenant_id, schema)
-        return ClienteRead.from_attributes(db_cliente)
+        db_cliente = await self.repo.criar(tenant_id, schema)
+        return ClienteRead.model_validate(db_cliente)
     
-    def listar_clientes(self, tenant_id: UUID, skip: int = 0, limit: int = 10) -> list[ClienteRead]:
-        clientes = self.repo.listar(tenant_id, skip, limit)
-        return [ClienteRead.from_attributes(c) for c in clientes]
+    async def listar_clientes(self, tenant_id: UUID, skip: int = 0, limit: int = 10, cursor: Optional[str] = None) -> list[ClienteRead] | PaginaCursor[ClienteRead]:
+        clientes = await self.repo.listar(tenant_id, skip, limit, cursor)
+        if cursor is None:
+            return validar_lista(ClienteRead, clientes)
+        clientes, next_cursor = separar_pagina(clientes, limit)
+        return PaginaCursor[ClienteRead](
+            items=validar_lista(ClienteRead, clientes),
+            next_cursor=next_cursor
+        )
 
-    def obter_cliente(self, tenant_id: UUID, cliente_id: UUID) -> ClienteRead:
-        db_cliente = self.repo.obter_por_id(tenant_id, cliente_id)
+    async def obter_cliente(self, tenant_id: UUID, cliente_id: UUID) -> ClienteRead:
+        db_cliente = await self.repo.obter_por_id(tenant_id, cliente_id)
         if not db_cliente:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cliente não encontrado")
-        return ClienteRead.from_attributes(db_cliente)
+        return ClienteRead.model_validate(db_cliente)
 
-    def atualizar_cliente(self, tenant_id: UUID, cliente_id: UUID, schema: ClienteUpdate) -> ClienteRead:
+    async def atualizar_cliente(self, tenant_id: UUID, cliente_id: UUID, schema: ClienteUpdate) -> ClienteRead:
         # Validações de negócio podem ser adicionadas aqui
-        db_cliente = self.repo.atualizar(tenant_id, cliente_id, schema)
+        _validar_documento(schema)
+        try:
+            db_cliente = await self.repo.atualizar(tenant_id, cliente_id, schema)
+        except ConflitoVersao:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Cliente foi alterado por outra edição; recarregue e tente novamente")
         if not db_cliente:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cliente não encontrado")
-        return ClienteRead.from_attributes(db_cliente)
+        return ClienteRead.model_validate(db_cliente)
 
-    def deletar_cliente(self, tenant_id: UUID, cliente_id: UUID):
-        success = self.repo.deletar(tenant_id, cliente_id)
+    async def deletar_cliente(self, tenant_id: UUID, cliente_id: UUID):
+        success = await self.repo.deletar(tenant_id, cliente_id)
         if not success:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cliente não encontrado")
         return {"detail": "Cliente deletado com sucesso"}
+
+    def _validar_lote(self, linhas: List[Linha]) -> Tuple[List[tuple], List[ErroImportacao]]:
+        """Valida um lote de linhas da planilha; devolve (registros do COPY, erros)."""
+        registros, erros = [], []
+        for numero, valores in linhas:
+            dados = {campo: valores.get(campo) for campo in ClienteCreate.model_fields}
+            try:
+                cliente = ClienteCreate.model_validate(dados)
+            except ValidationError as exc:
+                erros.append(ErroImportacao(linha=numero, erros=[
+                    f"{'.'.join(str(p) for p in e['loc'])}: {e['msg']}" for e in exc.errors()
+                ]))
+                continue
+
+            # mode="json": o tipo vira "PF" (str() do Enum daria "TipoCliente.pessoa_fisica")
+            texto = cliente.model_dump(mode="json")
+            problemas = [
+                f"{campo}: máximo de {tamanho} caracteres"
+                for campo, tamanho in TAMANHOS_COLUNAS.items()
+                if len(texto[campo] or "") > tamanho
+            ]
+            erro = erro_documento(cliente)
+            if erro:
+                problemas.append(erro)
+            if problemas:
+                erros.append(ErroImportacao(linha=numero, erros=problemas))
+                continue
+
+            registros.append((
+                numero, cliente.nome, cliente.tipo.value, cliente.cpf_cnpj, cliente.email, cliente.telefone_ddd,
+                cliente.endereco, cliente.cep, cliente.cidade, cliente.uf
+            ))
+        return registros, erros
+
+    async def importar_clientes(self, tenant_id: UUID, arquivo: BinaryIO, nome_arquivo: str) -> ResultadoImportacao:
+        """
+        Importa clientes de uma planilha CSV/XLSX em lotes de IMPORTACAO_LOTE linhas.
+
+        Parse e validação rodam no threadpool; as linhas válidas vão por COPY
+        para uma tabela temporária e são mescladas em `clientes` numa única
+        transação no final. Linhas inválidas não impedem as demais.
+        """
+        try:
+            cabecalho, linhas = await run_in_threadpool(ler_planilha, arquivo, nome_arquivo)
+        except ValueError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+        faltando = COLUNAS_OBRIGATORIAS - set(cabecalho)
+        if faltando:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Colunas obrigatórias ausentes: {', '.join(sorted(faltando))}"
+            )
+
+        await self.repo.preparar_importacao()
+        total_linhas, total_erros, erros = 0, 0, []
+        while True:
+            try:
+                lote = await run_in_threadpool(proximo_lote, linhas, IMPORTACAO_LOTE)
+            except ValueError as exc:  # inclui UnicodeDecodeError
+                await self.repo.db.rollback()
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+            if not lote:
+                break
+            total_linhas += len(lote)
+            if total_linhas > IMPORTACAO_MAX_LINHAS:
+                await self.repo.db.rollback()
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"Máximo de {IMPORTACAO_MAX_LINHAS} linhas por importação"
+                )
+            registros, erros_lote = await run_in_threadpool(self._validar_lote, lote)
+            total_erros += len(erros_lote)
+            erros.extend(erros_lote[:IMPORTACAO_MAX_ERROS - len(erros)])
+            if registros:
+                await self.repo.copiar_para_importacao(registros)
+
+        inseridos, atualizados = await self.repo.mesclar_importacao(tenant_id)
+        return ResultadoImportacao(
+            total_linhas=total_linhas,
+            inseridos=inseridos,
+            atualizados=atualizados,
+            total_erros=total_erros,
+            erros=erros
+        )
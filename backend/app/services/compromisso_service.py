@@ -1,9 +1,20 @@
 from fastapi import HTTPException, status
+from app.config import settings
+from sqlalchemy.exc import IntegrityError
 from app.repos.compromisso_repo import CompromissoRepository
-from app.schemas.compromisso import CompromissoCreate, CompromissoUpdate, CompromissoRead
+from app.repos.escrita import ConflitoVersao
+from app.schemas.compromisso import CompromissoCreate, CompromissoUpdate, CompromissoRead, JanelaLivre
+from app.schemas.paginacao import PaginaCursor
+from app.utils.agenda import calcular_janelas_livres, para_utc_sem_fuso
+from app.utils.paginacao import separar_pagina
+from app.core.serializacao import validar_lista
 from uuid import UUID
 from typing import List, Optional
-from datetime import datetime
+from datetime import datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+# Limite da busca de disponibilidade (dias)
+DISPONIBILIDADE_MAX_DIAS = 180
 
 class CompromissoService:
     def __init__(self, repo: CompromissoRepository):
@@ -17,17 +28,46 @@ class CompromissoService:
                 detail="Data/hora de fim deve ser posterior à data/hora de início"
             )
 
-    def criar_compromisso(self, tenant_id: UUID, schema: CompromissoCreate) -> CompromissoRead:
+    async def _verificar_conflitos_horario(
+        self,
+        tenant_id: UUID,
+        data_inicio: datetime,
+        data_fim: datetime,
+        compromisso_id: Optional[UUID] = None
+    ):
+        """
+        Impede sobreposição com outro compromisso não cancelado do tenant.
+        A agenda fica bloqueada (advisory lock) até o commit da escrita.
+        """
+        await self.repo.bloquear_agenda(tenant_id)
+        conflito = await self.repo.obter_conflito(tenant_id, data_inicio, data_fim, compromisso_id)
+        if conflito:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Conflito de horário com '{conflito.titulo}' "
+                       f"({conflito.data_hora_inicio:%d/%m/%Y %H:%M} - {conflito.data_hora_fim:%H:%M})"
+            )
+
+    async def _conflito_no_banco(self, exc: IntegrityError):
+        """Violação da exclusion constraint ex_compromissos_sem_conflito (migration 012)."""
+        await self.repo.db.rollback()
+        if "ex_compromissos_sem_conflito" in str(exc.orig):
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Conflito de horário com outro compromisso")
+        raise exc
+
+    async def criar_compromisso(self, tenant_id: UUID, schema: CompromissoCreate) -> CompromissoRead:
         # Validações de negócio
         self._validar_datas(schema.data_hora_inicio, schema.data_hora_fim)
+        if schema.status != 'Cancelado':
+            await self._verificar_conflitos_horario(tenant_id, schema.data_hora_inicio, schema.data_hora_fim)
 
-        # TODO: Adicionar validação de conflitos de horário no futuro
-        # self._verificar_conflitos_horario(tenant_id, schema.data_hora_inicio, schema.data_hora_fim)
+        try:
+            db_compromisso = await self.repo.criar(tenant_id, schema)
+        except IntegrityError as exc:
+            await self._conflito_no_banco(exc)
+        return CompromissoRead.model_validate(db_compromisso)
 
-        db_compromisso = self.repo.criar(tenant_id, schema)
-        return CompromissoRead.from_attributes(db_compromisso)
-
-    def listar_compromissos(
+    async def listar_compromissos(
         self,
         tenant_id: UUID,
         skip: int = 0,
@@ -37,26 +77,33 @@ class CompromissoService:
         status: Optional[str] = None,
         tipo: Optional[str] = None,
         data_inicio: Optional[datetime] = None,
-        data_fim: Optional[datetime] = None
-    ) -> List[CompromissoRead]:
-        compromissos = self.repo.listar(
+        data_fim: Optional[datetime] = None,
+        cursor: Optional[str] = None
+    ) -> List[CompromissoRead] | PaginaCursor[CompromissoRead]:
+        compromissos = await self.repo.listar(
             tenant_id, skip, limit, cliente_id, pedido_id,
-            status, tipo, data_inicio, data_fim
+            status, tipo, para_utc_sem_fuso(data_inicio), para_utc_sem_fuso(data_fim), cursor
+        )
+        if cursor is None:
+            return validar_lista(CompromissoRead, compromissos)
+        compromissos, next_cursor = separar_pagina(compromissos, limit)
+        return PaginaCursor[CompromissoRead](
+            items=validar_lista(CompromissoRead, compromissos),
+            next_cursor=next_cursor
         )
-        return [CompromissoRead.from_attributes(c) for c in compromissos]
 
-    def obter_compromisso(self, tenant_id: UUID, compromisso_id: UUID) -> CompromissoRead:
-        db_compromisso = self.repo.obter_por_id(tenant_id, compromisso_id)
+    async def obter_compromisso(self, tenant_id: UUID, compromisso_id: UUID) -> CompromissoRead:
+        db_compromisso = await self.repo.obter_por_id(tenant_id, compromisso_id)
         if not db_compromisso:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Compromisso não encontrado"
             )
-        return CompromissoRead.from_attributes(db_compromisso)
+        return CompromissoRead.model_validate(db_compromisso)
 
-    def atualizar_compromisso(self, tenant_id: UUID, compromisso_id: UUID, schema: CompromissoUpdate) -> CompromissoRead:
+    async def atualizar_compromisso(self, tenant_id: UUID, compromisso_id: UUID, schema: CompromissoUpdate) -> CompromissoRead:
         # Busca compromisso existente para validação
-        db_compromisso = self.repo.obter_por_id(tenant_id, compromisso_id)
+        db_compromisso = await self.repo.obter_por_id(tenant_id, compromisso_id)
         if not db_compromisso:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -68,15 +115,28 @@ class CompromissoService:
         data_fim = schema.data_hora_fim or db_compromisso.data_hora_fim
         self._validar_datas(data_inicio, data_fim)
 
-        # TODO: Adicionar validação de conflitos de horário no futuro
-        # if schema.data_hora_inicio or schema.data_hora_fim:
-        #     self._verificar_conflitos_horario(tenant_id, data_inicio, data_fim, compromisso_id)
+        # Revalida conflitos se o horário mudou ou se o compromisso foi reativado
+        novo_status = schema.status or db_compromisso.status
+        reativado = db_compromisso.status == 'Cancelado' and novo_status != 'Cancelado'
+        if novo_status != 'Cancelado' and (schema.data_hora_inicio or schema.data_hora_fim or reativado):
+            await self._verificar_conflitos_horario(tenant_id, data_inicio, data_fim, compromisso_id)
 
-        db_compromisso = self.repo.atualizar(tenant_id, compromisso_id, schema)
-        return CompromissoRead.from_attributes(db_compromisso)
+        try:
+            db_compromisso = await self.repo.atualizar(tenant_id, compromisso_id, schema)
+        except IntegrityError as exc:
+            await self._conflito_no_banco(exc)
+        except ConflitoVersao:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Compromisso foi alterado por outra edição; recarregue e tente novamente")
+        if db_compromisso is None:
+            # Excluído por outra requisição entre a leitura e o UPDATE
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Compromisso não encontrado"
+            )
+        return CompromissoRead.model_validate(db_compromisso)
 
-    def deletar_compromisso(self, tenant_id: UUID, compromisso_id: UUID):
-        success = self.repo.deletar(tenant_id, compromisso_id)
+    async def deletar_compromisso(self, tenant_id: UUID, compromisso_id: UUID):
+        success = await self.repo.deletar(tenant_id, compromisso_id)
         if not success:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -84,7 +144,58 @@ class CompromissoService:
             )
         return {"detail": "Compromisso deletado com sucesso"}
 
-    def listar_por_periodo(self, tenant_id: UUID, data_inicio: datetime, data_fim: datetime) -> List[CompromissoRead]:
+    async def listar_por_periodo(self, tenant_id: UUID, data_inicio: datetime, data_fim: datetime) -> List[CompromissoRead]:
         """Retorna compromissos que ocorrem dentro do período especificado"""
-        compromissos = self.repo.listar_por_periodo(tenant_id, data_inicio, data_fim)
-        return [CompromissoRead.from_attributes(c) for c in compromissos]
+        data_inicio, data_fim = para_utc_sem_fuso(data_inicio), para_utc_sem_fuso(data_fim)
+        # Período invertido: 400 aqui, não erro do tsrange no PostgreSQL
+        self._validar_datas(data_inicio, data_fim)
+        compromissos = await self.repo.listar_por_periodo(tenant_id, data_inicio, data_fim)
+        return validar_lista(CompromissoRead, compromissos)
+
+    async def buscar_disponibilidade(
+        self,
+        tenant_id: UUID,
+        data_inicio: datetime,
+        data_fim: datetime,
+        duracao_minutos: int,
+        hora_inicio: time,
+        hora_fim: time,
+        incluir_fim_de_semana: bool = False,
+        fuso: Optional[str] = None
+    ) -> List[JanelaLivre]:
+        """
+        Janelas livres no expediente com pelo menos `duracao_minutos`. O
+        expediente é no horário local de `fuso` (padrão FUSO_HORARIO); as
+        janelas saem em UTC.
+        """
+        try:
+            zona = ZoneInfo(fuso or settings.FUSO_HORARIO)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Fuso horário desconhecido: {fuso}")
+        data_inicio = para_utc_sem_fuso(data_inicio)
+        data_fim = para_utc_sem_fuso(data_fim)
+        self._validar_datas(data_inicio, data_fim)
+        if hora_fim <= hora_inicio:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Fim do expediente deve ser posterior ao início"
+            )
+        if data_fim - data_inicio > timedelta(days=DISPONIBILIDADE_MAX_DIAS):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Período máximo de busca é de {DISPONIBILIDADE_MAX_DIAS} dias"
+            )
+
+        ocupados = await self.repo.listar_intervalos_ocupados(tenant_id, data_inicio, data_fim)
+        janelas = calcular_janelas_livres(
+            ocupados, data_inicio, data_fim, timedelta(minutes=duracao_minutos),
+            hora_inicio, hora_fim, incluir_fim_de_semana, zona
+        )
+        return [
+            JanelaLivre(
+                inicio=inicio.replace(tzinfo=timezone.utc),
+                fim=fim.replace(tzinfo=timezone.utc),
+                duracao_minutos=int((fim - inicio).total_seconds() // 60)
+            )
+            for inicio, fim in janelas
+        ]
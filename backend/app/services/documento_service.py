@@ -1,14 +1,45 @@
+import hashlib
 import os
+import threading
 from datetime import datetime
+from functools import lru_cache
+from fastapi.concurrency import run_in_threadpool
 from jinja2 import Environment, FileSystemLoader
 from weasyprint import HTML
+from weasyprint.text.fonts import FontConfiguration
 from typing import Any, Dict
 
+from app.core.pdf_cache import pdf_cache
+
+TEMPLATE_PEDIDO = "pedido.html"
+
+
+@lru_cache(maxsize=None)
+def _hash_template(caminho: str) -> str:
+    """Hash do template: mudar o layout invalida todos os PDFs em cache."""
+    with open(caminho, "rb") as arquivo:
+        return hashlib.sha256(arquivo.read()).hexdigest()
+
 class DocumentoService:
     def __init__(self):
         # Configura o diretório de templates
         self.template_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates")
         self.env = Environment(loader=FileSystemLoader(self.template_dir))
+        self.env.filters["moeda"] = self._formatar_moeda
+        # Reaproveitada entre renders: fontes do fontconfig só são carregadas uma vez
+        self.font_config = FontConfiguration()
+        # A instância é compartilhada pelas threads da API e o fontmap do
+        # Pango não é thread-safe
+        self._lock_render = threading.Lock()
+
+    def aquecer(self):
+        """
+        Compila o template e carrega as fontes antes do primeiro job (workers
+        de PDF chamam isto ao iniciar o processo).
+        """
+        self.env.get_template(TEMPLATE_PEDIDO)
+        with self._lock_render:
+            HTML(string="<p>aquecimento</p>").write_pdf(font_config=self.font_config)
 
     def _formatar_moeda(self, valor):
         if valor is None:
@@ -19,10 +50,8 @@ class DocumentoService:
         """
         Gera um PDF para um objeto Pedido (ou dicionário com estrutura similar).
         """
-        template = self.env.get_template("pedido.html")
-        
-        # Adiciona filtros customizados se necessário
-        self.env.filters["moeda"] = self._formatar_moeda
+        # Compilado uma vez e mantido no cache do Environment
+        template = self.env.get_template(TEMPLATE_PEDIDO)
 
         # Prepara o contexto para o template
         context = {
@@ -35,4 +64,38 @@ class DocumentoService:
         html_content = template.render(**context)
 
         # Gera PDF em memória
-        return HTML(string=html_content).write_pdf()
\ No newline at end of file
+        with self._lock_render:
+            return HTML(string=html_content).write_pdf(font_config=self.font_config)
+
+    def etag_pedido(self, pedido: Any) -> str:
+        """
+        ETag/chave de cache do PDF: pedido id + updated_at (do pedido e do
+        cliente exibido) + hash do template.
+        """
+        cliente = getattr(pedido, "cliente", None)
+        partes = [
+            str(pedido.id),
+            pedido.updated_at.isoformat() if pedido.updated_at else "",
+            cliente.updated_at.isoformat() if cliente is not None and cliente.updated_at else "",
+            _hash_template(os.path.join(self.template_dir, TEMPLATE_PEDIDO)),
+        ]
+        return hashlib.sha256("|".join(partes).encode()).hexdigest()[:32]
+
+    async def obter_pdf_pedido(self, pedido: Any, etag: str) -> bytes:
+        """PDF do cache em disco; renderiza (fora do event loop) e grava no miss."""
+        pdf_bytes = await run_in_threadpool(pdf_cache.obter, pedido.tenant_id, pedido.id, etag)
+        if pdf_bytes is None:
+            pdf_bytes = await run_in_threadpool(self.gerar_pdf_pedido, pedido)
+            await run_in_threadpool(pdf_cache.gravar, pedido.tenant_id, pedido.id, etag, pdf_bytes)
+        return pdf_bytes
+
+
+_documento_service: DocumentoService | None = None
+
+
+def get_documento_service() -> DocumentoService:
+    """Uma instância por processo: Environment e FontConfiguration custam caro."""
+    global _documento_service
+    if _documento_service is None:
+        _documento_service = DocumentoService()
+    return _documento_service
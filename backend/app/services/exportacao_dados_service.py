@@ -0,0 +1,97 @@
+# backend/app/services/exportacao_dados_service.py
+import codecs
+import csv
+import io
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, AsyncIterator, Optional, Sequence
+from uuid import UUID
+
+from fastapi import HTTPException, status as http_status
+
+from app.core.database import AsyncSessionLocal
+from app.core.serializacao import para_json
+from app.repos.exportacao_repo import ExportacaoRepository, status_validos
+
+# Linhas por lote do cursor no servidor (e por pedaço da resposta)
+LOTE_EXPORTACAO_DADOS = 2000
+FORMATOS_EXPORTACAO = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+
+
+def _valor_csv(valor: Any) -> Any:
+    if valor is None:
+        return ""
+    if isinstance(valor, Enum):
+        return valor.value
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    return valor  # str, int, Decimal e UUID o csv já escreve como str()
+
+
+class ExportacaoDadosService:
+    """
+    Exporta pedidos, pagamentos ou parcelas em CSV ou NDJSON, transmitidos
+    conforme o cursor no servidor entrega os lotes: a primeira linha sai
+    depois do primeiro lote e a memória não cresce com o total exportado.
+    Abre a própria sessão, como a exportação de PDFs: a da dependência já
+    foi fechada quando a StreamingResponse começa a ser consumida.
+    """
+
+    def __init__(self, tenant_id: UUID):
+        self.tenant_id = tenant_id
+
+    def validar_filtros(
+        self,
+        entidade: str,
+        status: Optional[str] = None,
+        data_inicio: Optional[date] = None,
+        data_fim: Optional[date] = None
+    ):
+        """
+        Chamar antes de montar a StreamingResponse: um filtro inválido dentro
+        de `gerar` só estouraria depois do 200 já enviado.
+        """
+        if status is not None and status not in status_validos(entidade):
+            raise HTTPException(
+                status_code=http_status.HTTP_400_BAD_REQUEST,
+                detail=f"Status inválido para {entidade}; use um de: {', '.join(status_validos(entidade))}"
+            )
+        if data_inicio and data_fim and data_fim < data_inicio:
+            raise HTTPException(
+                status_code=http_status.HTTP_400_BAD_REQUEST,
+                detail="Data de fim deve ser igual ou posterior à data de início"
+            )
+
+    def _csv(self, linhas: Sequence[Any], cabecalho: Optional[Sequence[str]] = None) -> bytes:
+        saida = io.StringIO()
+        escritor = csv.writer(saida)
+        if cabecalho:
+            escritor.writerow(cabecalho)
+        escritor.writerows([_valor_csv(v) for v in linha] for linha in linhas)
+        return saida.getvalue().encode("utf-8")
+
+    def _ndjson(self, colunas: Sequence[str], linhas: Sequence[Any]) -> bytes:
+        return b"".join(para_json(dict(zip(colunas, linha))) + b"\n" for linha in linhas)
+
+    async def gerar(
+        self,
+        entidade: str,
+        formato: str,
+        pedido_id: Optional[UUID] = None,
+        cliente_id: Optional[UUID] = None,
+        status: Optional[str] = None,
+        data_inicio: Optional[date] = None,
+        data_fim: Optional[date] = None
+    ) -> AsyncIterator[bytes]:
+        # Sessão só de leitura (cursor no servidor): pode ir inteira para uma réplica
+        info = {"tenant_id": str(self.tenant_id), "permite_replica": True, "somente_leitura": True}
+        async with AsyncSessionLocal(info=info) as db:
+            repo = ExportacaoRepository(db)
+            query = repo.consulta(entidade, self.tenant_id, pedido_id, cliente_id, status, data_inicio, data_fim)
+            colunas = [coluna.name for coluna in query.selected_columns]
+
+            if formato == "csv":
+                # BOM: o Excel só reconhece UTF-8 com ele; cabeçalho mesmo sem linhas
+                yield codecs.BOM_UTF8 + self._csv([], colunas)
+            async for linhas in repo.transmitir(query, LOTE_EXPORTACAO_DADOS):
+                yield self._csv(linhas) if formato == "csv" else self._ndjson(colunas, linhas)
@@ -0,0 +1,194 @@
+# backend/app/services/exportacao_service.py
+import asyncio
+import io
+import multiprocessing
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from types import SimpleNamespace
+from typing import AsyncIterator, List, Optional
+from uuid import UUID
+
+from fastapi import HTTPException, status as http_status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import inspect
+
+from app.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.pdf_cache import pdf_cache
+from app.repos.exportacao_repo import status_validos
+from app.repos.pedido_repo import PedidoRepository
+from app.services.documento_service import DocumentoService, get_documento_service
+from app.utils.paginacao import separar_pagina
+
+# Pedidos carregados do banco por vez (sessão curta por lote)
+LOTE_EXPORTACAO = 50
+
+_pool: ProcessPoolExecutor | None = None
+_renderizador: DocumentoService | None = None  # um por processo do pool
+
+
+def _iniciar_processo():
+    global _renderizador
+    _renderizador = DocumentoService()
+    _renderizador.aquecer()
+
+
+def _renderizar(pedido: SimpleNamespace) -> bytes:
+    return _renderizador.gerar_pdf_pedido(pedido)
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Pool de processos quentes, criado no primeiro uso (spawn: sem fork de threads do uvicorn)."""
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.PDF_EXPORT_PROCESSOS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_iniciar_processo,
+        )
+    return _pool
+
+
+def encerrar_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _instantaneo(obj) -> SimpleNamespace:
+    """Cópia só com colunas (picklável) para enviar ao processo de render."""
+    return SimpleNamespace(**{c.key: getattr(obj, c.key) for c in inspect(obj).mapper.column_attrs})
+
+
+def _instantaneo_pedido(pedido) -> SimpleNamespace:
+    copia = _instantaneo(pedido)
+    copia.cliente = _instantaneo(pedido.cliente) if pedido.cliente is not None else None
+    copia.itens = [_instantaneo(item) for item in pedido.itens]
+    return copia
+
+
+class _BufferZip(io.RawIOBase):
+    """
+    Destino não pesquisável do ZipFile: o zipfile passa a usar data
+    descriptors e o que foi escrito é drenado em pedaços para a resposta.
+    """
+
+    def __init__(self):
+        self._partes: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, dados) -> int:
+        self._partes.append(bytes(dados))
+        return len(dados)
+
+    def drenar(self) -> bytes:
+        dados = b"".join(self._partes)
+        self._partes.clear()
+        return dados
+
+
+class ExportacaoPDFService:
+    """
+    Exporta os PDFs de vários pedidos como um ZIP transmitido aos poucos.
+
+    A memória fica limitada a um lote de pedidos + os PDFs em voo (no máximo
+    2x o número de processos); cada PDF entra no ZIP assim que fica pronto.
+    Abre as próprias sessões: a sessão da dependência já foi fechada quando
+    uma StreamingResponse começa a ser consumida.
+    """
+
+    def __init__(self, tenant_id: UUID):
+        self.tenant_id = tenant_id
+        self.documento_service = get_documento_service()
+
+    def validar_filtros(
+        self,
+        data_inicio: Optional[date] = None,
+        data_fim: Optional[date] = None,
+        status: Optional[str] = None
+    ):
+        """Chamar antes de montar a StreamingResponse (depois dela o 200 já saiu)."""
+        if status is not None and status not in status_validos("pedidos"):
+            raise HTTPException(
+                status_code=http_status.HTTP_400_BAD_REQUEST,
+                detail=f"Status inválido; use um de: {', '.join(status_validos('pedidos'))}"
+            )
+        if data_inicio and data_fim and data_fim < data_inicio:
+            raise HTTPException(
+                status_code=http_status.HTTP_400_BAD_REQUEST,
+                detail="Data de fim deve ser igual ou posterior à data de início"
+            )
+
+    async def _pdf(self, pedido: SimpleNamespace) -> tuple[str, bytes]:
+        chave = self.documento_service.etag_pedido(pedido)
+        pdf_bytes = await run_in_threadpool(pdf_cache.obter, self.tenant_id, pedido.id, chave)
+        if pdf_bytes is None:
+            loop = asyncio.get_running_loop()
+            pdf_bytes = await loop.run_in_executor(_get_pool(), _renderizar, pedido)
+            await run_in_threadpool(pdf_cache.gravar, self.tenant_id, pedido.id, chave, pdf_bytes)
+        return f"pedido_{pedido.numero}.pdf", pdf_bytes
+
+    async def gerar_zip(
+        self,
+        data_inicio: Optional[date] = None,
+        data_fim: Optional[date] = None,
+        status: Optional[str] = None,
+        cliente_id: Optional[UUID] = None
+    ) -> AsyncIterator[bytes]:
+        buffer = _BufferZip()
+        limite_em_voo = settings.PDF_EXPORT_PROCESSOS * 2
+        em_voo: set[asyncio.Task] = set()
+        erros: List[str] = []
+        nomes: set[str] = set()
+
+        def adicionar(zf: zipfile.ZipFile, tarefa: asyncio.Task):
+            try:
+                nome, pdf_bytes = tarefa.result()
+            except Exception as exc:
+                erros.append(f"{tarefa.get_name()}: {exc}")
+                return
+            if nome in nomes:
+                nome = f"{nome[:-4]}_{tarefa.get_name()[:8]}.pdf"
+            nomes.add(nome)
+            # PDF já é comprimido: ZIP_STORED evita gastar CPU à toa
+            zf.writestr(nome, pdf_bytes, compress_type=zipfile.ZIP_STORED)
+
+        try:
+            with zipfile.ZipFile(buffer, "w") as zf:
+                # Keyset por (created_at, id): nem os ids do filtro inteiro ficam em memória
+                cursor: Optional[str] = ""
+                while cursor is not None:
+                    async with AsyncSessionLocal(info={"tenant_id": str(self.tenant_id), "permite_replica": True}) as db:
+                        linhas = await PedidoRepository(db).listar_para_exportacao(
+                            self.tenant_id, data_inicio, data_fim, status, cliente_id,
+                            limit=LOTE_EXPORTACAO, cursor=cursor
+                        )
+                        pedidos, cursor = separar_pagina(linhas, LOTE_EXPORTACAO)
+                        lote = [_instantaneo_pedido(p) for p in pedidos]
+
+                    for pedido in lote:
+                        em_voo.add(asyncio.create_task(self._pdf(pedido), name=str(pedido.id)))
+                        while len(em_voo) >= limite_em_voo:
+                            prontas, em_voo = await asyncio.wait(em_voo, return_when=asyncio.FIRST_COMPLETED)
+                            for tarefa in prontas:
+                                adicionar(zf, tarefa)
+                            yield buffer.drenar()
+
+                while em_voo:
+                    prontas, em_voo = await asyncio.wait(em_voo, return_when=asyncio.FIRST_COMPLETED)
+                    for tarefa in prontas:
+                        adicionar(zf, tarefa)
+                    yield buffer.drenar()
+
+                if erros:
+                    zf.writestr("ERROS.txt", "\n".join(erros))
+            # Diretório central, escrito no close()
+            yield buffer.drenar()
+        finally:
+            # Cliente desconectou no meio: não deixa renders órfãos
+            for tarefa in em_voo:
+                tarefa.cancel()
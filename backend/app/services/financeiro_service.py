@@ -0,0 +1,95 @@
+# backend/app/services/financeiro_service.py
+from app.config import settings
+from app.core.cache import CacheTenant
+from app.core.database import no_primario
+from app.repos.financeiro_repo import FinanceiroRepository
+from app.utils.fluxo_caixa import Agrupamento, inicios_dos_periodos, somar_por_periodo
+from uuid import UUID
+from datetime import date
+import numpy as np
+
+MESES_GRAFICO = 6
+
+# Invalidado pelas escritas de PedidoService e PagamentoService
+dashboard_cache = CacheTenant("financeiro:dashboard", ttl=settings.DASHBOARD_CACHE_TTL)
+
+class FinanceiroService:
+    def __init__(self, repo: FinanceiroRepository):
+        self.repo = repo
+
+    def _primeiro_mes_do_grafico(self, hoje: date) -> date:
+        """Primeiro dia do mês que abre a janela dos últimos MESES_GRAFICO meses (incluindo o atual)."""
+        indice = hoje.year * 12 + hoje.month - 1 - (MESES_GRAFICO - 1)
+        return date(indice // 12, indice % 12 + 1, 1)
+
+    async def obter_dashboard(self, tenant_id: UUID) -> dict:
+        """
+        Dashboard financeiro do tenant, servido do cache Redis quando possível.
+        O recálculo lê do primário: o valor vai para o cache.
+        """
+        async def calcular():
+            with no_primario(self.repo.db):
+                return await self._calcular_dashboard(tenant_id)
+
+        return await dashboard_cache.obter_ou_calcular(tenant_id, calcular)
+
+    async def _calcular_dashboard(self, tenant_id: UUID) -> dict:
+        """
+        Dados agregados do dashboard financeiro, lidos do rollup `vendas_mensais`
+        (O(meses) linhas em vez de O(pedidos)).
+        """
+        # 1. Resumo Geral (KPIs) - apenas pedidos não cancelados
+        total_vendas, qtd_pedidos = await self.repo.resumo_vendas(tenant_id)
+        ticket_medio = total_vendas / qtd_pedidos if qtd_pedidos > 0 else 0
+
+        # 2. Gráfico: Evolução últimos 6 meses
+        desde = self._primeiro_mes_do_grafico(date.today())
+        vendas_por_mes = await self.repo.vendas_por_mes(tenant_id, desde)
+
+        return {
+            "resumo": {
+                "total_vendas": float(total_vendas),
+                "qtd_pedidos": int(qtd_pedidos),
+                "ticket_medio": float(ticket_medio)
+            },
+            "pedidos_por_status": await self.repo.pedidos_por_status(tenant_id),
+            "grafico": [{"mes": v.mes.strftime("%Y-%m"), "total": float(v.total)} for v in vendas_por_mes]
+        }
+
+    async def obter_fluxo_caixa(self, tenant_id: UUID, meses: int, agrupamento: Agrupamento) -> dict:
+        """
+        Fluxo de caixa do mês atual até `meses` à frente: previsto (parcelas em
+        aberto, pelo vencimento) contra recebido (pagamentos pagos, pela data).
+
+        As colunas vêm numa consulta só e são somadas por período com NumPy
+        (centavos em int64), sem laço por linha nem Decimal.
+        """
+        hoje = date.today()
+        inicio = date(hoje.year, hoje.month, 1)
+        indice_fim = hoje.year * 12 + hoje.month - 1 + meses
+        fim = date(indice_fim // 12, indice_fim % 12 + 1, 1)
+        total_dias = (fim - inicio).days
+
+        previstas_dia, previstas_centavos, recebidos_dia, recebidos_centavos, em_atraso = \
+            await self.repo.colunas_fluxo_caixa(tenant_id, inicio, fim)
+
+        inicios = inicios_dos_periodos(inicio, fim, agrupamento)
+        previsto = somar_por_periodo(
+            np.asarray(previstas_dia, dtype=np.int64), np.asarray(previstas_centavos, dtype=np.int64), inicios, total_dias
+        )
+        recebido = somar_por_periodo(
+            np.asarray(recebidos_dia, dtype=np.int64), np.asarray(recebidos_centavos, dtype=np.int64), inicios, total_dias
+        )
+
+        return {
+            "agrupamento": agrupamento,
+            "inicio": inicio.isoformat(),
+            "fim": fim.isoformat(),
+            "em_atraso_antes_do_inicio": em_atraso / 100,
+            "total_previsto": int(previsto.sum()) / 100,
+            "total_recebido": int(recebido.sum()) / 100,
+            "periodos": [
+                {"inicio": str(periodo), "previsto": p / 100, "recebido": r / 100}
+                for periodo, p, r in zip(inicios.tolist(), previsto.tolist(), recebido.tolist())
+            ],
+        }
@@ -1,42 +1,70 @@
-import os
 import base64
-from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail, Attachment, FileContent, FileName, FileType, Disposition
+import time
+from typing import Dict, List
+from uuid import UUID
+
+from celery import chain
+from redis.exceptions import RedisError
+
+from app.config import settings
+from app.core.cache import get_redis
+from app.tasks.email import (
+    METRICAS_KEY, VAZAO_KEY,
+    enviar_email_task, enviar_lembretes_em_lote, enviar_pedido_email_task,
+)
+from app.tasks.pdf import renderizar_pdf_pedido
+
+# Tamanho máximo de cada tarefa de lote (limitado também pela cota por minuto)
+LOTE_LEMBRETES = 100
+
 
 class NotificacaoService:
-    def __init__(self):
-        self.api_key = os.getenv("SENDGRID_API_KEY")
-        self.from_email = os.getenv("MAIL_FROM", "noreply@microsaasmarcenaria.com")
-
-    def enviar_email(self, para: str, assunto: str, conteudo_html: str, anexo_bytes: bytes = None, nome_anexo: str = None):
-        """
-        Envia um e-mail usando a API do SendGrid.
-        """
-        if not self.api_key:
-            print("Aviso: SENDGRID_API_KEY não configurada. Email não enviado.")
-            return
-
-        message = Mail(
-            from_email=self.from_email,
-            to_emails=para,
-            subject=assunto,
-            html_content=conteudo_html
-        )
+    """
+    Lado da API do pipeline de e-mails: só enfileira. Conexões, cota por
+    tenant, retries e lotes ficam nas tarefas de app.tasks.email.
+    """
 
+    def enviar_email(self, tenant_id: UUID, para: str, assunto: str, conteudo_html: str,
+                     anexo_bytes: bytes = None, nome_anexo: str = None) -> str:
+        """Enfileira um e-mail e devolve o id da tarefa."""
+        anexos = None
         if anexo_bytes and nome_anexo:
-            encoded_file = base64.b64encode(anexo_bytes).decode()
-            attachment = Attachment(
-                FileContent(encoded_file),
-                FileName(nome_anexo),
-                FileType('application/pdf'),
-                Disposition('attachment')
-            )
-            message.attachment = attachment
+            anexos = [{"nome": nome_anexo, "conteudo_b64": base64.b64encode(anexo_bytes).decode(), "tipo": "application/pdf"}]
+        return enviar_email_task.delay(str(tenant_id), para, assunto, conteudo_html, anexos).id
 
+    def enviar_lembretes(self, tenant_id: UUID, mensagens: List[Dict]) -> List[str]:
+        """Enfileira lembretes [{"para", "assunto", "html"}] em tarefas de lote."""
+        tamanho = max(1, min(LOTE_LEMBRETES, settings.EMAIL_LIMITE_POR_MINUTO))
+        return [
+            enviar_lembretes_em_lote.delay(str(tenant_id), mensagens[inicio:inicio + tamanho]).id
+            for inicio in range(0, len(mensagens), tamanho)
+        ]
+
+    def enviar_pedido(self, tenant_id: UUID, pedido_id: UUID, email: str) -> str:
+        """Renderiza o PDF na fila `pdf` e depois envia como anexo."""
+        return chain(
+            renderizar_pdf_pedido.s(str(tenant_id), str(pedido_id)),
+            enviar_pedido_email_task.s(email),
+        ).delay().id
+
+    async def metricas(self) -> Dict:
+        """Totais, latência média de fila e vazão recente (todos os workers)."""
         try:
-            sg = SendGridAPIClient(self.api_key)
-            response = sg.send(message)
-            return response.status_code
-        except Exception as e:
-            print(f"Erro ao enviar email via SendGrid: {str(e)}")
-            raise e
\ No newline at end of file
+            cliente = get_redis()
+            totais = await cliente.hgetall(METRICAS_KEY)
+            minuto = int(time.time() // 60)
+            vazao = await cliente.mget([VAZAO_KEY.format(minuto=minuto - i) for i in range(1, 6)])
+        except RedisError:
+            return {"disponivel": False}
+
+        amostras = int(totais.get("latencia_fila_amostras", 0))
+        por_minuto = [int(v or 0) for v in vazao]
+        return {
+            "enviados": int(totais.get("enviados", 0)),
+            "falhas": int(totais.get("falhas", 0)),
+            "retentativas": int(totais.get("retentativas", 0)),
+            "adiados_por_cota": int(totais.get("adiados", 0)),
+            "latencia_fila_media_ms": round(float(totais.get("latencia_fila_s_total", 0)) / amostras * 1000, 1) if amostras else None,
+            "enviados_ultimo_minuto": por_minuto[0],
+            "enviados_por_minuto_5min": round(sum(por_minuto) / 5, 1),
+        }
@@ -1,8 +1,13 @@
 # backend/app/services/pagamento_service.py
 from fastapi import HTTPException, status
 from app.repos.pagamento_repo import PagamentoRepository
+from app.repos.escrita import ConflitoVersao
 from app.schemas.pagamento import PagamentoCreate, PagamentoUpdate, PagamentoRead
 from app.schemas.parcela import ParcelaCreate, ParcelaUpdate, ParcelaRead, StatusParcela
+from app.schemas.paginacao import PaginaCursor
+from app.utils.paginacao import separar_pagina
+from app.core.serializacao import validar_lista
+from app.services.financeiro_service import dashboard_cache
 from uuid import UUID
 from typing import List, Optional
 from datetime import date, timedelta
@@ -13,34 +18,46 @@ class PagamentoService:
         self.repo = repo
     
     # --- Métodos para Pagamento ---
-    def criar_pagamento(self, tenant_id: UUID, schema: PagamentoCreate) -> PagamentoRead:
-        db_pagamento = self.repo.criar_pagamento(tenant_id, schema)
-        return PagamentoRead.from_attributes(db_pagamento)
+    async def criar_pagamento(self, tenant_id: UUID, schema: PagamentoCreate) -> PagamentoRead:
+        db_pagamento = await self.repo.criar_pagamento(tenant_id, schema)
+        await dashboard_cache.invalidar(tenant_id)
+        return PagamentoRead.model_validate(db_pagamento)
     
-    def listar_pagamentos(self, tenant_id: UUID, pedido_id: Optional[UUID] = None, skip: int = 0, limit: int = 10) -> List[PagamentoRead]:
-        pagamentos = self.repo.listar_pagamentos(tenant_id, pedido_id, skip, limit)
-        return [PagamentoRead.from_attributes(p) for p in pagamentos]
+    async def listar_pagamentos(self, tenant_id: UUID, pedido_id: Optional[UUID] = None, skip: int = 0, limit: int = 10, cursor: Optional[str] = None) -> List[PagamentoRead] | PaginaCursor[PagamentoRead]:
+        pagamentos = await self.repo.listar_pagamentos(tenant_id, pedido_id, skip, limit, cursor)
+        if cursor is None:
+            return validar_lista(PagamentoRead, pagamentos)
+        pagamentos, next_cursor = separar_pagina(pagamentos, limit)
+        return PaginaCursor[PagamentoRead](
+            items=validar_lista(PagamentoRead, pagamentos),
+            next_cursor=next_cursor
+        )
 
-    def obter_pagamento(self, tenant_id: UUID, pagamento_id: UUID) -> PagamentoRead:
-        db_pagamento = self.repo.obter_pagamento_por_id(tenant_id, pagamento_id)
+    async def obter_pagamento(self, tenant_id: UUID, pagamento_id: UUID) -> PagamentoRead:
+        db_pagamento = await self.repo.obter_pagamento_por_id(tenant_id, pagamento_id)
         if not db_pagamento:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Pagamento não encontrado")
-        return PagamentoRead.from_attributes(db_pagamento)
+        return PagamentoRead.model_validate(db_pagamento)
 
-    def atualizar_pagamento(self, tenant_id: UUID, pagamento_id: UUID, schema: PagamentoUpdate) -> PagamentoRead:
-        db_pagamento = self.repo.atualizar_pagamento(tenant_id, pagamento_id, schema)
+    async def atualizar_pagamento(self, tenant_id: UUID, pagamento_id: UUID, schema: PagamentoUpdate) -> PagamentoRead:
+        try:
+            db_pagamento = await self.repo.atualizar_pagamento(tenant_id, pagamento_id, schema)
+        except ConflitoVersao:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Pagamento foi alterado por outra edição; recarregue e tente novamente")
         if not db_pagamento:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Pagamento não encontrado")
-        return PagamentoRead.from_attributes(db_pagamento)
+        await dashboard_cache.invalidar(tenant_id)
+        return PagamentoRead.model_validate(db_pagamento)
 
-    def deletar_pagamento(self, tenant_id: UUID, pagamento_id: UUID):
-        success = self.repo.deletar_pagamento(tenant_id, pagamento_id)
+    async def deletar_pagamento(self, tenant_id: UUID, pagamento_id: UUID):
+        success = await self.repo.deletar_pagamento(tenant_id, pagamento_id)
         if not success:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Pagamento não encontrado")
+        await dashboard_cache.invalidar(tenant_id)
         return {"detail": "Pagamento deletado com sucesso"}
     
     # --- Métodos para Parcela ---
-    def gerar_parcelas_para_pedido(
+    async def gerar_parcelas_para_pedido(
         self, 
         tenant_id: UUID, 
         pedido_id: UUID, 
@@ -66,39 +83,47 @@ class PagamentoService:
                 status=StatusParcela.pendente # Novas parcelas são sempre pendentes
             ))
         
-        db_parcelas = self.repo.criar_parcelas_em_lote(tenant_id, pedido_id, parcelas_schemas)
-        return [ParcelaRead.from_attributes(p) for p in db_parcelas]
+        db_parcelas = await self.repo.criar_parcelas_em_lote(tenant_id, pedido_id, parcelas_schemas)
+        await dashboard_cache.invalidar(tenant_id)
+        return validar_lista(ParcelaRead, db_parcelas)
 
-    def listar_parcelas_por_pedido(self, tenant_id: UUID, pedido_id: UUID, skip: int = 0, limit: int = 10) -> List[ParcelaRead]:
-        parcelas = self.repo.listar_parcelas_por_pedido(tenant_id, pedido_id, skip, limit)
-        return [ParcelaRead.from_attributes(p) for p in parcelas]
+    async def listar_parcelas_por_pedido(self, tenant_id: UUID, pedido_id: UUID, skip: int = 0, limit: int = 10, cursor: Optional[str] = None) -> List[ParcelaRead] | PaginaCursor[ParcelaRead]:
+        parcelas = await self.repo.listar_parcelas_por_pedido(tenant_id, pedido_id, skip, limit, cursor)
+        if cursor is None:
+            return validar_lista(ParcelaRead, parcelas)
+        parcelas, next_cursor = separar_pagina(parcelas, limit)
+        return PaginaCursor[ParcelaRead](
+            items=validar_lista(ParcelaRead, parcelas),
+            next_cursor=next_cursor
+        )
 
-    def obter_parcela(self, tenant_id: UUID, parcela_id: UUID) -> ParcelaRead:
-        db_parcela = self.repo.obter_parcela_por_id(tenant_id, parcela_id)
+    async def obter_parcela(self, tenant_id: UUID, parcela_id: UUID) -> ParcelaRead:
+        db_parcela = await self.repo.obter_parcela_por_id(tenant_id, parcela_id)
         if not db_parcela:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Parcela não encontrada")
-        return ParcelaRead.from_attributes(db_parcela)
+        return ParcelaRead.model_validate(db_parcela)
     
-    def atualizar_parcela(self, tenant_id: UUID, parcela_id: UUID, schema: ParcelaUpdate) -> ParcelaRead:
-        db_parcela = self.repo.atualizar_parcela(tenant_id, parcela_id, schema)
+    async def atualizar_parcela(self, tenant_id: UUID, parcela_id: UUID, schema: ParcelaUpdate) -> ParcelaRead:
+        try:
+            db_parcela = await self.repo.atualizar_parcela(tenant_id, parcela_id, schema)
+        except ConflitoVersao:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Parcela foi alterada por outra edição; recarregue e tente novamente")
         if not db_parcela:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Parcela não encontrada")
-        return ParcelaRead.from_attributes(db_parcela)
+        await dashboard_cache.invalidar(tenant_id)
+        return ParcelaRead.model_validate(db_parcela)
 
-    def marcar_parcela_como_paga(self, tenant_id: UUID, parcela_id: UUID) -> ParcelaRead:
-        db_parcela = self.repo.obter_parcela_por_id(tenant_id, parcela_id)
+    async def marcar_parcela_como_paga(self, tenant_id: UUID, parcela_id: UUID) -> ParcelaRead:
+        # Marca como paga com a data de hoje (um UPDATE ... RETURNING)
+        db_parcela = await self.repo.marcar_parcela_paga(tenant_id, parcela_id, date.today())
         if not db_parcela:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Parcela não encontrada")
-        
-        # Lógica para marcar como paga
-        db_parcela.status = StatusParcela.paga
-        db_parcela.data_pagamento = date.today() # Define a data de pagamento como hoje
-        self.repo.db.commit()
-        self.repo.db.refresh(db_parcela)
-        return ParcelaRead.from_attributes(db_parcela)
+        await dashboard_cache.invalidar(tenant_id)
+        return ParcelaRead.model_validate(db_parcela)
 
-    def deletar_parcela(self, tenant_id: UUID, parcela_id: UUID):
-        success = self.repo.deletar_parcela(tenant_id, parcela_id)
+    async def deletar_parcela(self, tenant_id: UUID, parcela_id: UUID):
+        success = await self.repo.deletar_parcela(tenant_id, parcela_id)
         if not success:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Parcela não encontrada")
+        await dashboard_cache.invalidar(tenant_id)
         return {"detail": "Parcela deletada com sucesso"}
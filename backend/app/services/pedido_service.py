@@ -1,17 +1,39 @@
 # backend/app/services/pedido_service.py
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from app.repos.pedido_repo import PedidoRepository
+from app.repos.escrita import ConflitoVersao
 from app.schemas.pedido import PedidoCreate, PedidoUpdate, PedidoRead
+from app.schemas.paginacao import PaginaCursor
+from app.utils.paginacao import separar_pagina
+from app.core.serializacao import validar_lista
+from app.utils.itens_pedido import DiffItens, comparar_itens, valor_item
+from app.services.financeiro_service import dashboard_cache
+from app.core.pdf_cache import pdf_cache
 from uuid import UUID
+from decimal import Decimal
 from typing import List, Optional
 
 class PedidoService:
     def __init__(self, repo: PedidoRepository):
         self.repo = repo
     
-    def _calcular_valores_pedido(self, schema: PedidoCreate | PedidoUpdate):
-        """Calcula subtotal, desconto e total do pedido com base nos itens."""
-        subtotal = sum(item.quantidade * item.preco_unitario for item in schema.itens if item.quantidade and item.preco_unitario)
+    def _calcular_valores_pedido(
+        self,
+        schema: PedidoCreate | PedidoUpdate,
+        subtotal_atual: Optional[Decimal] = None,
+        diff: Optional[DiffItens] = None
+    ):
+        """
+        Calcula subtotal, desconto e total do pedido com base nos itens.
+
+        Na criação soma todas as linhas; na edição parte do subtotal gravado
+        e aplica só o delta das linhas alteradas, inseridas e removidas.
+        """
+        if diff is None:
+            subtotal = sum((valor_item(item.quantidade, item.preco_unitario) for item in schema.itens), Decimal(0))
+        else:
+            subtotal = (subtotal_atual or Decimal(0)) + diff.delta_subtotal
         
         # Desconto pode ser um valor fixo ou percentual, aqui assumimos fixo por simplicidade
         # Lógica mais complexa para cálculo de impostos, frete, etc., pode ser adicionada aqui
@@ -21,33 +43,58 @@ class PedidoService:
         if schema.valor_total < 0:
             schema.valor_total = 0 # Evitar valor total negativo
 
-    def criar_pedido(self, tenant_id: UUID, schema: PedidoCreate) -> PedidoRead:
+    async def criar_pedido(self, tenant_id: UUID, schema: PedidoCreate) -> PedidoRead:
         self._calcular_valores_pedido(schema) # Calcula valores antes de criar
-        db_pedido = self.repo.criar(tenant_id, schema)
-        return PedidoRead.from_attributes(db_pedido)
+        db_pedido = await self.repo.criar(tenant_id, schema)
+        await dashboard_cache.invalidar(tenant_id)
+        return PedidoRead.model_validate(db_pedido)
     
-    def listar_pedidos(self, tenant_id: UUID, skip: int = 0, limit: int = 10) -> List[PedidoRead]:
-        pedidos = self.repo.listar(tenant_id, skip, limit)
-        return [PedidoRead.from_attributes(p) for p in pedidos]
+    async def listar_pedidos(self, tenant_id: UUID, skip: int = 0, limit: int = 10, cursor: Optional[str] = None) -> List[PedidoRead] | PaginaCursor[PedidoRead]:
+        pedidos = await self.repo.listar(tenant_id, skip, limit, cursor)
+        if cursor is None:
+            return validar_lista(PedidoRead, pedidos)
+        pedidos, next_cursor = separar_pagina(pedidos, limit)
+        return PaginaCursor[PedidoRead](
+            items=validar_lista(PedidoRead, pedidos),
+            next_cursor=next_cursor
+        )
+
+    async def obter_pedido(self, tenant_id: UUID, pedido_id: UUID) -> PedidoRead:
+        db_pedido = await self.repo.obter_por_id(tenant_id, pedido_id)
+        if not db_pedido:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Pedido não encontrado")
+        return PedidoRead.model_validate(db_pedido)
 
-    def obter_pedido(self, tenant_id: UUID, pedido_id: UUID) -> PedidoRead:
-        db_pedido = self.repo.obter_por_id(tenant_id, pedido_id)
+    async def atualizar_pedido(self, tenant_id: UUID, pedido_id: UUID, schema: PedidoUpdate) -> PedidoRead:
+        db_pedido = await self.repo.obter_por_id(tenant_id, pedido_id)
         if not db_pedido:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Pedido não encontrado")
-        return PedidoRead.from_attributes(db_pedido)
+        if schema.versao is not None and schema.versao != db_pedido.versao:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Pedido foi alterado por outra edição; recarregue e tente novamente")
 
-    def atualizar_pedido(self, tenant_id: UUID, pedido_id: UUID, schema: PedidoUpdate) -> PedidoRead:
-        # Recalcula valores se os itens forem atualizados ou outros campos relevantes
+        # Itens enviados: diff contra os gravados e recálculo incremental dos valores
+        diff = None
         if schema.itens is not None:
-            self._calcular_valores_pedido(schema)
+            try:
+                diff = comparar_itens(db_pedido.itens, schema.itens)
+            except ValueError as exc:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+            self._calcular_valores_pedido(schema, db_pedido.valor_subtotal, diff)
         
-        db_pedido = self.repo.atualizar(tenant_id, pedido_id, schema)
+        try:
+            db_pedido = await self.repo.atualizar(db_pedido, schema, diff)
+        except ConflitoVersao:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Pedido foi alterado por outra edição; recarregue e tente novamente")
         if not db_pedido:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Pedido não encontrado")
-        return PedidoRead.from_attributes(db_pedido)
+        await dashboard_cache.invalidar(tenant_id)
+        await run_in_threadpool(pdf_cache.invalidar, tenant_id, pedido_id)
+        return PedidoRead.model_validate(db_pedido)
 
-    def deletar_pedido(self, tenant_id: UUID, pedido_id: UUID):
-        success = self.repo.deletar(tenant_id, pedido_id)
+    async def deletar_pedido(self, tenant_id: UUID, pedido_id: UUID):
+        success = await self.repo.deletar(tenant_id, pedido_id)
         if not success:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Pedido não encontrado")
+        await dashboard_cache.invalidar(tenant_id)
+        await run_in_threadpool(pdf_cache.invalidar, tenant_id, pedido_id)
         return {"detail": "Pedido deletado com sucesso"}
@@ -0,0 +1 @@
+# Tarefas Celery (registradas em app.core.celery_app)
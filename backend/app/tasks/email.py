@@ -0,0 +1,181 @@
+# backend/app/tasks/email.py
+"""
+Pipeline de envio de e-mails (Celery).
+
+- Transporte criado uma vez por processo (app.core.email.get_transporte),
+  reaproveitando conexões HTTP/SMTP entre mensagens.
+- Limite por tenant: EMAIL_LIMITE_POR_MINUTO numa janela de 1 minuto no
+  Redis. Acima dele a tarefa é reenfileirada para a próxima janela, sem
+  consumir tentativas.
+- Falhas transitórias (rede, 429, 5xx) têm retry com backoff exponencial e
+  jitter; falhas permanentes vão direto para FAILURE.
+- Lotes: enviar_lembretes_em_lote manda várias mensagens numa tarefa (o
+  SendGrid junta as de mesmo conteúdo numa só chamada).
+- Métricas no Redis (latência de fila e vazão), lidas em /health/email.
+
+A entrega é at-least-once: um lote que falha no meio é reenviado inteiro.
+"""
+import base64
+import html
+import logging
+import random
+import time
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from celery.signals import before_task_publish
+from redis.exceptions import RedisError
+
+from app.config import settings
+from app.core.cache import get_redis_sync
+from app.core.celery_app import celery_app
+from app.core.email import Anexo, ErroPermanenteEmail, ErroTransitorioEmail, Mensagem, get_transporte
+from app.core.pdf_cache import pdf_cache
+from app.tasks.pdf import renderizar_pdf_pedido
+
+logger = logging.getLogger(__name__)
+
+METRICAS_KEY = "metricas:email"
+VAZAO_KEY = "metricas:email:enviados:{minuto}"
+COTA_KEY = "email:cota:{tenant_id}:{janela}"
+TENANT_SISTEMA = "sistema"  # e-mails sem tenant (ex.: boas-vindas)
+
+TAREFAS_EMAIL = {"enviar_email", "enviar_lembretes_em_lote", "enviar_pedido_email", "enviar_email_boas_vindas"}
+
+OPCOES_RETRY = dict(
+    bind=True,
+    autoretry_for=(ErroTransitorioEmail,),
+    retry_backoff=5,
+    retry_backoff_max=600,
+    retry_jitter=True,
+    max_retries=6,
+    acks_late=True,
+)
+
+
+@before_task_publish.connect
+def _carimbar_enfileiramento(sender=None, headers=None, **_):
+    """Marca a hora de publicação para medir a latência de fila no worker."""
+    if sender in TAREFAS_EMAIL and headers is not None:
+        headers.setdefault("enfileirado_em", time.time())
+
+
+def _reservar_cota(tenant_id: str, quantidade: int) -> float:
+    """Reserva envios na janela do minuto; devolve quantos segundos esperar (0 = liberado)."""
+    agora = time.time()
+    chave = COTA_KEY.format(tenant_id=tenant_id, janela=int(agora // 60))
+    try:
+        cliente = get_redis_sync()
+        usados, _ = cliente.pipeline().incrby(chave, quantidade).expire(chave, 120).execute()
+        if usados > settings.EMAIL_LIMITE_POR_MINUTO:
+            cliente.decrby(chave, quantidade)
+            return 60 - (agora % 60) + random.uniform(0, 5)
+    except RedisError as exc:
+        # Sem Redis não há como contar: envia em vez de travar a fila
+        logger.warning("Cota de e-mail indisponível: %s", exc)
+    return 0
+
+
+def _registrar(enviados: int = 0, falhas: int = 0, retentativas: int = 0, adiados: int = 0,
+               latencia_fila_s: Optional[float] = None) -> None:
+    try:
+        pipe = get_redis_sync().pipeline()
+        for campo, valor in (("enviados", enviados), ("falhas", falhas),
+                             ("retentativas", retentativas), ("adiados", adiados)):
+            if valor:
+                pipe.hincrby(METRICAS_KEY, campo, valor)
+        if enviados:
+            chave_vazao = VAZAO_KEY.format(minuto=int(time.time() // 60))
+            pipe.incrby(chave_vazao, enviados).expire(chave_vazao, 3600)
+        if latencia_fila_s is not None:
+            pipe.hincrbyfloat(METRICAS_KEY, "latencia_fila_s_total", latencia_fila_s)
+            pipe.hincrby(METRICAS_KEY, "latencia_fila_amostras", 1)
+        pipe.execute()
+    except RedisError as exc:
+        logger.warning("Falha ao registrar métricas de e-mail: %s", exc)
+
+
+def _latencia_fila(task) -> Optional[float]:
+    """Só a primeira tentativa conta: retries têm countdown proposital."""
+    if task.request.retries:
+        return None
+    enfileirado_em = getattr(task.request, "enfileirado_em", None) or (task.request.headers or {}).get("enfileirado_em")
+    return time.time() - float(enfileirado_em) if enfileirado_em else None
+
+
+def _enviar(task, tenant_id: str, mensagens: List[Mensagem]) -> Dict:
+    espera = _reservar_cota(tenant_id, len(mensagens))
+    if espera:
+        # Reenfileira para a próxima janela sem gastar tentativas de retry
+        task.apply_async(args=task.request.args, kwargs=task.request.kwargs, countdown=espera)
+        _registrar(adiados=len(mensagens))
+        return {"status": "adiado", "em_segundos": round(espera, 1)}
+
+    latencia = _latencia_fila(task)
+    try:
+        get_transporte().enviar_lote(mensagens)
+    except ErroTransitorioEmail:
+        _registrar(retentativas=1, latencia_fila_s=latencia)
+        if task.request.retries >= task.max_retries:
+            _registrar(falhas=len(mensagens))
+        raise
+    except ErroPermanenteEmail:
+        _registrar(falhas=len(mensagens), latencia_fila_s=latencia)
+        raise
+    _registrar(enviados=len(mensagens), latencia_fila_s=latencia)
+    return {"status": "enviado", "quantidade": len(mensagens)}
+
+
+@celery_app.task(name="enviar_email", **OPCOES_RETRY)
+def enviar_email_task(self, tenant_id: str, para: str, assunto: str, html: str,
+                      anexos: Optional[List[Dict]] = None) -> Dict:
+    """Uma mensagem; anexos como [{"nome", "conteudo_b64", "tipo"}]."""
+    mensagem = Mensagem(
+        para=para,
+        assunto=assunto,
+        html=html,
+        anexos=[Anexo(a["nome"], base64.b64decode(a["conteudo_b64"]), a.get("tipo", "application/pdf"))
+                for a in anexos or []],
+    )
+    return _enviar(self, tenant_id, [mensagem])
+
+
+@celery_app.task(name="enviar_lembretes_em_lote", **OPCOES_RETRY)
+def enviar_lembretes_em_lote(self, tenant_id: str, mensagens: List[Dict]) -> Dict:
+    """Lote de lembretes [{"para", "assunto", "html"}] numa só tarefa."""
+    return _enviar(self, tenant_id, [Mensagem(m["para"], m["assunto"], m["html"]) for m in mensagens])
+
+
+@celery_app.task(name="enviar_pedido_email", **OPCOES_RETRY)
+def enviar_pedido_email_task(self, resultado_pdf: Dict, email: str) -> Dict:
+    """
+    Segundo passo da cadeia renderizar_pdf_pedido | enviar_pedido_email: lê
+    o PDF do cache compartilhado e envia como anexo.
+    """
+    tenant_id, pedido_id = resultado_pdf["tenant_id"], resultado_pdf["pedido_id"]
+    pdf_bytes = pdf_cache.obter(UUID(tenant_id), UUID(pedido_id), resultado_pdf["chave"])
+    if pdf_bytes is None:
+        # Evicção ou pedido alterado entre os passos: renderiza aqui mesmo
+        resultado_pdf = renderizar_pdf_pedido(tenant_id, pedido_id)
+        pdf_bytes = pdf_cache.obter(UUID(tenant_id), UUID(pedido_id), resultado_pdf["chave"])
+        if pdf_bytes is None:
+            raise ErroTransitorioEmail("PDF do pedido indisponível no cache")
+
+    numero = resultado_pdf["numero"]
+    mensagem = Mensagem(
+        para=email,
+        assunto=f"Pedido/Orçamento {numero}",
+        html=f"<p>Olá,</p><p>Segue em anexo o documento referente ao pedido <strong>{html.escape(numero)}</strong>.</p>",
+        anexos=[Anexo(f"pedido_{numero}.pdf", pdf_bytes)],
+    )
+    return _enviar(self, tenant_id, [mensagem])
+
+
+@celery_app.task(name="enviar_email_boas_vindas", **OPCOES_RETRY)
+def enviar_email_boas_vindas(self, email: str, nome: str) -> Dict:
+    mensagem = Mensagem(
+        para=email,
+        assunto="Bem-vindo(a) ao MicroSaaS Marcenaria",
+        html=f"<p>Olá, {html.escape(nome)}!</p><p>Sua conta foi criada com sucesso.</p>",
+    )
+    return _enviar(self, TENANT_SISTEMA, [mensagem])
@@ -0,0 +1,92 @@
+# backend/app/tasks/parcelas.py
+"""
+Varredura de parcelas vencidas (Celery beat, ver beat_schedule em
+app.core.celery_app).
+
+Passa para "Atrasada" toda parcela "Pendente" com vencimento anterior a hoje,
+de todos os tenants, em UPDATEs de até PARCELAS_ATRASO_LOTE linhas (uma
+transação por lote, lidas pelo índice parcial de pendentes da migration 016).
+
+- Idempotente: só casa com pendentes vencidas, então rodar de novo não muda nada.
+- Concorrência: um advisory lock de sessão garante uma varredura por vez no
+  cluster inteiro; quem não pega o lock sai sem fazer nada. As linhas em
+  edição são puladas (SKIP LOCKED) e entram na próxima execução.
+- O resumo por tenant (quantidade e valor que passaram a atrasadas) vai para
+  o log e é o resultado da tarefa.
+"""
+import logging
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import text
+
+from app.config import settings
+from app.core.celery_app import celery_app
+from app.core.database import engine
+
+logger = logging.getLogger(__name__)
+
+NOME_LOCK = "varrer_parcelas_atrasadas"
+
+# O predicado (status::text = 'Pendente') é o mesmo do índice parcial
+ATUALIZAR_LOTE = text("""
+    WITH lote AS (
+        SELECT id FROM parcelas
+        WHERE status::text = 'Pendente' AND data_vencimento < :hoje
+        ORDER BY data_vencimento, id
+        LIMIT :lote
+        FOR UPDATE SKIP LOCKED
+    ), atualizadas AS (
+        UPDATE parcelas p
+           SET status = 'Atrasada', versao = p.versao + 1, updated_at = timezone('utc', now())
+          FROM lote
+         WHERE p.id = lote.id
+        RETURNING p.tenant_id, p.valor_parcela
+    )
+    SELECT tenant_id, count(*) AS quantidade, coalesce(sum(valor_parcela), 0) AS valor
+    FROM atualizadas
+    GROUP BY tenant_id
+""")
+
+
+@celery_app.task(name="varrer_parcelas_atrasadas")
+def varrer_parcelas_atrasadas() -> Dict:
+    # "Hoje" no fuso do negócio: a parcela vence no fim do dia local
+    hoje = datetime.now(ZoneInfo(celery_app.conf.timezone)).date()
+    resumo: Dict[str, Dict] = defaultdict(lambda: {"quantidade": 0, "valor": Decimal(0)})
+    lotes = 0
+
+    with engine.connect() as conn:
+        if not conn.scalar(text("SELECT pg_try_advisory_lock(hashtext(:nome))"), {"nome": NOME_LOCK}):
+            conn.rollback()
+            logger.info("Varredura de parcelas atrasadas já em execução em outro worker")
+            return {"status": "ignorado"}
+        conn.commit()
+        try:
+            while True:
+                with conn.begin():
+                    linhas = conn.execute(ATUALIZAR_LOTE, {"hoje": hoje, "lote": settings.PARCELAS_ATRASO_LOTE}).all()
+                lotes += 1
+                for tenant_id, quantidade, valor in linhas:
+                    resumo[str(tenant_id)]["quantidade"] += quantidade
+                    resumo[str(tenant_id)]["valor"] += valor
+                if sum(quantidade for _, quantidade, _ in linhas) < settings.PARCELAS_ATRASO_LOTE:
+                    break
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(hashtext(:nome))"), {"nome": NOME_LOCK})
+            conn.commit()
+
+    for tenant_id, dados in resumo.items():
+        logger.info("Tenant %s: %d parcela(s) em atraso (R$ %s)", tenant_id, dados["quantidade"], dados["valor"])
+    total = sum(dados["quantidade"] for dados in resumo.values())
+    logger.info("Varredura de parcelas atrasadas: %d parcela(s), %d tenant(s), %d lote(s)", total, len(resumo), lotes)
+
+    return {
+        "status": "concluido",
+        "data_referencia": hoje.isoformat(),
+        "total": total,
+        "tenants": {tenant_id: {"quantidade": d["quantidade"], "valor": str(d["valor"])} for tenant_id, d in resumo.items()},
+    }
@@ -0,0 +1,59 @@
+# backend/app/tasks/pdf.py
+"""
+Renderização de PDFs de pedidos na fila dedicada `pdf`.
+
+Cada processo do worker mantém um DocumentoService quente (Environment do
+Jinja, template compilado e FontConfiguration do WeasyPrint) entre os jobs.
+O PDF vai para o cache em disco endereçado por conteúdo (PDF_CACHE_DIR,
+compartilhado com a API); o resultado do job é só a chave/ETag.
+"""
+import logging
+from uuid import UUID
+
+from celery.signals import worker_process_init
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload, selectinload
+
+from app.core.celery_app import celery_app
+from app.core.database import SessionLocal
+from app.core.pdf_cache import pdf_cache
+from app.models.pedido import Pedido
+from app.services.documento_service import get_documento_service
+
+logger = logging.getLogger(__name__)
+
+
+@worker_process_init.connect
+def _aquecer_renderizador(**_):
+    """Cada processo filho do prefork já nasce com template e fontes carregados."""
+    try:
+        get_documento_service().aquecer()
+    except Exception:
+        logger.exception("Falha ao aquecer o renderizador de PDF")
+
+
+def _carregar_pedido(tenant_id: str, pedido_id: str) -> Pedido | None:
+    with SessionLocal(info={"tenant_id": tenant_id}) as db:
+        pedido = db.execute(
+            select(Pedido)
+            .options(selectinload(Pedido.itens), joinedload(Pedido.cliente))
+            .where(Pedido.tenant_id == UUID(tenant_id), Pedido.id == UUID(pedido_id))
+        ).scalars().first()
+        if pedido is not None:
+            db.expunge(pedido)
+        return pedido
+
+
+@celery_app.task(name="renderizar_pdf_pedido", acks_late=True)
+def renderizar_pdf_pedido(tenant_id: str, pedido_id: str) -> dict:
+    """Renderiza (ou reaproveita do cache) o PDF do pedido e devolve a chave."""
+    pedido = _carregar_pedido(tenant_id, pedido_id)
+    if pedido is None:
+        raise LookupError("Pedido não encontrado")
+
+    servico = get_documento_service()
+    chave = servico.etag_pedido(pedido)
+    if pdf_cache.obter(pedido.tenant_id, pedido.id, chave) is None:
+        pdf_cache.gravar(pedido.tenant_id, pedido.id, chave, servico.gerar_pdf_pedido(pedido))
+
+    return {"tenant_id": tenant_id, "pedido_id": pedido_id, "numero": pedido.numero, "chave": chave}
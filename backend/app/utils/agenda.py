@@ -0,0 +1,86 @@
+from datetime import datetime, time, timedelta, timezone, tzinfo
+from typing import List, Optional, Sequence, Tuple
+
+Intervalo = Tuple[datetime, datetime]
+
+
+def para_utc_sem_fuso(valor: Optional[datetime]) -> Optional[datetime]:
+    """
+    As colunas da agenda são TIMESTAMP sem fuso (o asyncpg recusa datetime
+    com tzinfo nelas): datetimes com fuso viram UTC sem tzinfo; os sem fuso
+    passam como estão.
+    """
+    if valor is None or valor.tzinfo is None:
+        return valor
+    return valor.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _local_para_utc(dia, hora: time, fuso: tzinfo) -> datetime:
+    return para_utc_sem_fuso(datetime.combine(dia, hora, tzinfo=fuso))
+
+
+def _unir(ocupados: Sequence[Intervalo]) -> List[Intervalo]:
+    """Une os intervalos sobrepostos ou encostados (entrada ordenada por início)."""
+    unidos: List[Intervalo] = []
+    for inicio, fim in ocupados:
+        if unidos and inicio <= unidos[-1][1]:
+            if fim > unidos[-1][1]:
+                unidos[-1] = (unidos[-1][0], fim)
+        else:
+            unidos.append((inicio, fim))
+    return unidos
+
+
+def calcular_janelas_livres(
+    ocupados: Sequence[Intervalo],
+    data_inicio: datetime,
+    data_fim: datetime,
+    duracao: timedelta,
+    hora_inicio: time,
+    hora_fim: time,
+    incluir_fim_de_semana: bool = False,
+    fuso: tzinfo = timezone.utc
+) -> List[Intervalo]:
+    """
+    Varre (sort-and-sweep) os intervalos ocupados, já ordenados por início,
+    contra o expediente de cada dia e devolve as janelas livres com pelo
+    menos `duracao`. Intervalos sobrepostos são unidos antes da varredura.
+
+    Período, ocupados e janelas em UTC sem fuso (como gravados); os dias,
+    o fim de semana e `hora_inicio`/`hora_fim` são os do calendário local
+    de `fuso`, convertidos para UTC dia a dia (o horário de verão entra).
+
+    Custo O(dias + ocupados): unidos, os intervalos ficam ordenados também
+    pelo fim, então o ponteiro `i` só avança e cada dia revisita no máximo
+    um intervalo do dia anterior (o que atravessa a meia-noite).
+    """
+    ocupados = _unir(ocupados)
+    janelas: List[Intervalo] = []
+    i = 0
+    dia = data_inicio.replace(tzinfo=timezone.utc).astimezone(fuso).date()
+    ultimo_dia = data_fim.replace(tzinfo=timezone.utc).astimezone(fuso).date()
+
+    while dia <= ultimo_dia:
+        if incluir_fim_de_semana or dia.weekday() < 5:
+            abertura = max(_local_para_utc(dia, hora_inicio, fuso), data_inicio)
+            fechamento = min(_local_para_utc(dia, hora_fim, fuso), data_fim)
+            livre_desde = abertura
+
+            # Descarta o que terminou antes do expediente (vale para os próximos dias também)
+            while i < len(ocupados) and ocupados[i][1] <= abertura:
+                i += 1
+
+            j = i
+            while j < len(ocupados) and ocupados[j][0] < fechamento:
+                ocupado_inicio, ocupado_fim = ocupados[j]
+                if ocupado_inicio - livre_desde >= duracao:
+                    janelas.append((livre_desde, ocupado_inicio))
+                livre_desde = max(livre_desde, ocupado_fim)
+                j += 1
+
+            if fechamento - livre_desde >= duracao:
+                janelas.append((livre_desde, fechamento))
+
+        dia += timedelta(days=1)
+
+    return janelas
@@ -0,0 +1,40 @@
+from datetime import date
+from typing import Literal
+
+import numpy as np
+
+Agrupamento = Literal["dia", "semana", "mes"]
+
+
+def inicios_dos_periodos(inicio: date, fim: date, agrupamento: Agrupamento) -> np.ndarray:
+    """
+    Primeiro dia de cada período em [inicio, fim), como datetime64[D]. O
+    primeiro período sempre começa em `inicio` (semana/mês podem vir parciais);
+    semanas começam na segunda-feira.
+    """
+    dias = np.arange(inicio, fim, dtype="datetime64[D]")
+    if agrupamento == "dia":
+        return dias
+    if agrupamento == "semana":
+        # 1970-01-01 (dia 0) foi uma quinta: segunda-feira é (dia + 3) % 7 == 0
+        marcos = dias[(dias.astype(np.int64) + 3) % 7 == 0]
+    else:
+        marcos = np.arange(np.datetime64(inicio, "M") + 1, np.datetime64(fim, "M") + 1, dtype="datetime64[M]")
+        marcos = marcos.astype("datetime64[D]")
+        marcos = marcos[marcos < np.datetime64(fim, "D")]
+    return np.unique(np.concatenate(([np.datetime64(inicio, "D")], marcos)))
+
+
+def somar_por_periodo(dias: np.ndarray, centavos: np.ndarray, inicios: np.ndarray, total_dias: int) -> np.ndarray:
+    """
+    Soma `centavos` no período de cada `dias` (deslocamento em dias desde o
+    início da janela, mesmo referencial de `inicios`). Fora de [0, total_dias)
+    é ignorado. Devolve int64, um valor por período.
+    """
+    dentro = (dias >= 0) & (dias < total_dias)
+    # Tabela dia -> período (total_dias posições): um gather em vez de busca binária
+    duracoes = np.diff((inicios - inicios[0]).astype(np.int64), append=total_dias)
+    periodo = np.repeat(np.arange(len(inicios)), duracoes)[dias[dentro]]
+    # bincount soma em float64: exato para inteiros até 2**53 centavos
+    somas = np.bincount(periodo, weights=centavos[dentro], minlength=len(inicios))
+    return np.rint(somas).astype(np.int64)
@@ -0,0 +1,66 @@
+from dataclasses import dataclass, field
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Any, Dict, List, Optional, Sequence
+from uuid import UUID
+
+# Colunas editáveis de um item (as que entram no diff)
+CAMPOS_ITEM = ("descricao", "quantidade", "unidade", "preco_unitario", "observacoes")
+CENTAVO = Decimal("0.01")
+
+
+def valor_item(quantidade: Optional[Decimal], preco_unitario: Optional[Decimal]) -> Decimal:
+    """Total da linha arredondado ao centavo: a soma das linhas é o subtotal gravado (Numeric(12, 2))."""
+    if not quantidade or not preco_unitario:
+        return Decimal(0)
+    return (quantidade * preco_unitario).quantize(CENTAVO, rounding=ROUND_HALF_UP)
+
+
+@dataclass
+class DiffItens:
+    """O que mudou entre os itens gravados e a lista enviada na edição do pedido."""
+    atualizar: List[Dict[str, Any]] = field(default_factory=list)  # com "id"
+    inserir: List[Dict[str, Any]] = field(default_factory=list)
+    remover: List[UUID] = field(default_factory=list)
+    delta_subtotal: Decimal = Decimal(0)
+
+    @property
+    def vazio(self) -> bool:
+        return not (self.atualizar or self.inserir or self.remover)
+
+
+def comparar_itens(existentes: Sequence[Any], novos: Sequence[Any]) -> DiffItens:
+    """
+    Diff O(n) por id: item com `id` atualiza o existente (só se algum campo
+    mudou), sem `id` é novo, e existente ausente da lista é removido. O
+    delta do subtotal considera só as linhas que mudaram.
+
+    ValueError se um id não for de um item deste pedido.
+    """
+    por_id = {item.id: item for item in existentes}
+    diff = DiffItens()
+    vistos = set()
+
+    for novo in novos:
+        dados = {campo: getattr(novo, campo) for campo in CAMPOS_ITEM}
+        novo_id = getattr(novo, "id", None)
+        if novo_id is None:
+            diff.inserir.append(dados)
+            diff.delta_subtotal += valor_item(novo.quantidade, novo.preco_unitario)
+            continue
+
+        atual = por_id.get(novo_id)
+        if atual is None or novo_id in vistos:
+            raise ValueError(f"Item {novo_id} não pertence a este pedido")
+        vistos.add(novo_id)
+        if any(getattr(atual, campo) != valor for campo, valor in dados.items()):
+            diff.atualizar.append({"id": novo_id, **dados})
+            diff.delta_subtotal += (
+                valor_item(novo.quantidade, novo.preco_unitario)
+                - valor_item(atual.quantidade, atual.preco_unitario)
+            )
+
+    for item_id, atual in por_id.items():
+        if item_id not in vistos:
+            diff.remover.append(item_id)
+            diff.delta_subtotal -= valor_item(atual.quantidade, atual.preco_unitario)
+    return diff
@@ -0,0 +1,51 @@
+# backend/app/utils/paginacao.py
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, tuple_
+
+
+def codificar_cursor(created_at: datetime, id: UUID) -> str:
+    """Gera um cursor opaco a partir da chave de ordenação (created_at, id)."""
+    bruto = json.dumps([created_at.isoformat(), str(id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(bruto.encode()).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    try:
+        preenchido = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(preenchido))
+        return datetime.fromisoformat(created_at), UUID(id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido")
+
+
+def paginar(query: Select, modelo: Any, skip: int, limit: int, cursor: Optional[str] = None) -> Select:
+    """
+    Aplica ordenação estável por (created_at, id) e a paginação pedida.
+
+    - cursor None: modo legado skip/limit (OFFSET).
+    - cursor informado (vazio = primeira página): keyset, busca limit + 1 linhas
+      para saber se há próxima página sem um COUNT.
+    """
+    query = query.order_by(modelo.created_at, modelo.id)
+    if cursor is None:
+        return query.offset(skip).limit(limit)
+
+    if cursor:
+        created_at, id = decodificar_cursor(cursor)
+        query = query.where(tuple_(modelo.created_at, modelo.id) > tuple_(created_at, id))
+    return query.limit(limit + 1)
+
+
+def separar_pagina(linhas: Sequence[Any], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """Corta a linha extra buscada pelo keyset e devolve (itens, next_cursor)."""
+    itens = list(linhas[:limit])
+    if len(linhas) <= limit or not itens:
+        return itens, None
+    ultimo = itens[-1]
+    return itens, codificar_cursor(ultimo.created_at, ultimo.id)
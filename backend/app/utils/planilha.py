@@ -0,0 +1,94 @@
+# backend/app/utils/planilha.py
+"""
+Leitura em streaming de planilhas CSV e XLSX.
+
+Nada é carregado inteiro na memória: o CSV é lido linha a linha e o XLSX
+pelo modo read_only do openpyxl. Cada linha sai como (número na planilha,
+{coluna: texto}), com o cabeçalho normalizado (minúsculas, "_" no lugar de
+espaços) e linhas vazias ignoradas.
+"""
+import csv
+import io
+import zipfile
+from itertools import chain, islice
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+Linha = Tuple[int, Dict[str, Optional[str]]]
+
+
+def normalizar_coluna(nome: Any) -> str:
+    return str(nome or "").strip().lower().replace(" ", "_").replace("/", "_")
+
+
+def _texto(valor: Any) -> Optional[str]:
+    if valor is None:
+        return None
+    if isinstance(valor, float) and valor.is_integer():
+        valor = int(valor)  # números do Excel (CPF, CEP) chegam como float
+    texto = str(valor).strip()
+    return texto or None
+
+
+def _montar(cabecalho: List[str], linhas: Iterator[Any]) -> Iterator[Linha]:
+    # Linha 1 é o cabeçalho: a numeração bate com a da planilha
+    for numero, valores in enumerate(linhas, start=2):
+        dados = {coluna: _texto(valor) for coluna, valor in zip(cabecalho, valores) if coluna}
+        if any(dados.values()):
+            yield numero, dados
+
+
+def _ler_csv(arquivo: BinaryIO) -> Tuple[List[str], Iterator[Linha]]:
+    # Excel em pt-BR costuma salvar CSV em Windows-1252, não UTF-8
+    inicio = arquivo.read(64 * 1024)
+    arquivo.seek(0)
+    codificacao = "utf-8-sig"
+    try:
+        inicio.decode("utf-8")
+    except UnicodeDecodeError as exc:
+        if exc.reason != "unexpected end of data":  # não é só um caractere cortado no fim da amostra
+            codificacao = "cp1252"
+
+    texto = io.TextIOWrapper(arquivo, encoding=codificacao, newline="")
+    primeira = texto.readline()
+    # Excel em pt-BR exporta com ";"
+    delimitador = ";" if primeira.count(";") > primeira.count(",") else ","
+    leitor = csv.reader(chain([primeira], texto), delimiter=delimitador)
+    cabecalho = [normalizar_coluna(c) for c in next(leitor, [])]
+    return cabecalho, _montar(cabecalho, leitor)
+
+
+def _ler_xlsx(arquivo: BinaryIO) -> Tuple[List[str], Iterator[Linha]]:
+    from openpyxl import load_workbook  # dependência só da importação
+
+    try:
+        livro = load_workbook(arquivo, read_only=True, data_only=True)
+    except (zipfile.BadZipFile, KeyError, OSError) as exc:
+        raise ValueError("Arquivo XLSX inválido") from exc
+    linhas = livro.active.iter_rows(values_only=True)
+    cabecalho = [normalizar_coluna(c) for c in next(linhas, ())]
+
+    def gerar() -> Iterator[Linha]:
+        try:
+            yield from _montar(cabecalho, linhas)
+        finally:
+            livro.close()
+
+    return cabecalho, gerar()
+
+
+def ler_planilha(arquivo: BinaryIO, nome_arquivo: str) -> Tuple[List[str], Iterator[Linha]]:
+    """(cabeçalho, iterador de linhas) de um .csv ou .xlsx; ValueError para outros formatos."""
+    extensao = nome_arquivo.rsplit(".", 1)[-1].lower() if "." in nome_arquivo else ""
+    if extensao == "csv":
+        return _ler_csv(arquivo)
+    if extensao == "xlsx":
+        return _ler_xlsx(arquivo)
+    raise ValueError("Formato não suportado: envie um arquivo .csv ou .xlsx")
+
+
+def proximo_lote(linhas: Iterator[Linha], tamanho: int) -> List[Linha]:
+    """Até `tamanho` linhas do iterador (lista vazia quando acabar); ValueError se o arquivo estiver corrompido."""
+    try:
+        return list(islice(linhas, tamanho))
+    except csv.Error as exc:
+        raise ValueError(f"CSV inválido: {exc}") from exc
@@ -0,0 +1,120 @@
+"""
+Compara a visão mensal da agenda com o predicado antigo (três ramos OR sobre
+data_hora_inicio/data_hora_fim) e com a sondagem única `periodo && tsrange`
+no índice GiST (tenant_id, periodo).
+
+Popula um tenant de benchmark com N compromissos (padrão 100.000) via
+generate_series, se ainda não existir — um por slot de 2h, sem sobreposição,
+para respeitar a exclusion constraint — e mede meses espalhados pelo período:
+
+    DATABASE_URL=postgresql+psycopg://... python benchmarks/agenda_periodo.py --linhas 100000
+
+Também mede a busca de disponibilidade (GET /compromissos/disponibilidade)
+numa janela de 90 dias; a meta é ficar abaixo de 50 ms.
+
+Requer a migration 012_add_compromissos_periodo_gist.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, time as hora, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import and_, or_, text
+
+from app.core.database import AsyncSessionLocal, engine
+from app.models.compromisso import Compromisso
+from app.repos.compromisso_repo import CompromissoRepository
+from app.services.compromisso_service import CompromissoService
+
+TENANT_BENCH = uuid.UUID("00000000-0000-0000-0000-00000000a9e0")
+INICIO_AGENDA = datetime(2020, 1, 1, 8, 0)
+
+
+def popular(linhas: int):
+    with engine.begin() as conn:
+        existentes = conn.execute(
+            text("SELECT count(*) FROM compromissos WHERE tenant_id = :t"), {"t": TENANT_BENCH}
+        ).scalar()
+        if existentes >= linhas:
+            return
+        print(f"🌱 Inserindo {linhas - existentes} compromissos no tenant de benchmark...")
+        conn.execute(text("INSERT INTO tenants (id, name) VALUES (:t, 'bench-agenda') ON CONFLICT DO NOTHING"), {"t": TENANT_BENCH})
+        conn.execute(text("""
+            INSERT INTO compromissos (id, tenant_id, titulo, tipo, status,
+                                      data_hora_inicio, data_hora_fim, created_at, updated_at)
+            SELECT gen_random_uuid(), :t, 'Visita ' || g, 'Visita', 'Agendado',
+                   :base + (g * interval '2 hours'),
+                   :base + (g * interval '2 hours') + interval '1 hour',
+                   now(), now()
+            FROM generate_series(:de, :ate) AS g
+        """), {"t": TENANT_BENCH, "base": INICIO_AGENDA, "de": existentes + 1, "ate": linhas})
+        conn.execute(text("ANALYZE compromissos"))
+
+
+async def periodo_legado(db, data_inicio: datetime, data_fim: datetime):
+    """Predicado anterior à migration 012, mantido só para comparação."""
+    result = await db.execute(
+        CompromissoRepository(db)._query_base().where(
+            Compromisso.tenant_id == TENANT_BENCH,
+            or_(
+                and_(Compromisso.data_hora_inicio >= data_inicio, Compromisso.data_hora_inicio <= data_fim),
+                and_(Compromisso.data_hora_fim >= data_inicio, Compromisso.data_hora_fim <= data_fim),
+                and_(Compromisso.data_hora_inicio <= data_inicio, Compromisso.data_hora_fim >= data_fim),
+            )
+        ).order_by(Compromisso.data_hora_inicio)
+    )
+    return list(result.scalars().all())
+
+
+async def medir(consulta, repeticoes: int, data_inicio: datetime, data_fim: datetime) -> tuple[float, int]:
+    tempos = []
+    encontrados = 0
+    for _ in range(repeticoes):
+        async with AsyncSessionLocal() as db:
+            inicio = time.perf_counter()
+            encontrados = len(await consulta(db, data_inicio, data_fim))
+            tempos.append((time.perf_counter() - inicio) * 1000)
+    return sorted(tempos)[len(tempos) // 2], encontrados
+
+
+async def periodo_gist(db, data_inicio: datetime, data_fim: datetime):
+    return await CompromissoRepository(db).listar_por_periodo(TENANT_BENCH, data_inicio, data_fim)
+
+
+async def disponibilidade_90_dias(db, data_inicio: datetime, data_fim: datetime):
+    return await CompromissoService(CompromissoRepository(db)).buscar_disponibilidade(
+        TENANT_BENCH, data_inicio, data_fim, 30, hora(8, 0), hora(18, 0)
+    )
+
+
+async def executar(linhas: int, repeticoes: int):
+    popular(linhas)
+    fim_agenda = INICIO_AGENDA + timedelta(hours=2 * linhas)
+    print(f"{'mês':>7} | {'linhas':>6} | {'OR legado (ms)':>14} | {'&& GiST (ms)':>12}")
+    for fracao in (0.0, 0.25, 0.5, 0.75, 0.99):
+        referencia = INICIO_AGENDA + (fim_agenda - INICIO_AGENDA) * fracao
+        data_inicio = referencia.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        data_fim = (data_inicio + timedelta(days=32)).replace(day=1) - timedelta(microseconds=1)
+        t_legado, n_legado = await medir(periodo_legado, repeticoes, data_inicio, data_fim)
+        t_gist, n_gist = await medir(periodo_gist, repeticoes, data_inicio, data_fim)
+        if n_legado != n_gist:
+            print(f"❌ Resultados divergentes em {data_inicio:%Y-%m}: {n_legado} x {n_gist}")
+            sys.exit(1)
+        print(f"{data_inicio:%Y-%m} | {n_gist:>6} | {t_legado:>14.2f} | {t_gist:>12.2f}")
+
+    data_inicio = INICIO_AGENDA + (fim_agenda - INICIO_AGENDA) / 2
+    t_disp, n_janelas = await medir(disponibilidade_90_dias, repeticoes, data_inicio, data_inicio + timedelta(days=90))
+    print(f"\nDisponibilidade 90 dias: {n_janelas} janelas em {t_disp:.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--linhas", type=int, default=100_000)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(executar(args.linhas, args.repeticoes))
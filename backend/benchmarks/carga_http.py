@@ -0,0 +1,84 @@
+"""
+Gerador de carga HTTP para medir throughput e latência da API.
+
+Dispara N clientes concorrentes contra um endpoint durante um tempo fixo e
+imprime requisições/segundo e percentis de latência. Usado para comparar
+versões da API (ex.: rotas síncronas vs. assíncronas com 500 clientes):
+
+    # API rodando em outro terminal (mesmo número de workers nos dois testes)
+    python benchmarks/carga_http.py --url http://localhost:8000/api/clientes/ \\
+        --token "$TOKEN" --concorrencia 500 --duracao 30
+
+Para comparar latência (p50/p99) de uma rota sem saturar a API, use poucos
+clientes, ex.: GET /api/clientes com --concorrencia 1 --duracao 20.
+
+Rode uma vez com a versão anterior (git checkout <commit>) e outra com a atual.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+def percentil(valores: list[float], p: float) -> float:
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))
+    return ordenados[indice]
+
+
+async def cliente(http: httpx.AsyncClient, url: str, fim: float, latencias: list[float], erros: list[int]):
+    while time.perf_counter() < fim:
+        inicio = time.perf_counter()
+        try:
+            resposta = await http.get(url)
+            if resposta.status_code >= 400:
+                erros.append(resposta.status_code)
+        except httpx.HTTPError:
+            erros.append(0)
+            continue
+        latencias.append((time.perf_counter() - inicio) * 1000)
+
+
+async def executar(url: str, token: str | None, concorrencia: int, duracao: float) -> dict:
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    limites = httpx.Limits(max_connections=concorrencia, max_keepalive_connections=concorrencia)
+    latencias: list[float] = []
+    erros: list[int] = []
+
+    async with httpx.AsyncClient(headers=headers, limits=limites, timeout=60) as http:
+        inicio = time.perf_counter()
+        fim = inicio + duracao
+        await asyncio.gather(*(cliente(http, url, fim, latencias, erros) for _ in range(concorrencia)))
+        decorrido = time.perf_counter() - inicio
+
+    return {
+        "requisicoes": len(latencias),
+        "erros": len(erros),
+        "req_por_segundo": len(latencias) / decorrido,
+        "p50_ms": percentil(latencias, 50),
+        "p95_ms": percentil(latencias, 95),
+        "p99_ms": percentil(latencias, 99),
+        "media_ms": statistics.fmean(latencias) if latencias else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", required=True)
+    parser.add_argument("--token", default=None, help="JWT de acesso (Bearer)")
+    parser.add_argument("--concorrencia", type=int, default=500)
+    parser.add_argument("--duracao", type=float, default=30.0, help="Segundos de carga")
+    args = parser.parse_args()
+
+    resultado = asyncio.run(executar(args.url, args.token, args.concorrencia, args.duracao))
+    print(f"📊 {args.url} | {args.concorrencia} clientes | {args.duracao:.0f}s")
+    for chave, valor in resultado.items():
+        print(f"   {chave:>16}: {valor:,.2f}" if isinstance(valor, float) else f"   {chave:>16}: {valor}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Round trips ao banco e latência de cada operação de escrita dos services.
+
+Executa criar/atualizar/remover de clientes, pedidos (20 itens), pagamentos,
+parcelas (lote de 12) e compromissos num tenant de benchmark, contando os
+statements enviados e os COMMITs (cada um é um round trip) e medindo a
+mediana de N repetições:
+
+    DATABASE_URL=postgresql+psycopg://... python benchmarks/crud_round_trips.py --repeticoes 50
+
+Rode também no commit anterior (git checkout <commit>) para comparar com o
+ciclo add -> commit -> refresh.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, text
+
+from app.core.database import AsyncSessionLocal, async_engine, engine
+from app.models.pagamento import MetodoPagamento
+from app.repos.cliente_repo import ClienteRepository
+from app.repos.compromisso_repo import CompromissoRepository
+from app.repos.pagamento_repo import PagamentoRepository
+from app.repos.pedido_repo import PedidoRepository
+from app.schemas.cliente import ClienteCreate, ClienteUpdate
+from app.schemas.compromisso import CompromissoCreate, CompromissoUpdate
+from app.schemas.pagamento import PagamentoCreate, PagamentoUpdate
+from app.schemas.parcela import ParcelaUpdate
+from app.schemas.pedido import ItemPedidoCreate, PedidoCreate, PedidoUpdate
+from app.services.cliente_service import ClienteService
+from app.services.compromisso_service import CompromissoService
+from app.services.pagamento_service import PagamentoService
+from app.services.pedido_service import PedidoService
+
+TENANT_BENCH = uuid.UUID("00000000-0000-0000-0000-00000000c0de")
+round_trips = 0
+
+
+@event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+def _statement(*_):
+    global round_trips
+    round_trips += 1
+
+
+@event.listens_for(async_engine.sync_engine, "commit")
+def _commit(*_):
+    global round_trips
+    round_trips += 1
+
+
+def preparar_tenant():
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO tenants (id, name) VALUES (:t, 'bench-crud') ON CONFLICT DO NOTHING"), {"t": TENANT_BENCH})
+
+
+async def medir(nome: str, operacao, resultados: dict):
+    """Roda `operacao(db)` numa sessão nova e registra (round trips, ms)."""
+    global round_trips
+    async with AsyncSessionLocal(info={"tenant_id": str(TENANT_BENCH)}) as db:
+        await db.execute(text("SELECT 1"))  # BEGIN + set_config do RLS fora da medição
+        round_trips = 0
+        inicio = time.perf_counter()
+        retorno = await operacao(db)
+        resultados.setdefault(nome, []).append((round_trips, (time.perf_counter() - inicio) * 1000))
+    return retorno
+
+
+async def rodada(resultados: dict, n: int):
+    t = TENANT_BENCH
+    cpf, numero = f"{uuid.uuid4().int % 10**11:011d}", f"B-{uuid.uuid4().hex[:8]}"
+    cliente = await medir("cliente: criar", lambda db: ClienteService(ClienteRepository(db)).criar_cliente(
+        t, ClienteCreate(nome=f"Cliente {n}", tipo="PF", cpf_cnpj=cpf)), resultados)
+    await medir("cliente: atualizar", lambda db: ClienteService(ClienteRepository(db)).atualizar_cliente(
+        t, cliente.id, ClienteUpdate(nome="Cliente editado", tipo="PF", cpf_cnpj=cpf, versao=cliente.versao)), resultados)
+
+    pedido = await medir("pedido: criar (20 itens)", lambda db: PedidoService(PedidoRepository(db)).criar_pedido(t, PedidoCreate(
+        cliente_id=cliente.id, numero=numero,
+        itens=[ItemPedidoCreate(descricao=f"Item {i}", quantidade=Decimal(1), unidade="un", preco_unitario=Decimal(50)) for i in range(20)],
+    )), resultados)
+    await medir("pedido: atualizar", lambda db: PedidoService(PedidoRepository(db)).atualizar_pedido(
+        t, pedido.id, PedidoUpdate(cliente_id=cliente.id, numero=numero, referencia="Cozinha", versao=pedido.versao)), resultados)
+
+    pagamento = await medir("pagamento: criar", lambda db: PagamentoService(PagamentoRepository(db)).criar_pagamento(
+        t, PagamentoCreate(pedido_id=pedido.id, valor=Decimal(100), metodo=MetodoPagamento.pix)), resultados)
+    await medir("pagamento: atualizar", lambda db: PagamentoService(PagamentoRepository(db)).atualizar_pagamento(
+        t, pagamento.id, PagamentoUpdate(pedido_id=pedido.id, valor=Decimal(120), metodo=MetodoPagamento.pix)), resultados)
+
+    parcelas = await medir("parcelas: gerar 12", lambda db: PagamentoService(PagamentoRepository(db)).gerar_parcelas_para_pedido(
+        t, pedido.id, Decimal(1200), 12, date.today()), resultados)
+    await medir("parcela: atualizar", lambda db: PagamentoService(PagamentoRepository(db)).atualizar_parcela(
+        t, parcelas[0].id, ParcelaUpdate(**parcelas[0].model_dump(include={"pedido_id", "numero_parcela", "data_vencimento"}),
+                                         valor_parcela=Decimal(99))), resultados)
+    await medir("parcela: marcar paga", lambda db: PagamentoService(PagamentoRepository(db)).marcar_parcela_como_paga(
+        t, parcelas[1].id), resultados)
+
+    inicio = datetime(2030, 1, 1, 8) + timedelta(hours=3 * n)
+    compromisso = await medir("compromisso: criar", lambda db: CompromissoService(CompromissoRepository(db)).criar_compromisso(
+        t, CompromissoCreate(titulo="Medição", tipo="Medição", data_hora_inicio=inicio, data_hora_fim=inicio + timedelta(hours=1))), resultados)
+    await medir("compromisso: atualizar", lambda db: CompromissoService(CompromissoRepository(db)).atualizar_compromisso(
+        t, compromisso.id, CompromissoUpdate(titulo="Medição cozinha")), resultados)
+    await medir("compromisso: remover", lambda db: CompromissoService(CompromissoRepository(db)).deletar_compromisso(
+        t, compromisso.id), resultados)
+
+    await medir("pedido: remover", lambda db: PedidoService(PedidoRepository(db)).deletar_pedido(t, pedido.id), resultados)
+    await medir("cliente: remover", lambda db: ClienteService(ClienteRepository(db)).deletar_cliente(t, cliente.id), resultados)
+
+
+async def executar(repeticoes: int):
+    preparar_tenant()
+    resultados: dict = {}
+    for n in range(repeticoes):
+        await rodada(resultados, n)
+
+    print(f"{'operação':>26} | {'round trips':>11} | {'mediana ms':>10}")
+    for nome, medidas in resultados.items():
+        viagens = statistics.median(m[0] for m in medidas)
+        print(f"{nome:>26} | {viagens:>11.0f} | {statistics.median(m[1] for m in medidas):>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeticoes", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(executar(args.repeticoes))
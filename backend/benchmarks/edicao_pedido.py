@@ -0,0 +1,88 @@
+"""
+Edição de uma linha de um orçamento grande (PedidoService.atualizar_pedido).
+
+Cria um pedido com N itens (padrão 200) num tenant de benchmark e envia a
+lista inteira de volta com uma linha alterada, como faz o front-end. Conta
+os statements SQL enviados ao banco e o tempo de cada edição:
+
+    DATABASE_URL=postgresql+psycopg://... python benchmarks/edicao_pedido.py --itens 200
+
+Com o diff por id, editar uma linha gera um UPDATE de item (mais as leituras
+e o UPDATE do pedido), em vez de N DELETEs + N INSERTs.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+from decimal import Decimal
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, text
+
+from app.core.database import AsyncSessionLocal, async_engine, engine
+from app.repos.pedido_repo import PedidoRepository
+from app.schemas.pedido import ItemPedidoCreate, ItemPedidoUpdate, PedidoCreate, PedidoUpdate
+from app.services.pedido_service import PedidoService
+
+TENANT_BENCH = uuid.UUID("00000000-0000-0000-0000-0000000ed1c0")
+statements: list[str] = []
+
+
+@event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+def _contar(conn, cursor, statement, parameters, context, executemany):
+    statements.append(statement.split(None, 1)[0].upper())
+
+
+def preparar_tenant() -> uuid.UUID:
+    cliente_id = uuid.uuid4()
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO tenants (id, name) VALUES (:t, 'bench-edicao') ON CONFLICT DO NOTHING"), {"t": TENANT_BENCH})
+        conn.execute(text("""
+            INSERT INTO clientes (id, tenant_id, nome, tipo, cpf_cnpj, ativo, created_at, updated_at)
+            VALUES (:c, :t, 'Cliente bench', 'PF', '00000000000', true, now(), now())
+        """), {"c": cliente_id, "t": TENANT_BENCH})
+    return cliente_id
+
+
+async def executar(itens: int, edicoes: int):
+    cliente_id = preparar_tenant()
+    async with AsyncSessionLocal(info={"tenant_id": str(TENANT_BENCH)}) as db:
+        service = PedidoService(PedidoRepository(db))
+        pedido = await service.criar_pedido(TENANT_BENCH, PedidoCreate(
+            cliente_id=cliente_id,
+            numero=f"BENCH-{uuid.uuid4().hex[:6]}",
+            itens=[
+                ItemPedidoCreate(descricao=f"Módulo {i}", quantidade=Decimal("1"), unidade="un", preco_unitario=Decimal("100.00"))
+                for i in range(itens)
+            ],
+        ))
+
+    tempos, contagens = [], []
+    for n in range(edicoes):
+        lista = [ItemPedidoUpdate(**item.model_dump(include={"id", "descricao", "quantidade", "unidade", "preco_unitario", "observacoes"}))
+                 for item in pedido.itens]
+        lista[n % len(lista)].quantidade += 1
+        schema = PedidoUpdate(cliente_id=cliente_id, numero=pedido.numero, itens=lista)
+
+        statements.clear()
+        async with AsyncSessionLocal(info={"tenant_id": str(TENANT_BENCH)}) as db:
+            inicio = time.perf_counter()
+            pedido = await PedidoService(PedidoRepository(db)).atualizar_pedido(TENANT_BENCH, pedido.id, schema)
+            tempos.append((time.perf_counter() - inicio) * 1000)
+        contagens.append(len(statements))
+
+    print(f"Itens: {itens} | subtotal final: {pedido.valor_subtotal}")
+    print(f"Statements por edição: {statistics.median(contagens):.0f} ({', '.join(sorted(set(statements)))})")
+    print(f"Tempo por edição: mediana {statistics.median(tempos):.1f} ms, máx. {max(tempos):.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--itens", type=int, default=200)
+    parser.add_argument("--edicoes", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(executar(args.itens, args.edicoes))
@@ -0,0 +1,48 @@
+"""
+Exportação em streaming (GET /api/export/{entidade}): tempo até o primeiro
+byte, tempo total e linhas/s, consumindo a resposta em pedaços.
+
+    # API rodando em outro terminal, tenant com muitos pedidos
+    python benchmarks/exportacao_streaming.py --url http://localhost:8000 \\
+        --token "$TOKEN" --entidade pedidos --formato csv
+
+Para conferir a memória constante, acompanhe o RSS do worker da API
+(ex.: `docker stats`) durante exportações de tamanhos diferentes.
+"""
+import argparse
+import time
+
+import httpx
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--token", required=True)
+    parser.add_argument("--entidade", choices=["pedidos", "pagamentos", "parcelas"], default="pedidos")
+    parser.add_argument("--formato", choices=["csv", "ndjson"], default="csv")
+    args = parser.parse_args()
+
+    primeiro_byte = None
+    linhas = 0
+    total_bytes = 0
+    inicio = time.perf_counter()
+    with httpx.stream(
+        "GET",
+        f"{args.url}/api/export/{args.entidade}",
+        params={"formato": args.formato},
+        headers={"Authorization": f"Bearer {args.token}"},
+        timeout=None,
+    ) as resposta:
+        resposta.raise_for_status()
+        for pedaco in resposta.iter_bytes():
+            if primeiro_byte is None:
+                primeiro_byte = time.perf_counter() - inicio
+            linhas += pedaco.count(b"\n")
+            total_bytes += len(pedaco)
+    duracao = time.perf_counter() - inicio
+
+    if args.formato == "csv":
+        linhas -= 1  # cabeçalho
+    print(f"Primeiro byte: {primeiro_byte * 1000:.0f} ms")
+    print(f"Total: {linhas:,} linhas, {total_bytes / 1024 / 1024:.1f} MB em {duracao:.2f} s "
+          f"({linhas / duracao:,.0f} linhas/s)")
@@ -0,0 +1,86 @@
+"""
+Latência de GET /api/financeiro/fluxo-caixa (FinanceiroService.obter_fluxo_caixa)
+num tenant com N parcelas (padrão 500.000) e N/5 pagamentos.
+
+Popula o tenant de benchmark uma vez (generate_series, vencimentos e
+pagamentos espalhados por 2 anos em torno de hoje) e mede a mediana e o p95
+de cada agrupamento para a janela pedida:
+
+    DATABASE_URL=postgresql+psycopg://... python benchmarks/fluxo_caixa.py --parcelas 500000 --meses 12
+
+Meta: abaixo de 100 ms com 500 mil parcelas (rode VACUUM ANALYZE parcelas,
+pagamentos antes, para o index-only scan da migration 017).
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from app.core.database import AsyncSessionLocal, engine
+from app.repos.financeiro_repo import FinanceiroRepository
+from app.services.financeiro_service import FinanceiroService
+from carga_http import percentil
+
+TENANT_BENCH = uuid.UUID("00000000-0000-0000-0000-0000000f1c0a")
+
+
+def popular(parcelas: int):
+    with engine.begin() as conn:
+        conn.execute(text("SELECT set_config('app.current_tenant_id', :t, true)"), {"t": str(TENANT_BENCH)})
+        existentes = conn.scalar(text("SELECT count(*) FROM parcelas WHERE tenant_id = :t"), {"t": TENANT_BENCH})
+        if existentes >= parcelas:
+            return
+        cliente_id, pedido_id = uuid.uuid4(), uuid.uuid4()
+        conn.execute(text("INSERT INTO tenants (id, name) VALUES (:t, 'bench-fluxo') ON CONFLICT DO NOTHING"), {"t": TENANT_BENCH})
+        conn.execute(text("""
+            INSERT INTO clientes (id, tenant_id, nome, tipo, cpf_cnpj, ativo, created_at, updated_at)
+            VALUES (:c, :t, 'Cliente bench', 'PF', '00000000000', true, now(), now())
+        """), {"c": cliente_id, "t": TENANT_BENCH})
+        conn.execute(text("""
+            INSERT INTO pedidos (id, tenant_id, cliente_id, numero, valor_subtotal, valor_desconto, valor_total, created_at, updated_at)
+            VALUES (:p, :t, :c, 'FLUXO-BENCH', 0, 0, 0, now(), now())
+        """), {"p": pedido_id, "c": cliente_id, "t": TENANT_BENCH})
+        # 80% em aberto, 20% pagas; vencimentos de 1 ano atrás a 1 ano à frente
+        for status, fracao in (("Pendente", 0.8), ("Paga", 0.2)):
+            conn.execute(text(f"""
+                INSERT INTO parcelas (id, tenant_id, pedido_id, numero_parcela, valor_parcela, data_vencimento,
+                                      status, versao, created_at, updated_at)
+                SELECT gen_random_uuid(), :t, :p, i, round((50 + random() * 950)::numeric, 2),
+                       CURRENT_DATE - 365 + (random() * 730)::int, '{status}', 1, now(), now()
+                FROM generate_series(1, :n) AS i
+            """), {"t": TENANT_BENCH, "p": pedido_id, "n": int((parcelas - existentes) * fracao)})
+        conn.execute(text("""
+            INSERT INTO pagamentos (id, tenant_id, pedido_id, valor, data_pagamento, metodo, status, versao, created_at, updated_at)
+            SELECT gen_random_uuid(), :t, :p, round((50 + random() * 950)::numeric, 2),
+                   now() - interval '365 days' + random() * interval '730 days', 'PIX', 'Pago', 1, now(), now()
+            FROM generate_series(1, :n)
+        """), {"t": TENANT_BENCH, "p": pedido_id, "n": (parcelas - existentes) // 5})
+
+
+async def executar(parcelas: int, meses: int, repeticoes: int):
+    popular(parcelas)
+    print(f"{'agrupamento':>11} | {'períodos':>8} | {'mediana ms':>10} | {'p95 ms':>7}")
+    for agrupamento in ("dia", "semana", "mes"):
+        tempos = []
+        for _ in range(repeticoes):
+            async with AsyncSessionLocal(info={"tenant_id": str(TENANT_BENCH)}) as db:
+                inicio = time.perf_counter()
+                fluxo = await FinanceiroService(FinanceiroRepository(db)).obter_fluxo_caixa(TENANT_BENCH, meses, agrupamento)
+                tempos.append((time.perf_counter() - inicio) * 1000)
+        print(f"{agrupamento:>11} | {len(fluxo['periodos']):>8} | {statistics.median(tempos):>10.1f} | {percentil(tempos, 95):>7.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--parcelas", type=int, default=500_000)
+    parser.add_argument("--meses", type=int, default=12)
+    parser.add_argument("--repeticoes", type=int, default=30)
+    args = parser.parse_args()
+    asyncio.run(executar(args.parcelas, args.meses, args.repeticoes))
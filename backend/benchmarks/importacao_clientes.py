@@ -0,0 +1,66 @@
+"""
+Importação em massa de clientes (POST /api/clientes/import) com N linhas.
+
+Gera um CSV no formato do Excel pt-BR (";", CPF com máscara), com uma
+fração de linhas inválidas, envia para a API e imprime o tempo total, as
+linhas/s e o relatório devolvido:
+
+    # API rodando em outro terminal
+    python benchmarks/importacao_clientes.py --url http://localhost:8000 \\
+        --token "$TOKEN" --linhas 100000
+
+Rode duas vezes seguidas: a segunda mede o caminho de atualização (os
+CPF/CNPJ já existem no tenant).
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import httpx
+
+
+def gerar_csv(caminho: str, linhas: int, fracao_invalidas: float):
+    with open(caminho, "w", encoding="utf-8", newline="") as arquivo:
+        arquivo.write("nome;tipo;cpf_cnpj;email;telefone_ddd;cidade;uf\n")
+        for i in range(linhas):
+            if random.random() < fracao_invalidas:
+                arquivo.write(f"Cliente {i};PF;123;email-invalido;;Curitiba;PR\n")
+                continue
+            cpf = f"{i:011d}"
+            arquivo.write(
+                f"Cliente {i};PF;{cpf[:3]}.{cpf[3:6]}.{cpf[6:9]}-{cpf[9:]};"
+                f"cliente{i}@exemplo.com;(41) 99999-0000;Curitiba;PR\n"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--token", required=True)
+    parser.add_argument("--linhas", type=int, default=100_000)
+    parser.add_argument("--invalidas", type=float, default=0.01, help="Fração de linhas inválidas")
+    args = parser.parse_args()
+
+    caminho = os.path.join(tempfile.gettempdir(), f"clientes_{args.linhas}.csv")
+    gerar_csv(caminho, args.linhas, args.invalidas)
+    print(f"CSV: {caminho} ({os.path.getsize(caminho) / 1024 / 1024:.1f} MB)")
+
+    with open(caminho, "rb") as arquivo:
+        inicio = time.perf_counter()
+        resposta = httpx.post(
+            f"{args.url}/api/clientes/import",
+            headers={"Authorization": f"Bearer {args.token}"},
+            files={"arquivo": ("clientes.csv", arquivo, "text/csv")},
+            timeout=600,
+        )
+        duracao = time.perf_counter() - inicio
+
+    resposta.raise_for_status()
+    resultado = resposta.json()
+    print(f"Tempo: {duracao:.2f} s ({resultado['total_linhas'] / duracao:,.0f} linhas/s)")
+    print(f"Inseridos: {resultado['inseridos']} | Atualizados: {resultado['atualizados']} | "
+          f"Erros: {resultado['total_erros']}")
+    for erro in resultado["erros"][:5]:
+        print(f"  linha {erro['linha']}: {'; '.join(erro['erros'])}")
@@ -0,0 +1,43 @@
+"""
+Microbenchmark de verificações de JWT por segundo (app.core.tokens).
+
+Compara a verificação completa (header + assinatura + claims) com o caminho
+do cache LRU de claims, para um conjunto de tokens ativos do tamanho
+indicado (simula usuários distintos fazendo requisições):
+
+    python benchmarks/jwt_verificacao.py --tokens 1000 --verificacoes 200000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import uuid
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core import tokens
+
+
+def medir(funcao, amostra: list[str]) -> float:
+    inicio = time.perf_counter()
+    for token in amostra:
+        funcao(token)
+    return len(amostra) / (time.perf_counter() - inicio)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokens", type=int, default=1_000, help="Tokens distintos em uso")
+    parser.add_argument("--verificacoes", type=int, default=200_000)
+    args = parser.parse_args()
+
+    ativos = [tokens.criar_token(uuid.uuid4(), uuid.uuid4()) for _ in range(args.tokens)]
+    amostra = random.choices(ativos, k=args.verificacoes)
+
+    sem_cache = medir(tokens._verificar_assinatura, amostra[: max(1, args.verificacoes // 10)])
+    tokens.limpar_cache_tokens()
+    com_cache = medir(tokens.verificar_token, amostra)
+
+    print(f"{'verificação completa':>22}: {sem_cache:>12,.0f} /s")
+    print(f"{'com cache LRU':>22}: {com_cache:>12,.0f} /s  ({com_cache / sem_cache:.1f}x)")
@@ -0,0 +1,75 @@
+"""
+Latência de GET /api/clientes durante uma tempestade de logins.
+
+Mede p50/p95/p99 da listagem de clientes sozinha (linha de base) e depois
+com N clientes fazendo POST /api/auth/login sem parar. Com o bcrypt no pool
+de processos (app.core.security) a listagem não deve degradar; logins além
+da capacidade do pool recebem 429.
+
+    python benchmarks/login_storm.py --base http://localhost:8000 \\
+        --email demo@marcenaria.com --senha demo123 --logins 50 --duracao 20
+
+Rode uma vez com a versão anterior (git checkout <commit>) e outra com a atual.
+"""
+import argparse
+import asyncio
+import time
+from collections import Counter
+
+import httpx
+
+from carga_http import percentil
+
+
+async def listar(http: httpx.AsyncClient, base: str, token: str, fim: float, latencias: list[float]):
+    while time.perf_counter() < fim:
+        inicio = time.perf_counter()
+        await http.get(f"{base}/api/clientes/", headers={"Authorization": f"Bearer {token}"})
+        latencias.append((time.perf_counter() - inicio) * 1000)
+
+
+async def logar(http: httpx.AsyncClient, base: str, email: str, senha: str, fim: float, status: Counter):
+    while time.perf_counter() < fim:
+        resposta = await http.post(f"{base}/api/auth/login", data={"username": email, "password": senha})
+        status[resposta.status_code] += 1
+        if resposta.status_code == 429:
+            await asyncio.sleep(float(resposta.headers.get("Retry-After", "1")))
+
+
+async def rodada(base: str, email: str, senha: str, token: str, logins: int, leitores: int, duracao: float):
+    latencias: list[float] = []
+    status: Counter = Counter()
+    async with httpx.AsyncClient(timeout=60, limits=httpx.Limits(max_connections=logins + leitores)) as http:
+        fim = time.perf_counter() + duracao
+        await asyncio.gather(
+            *(listar(http, base, token, fim, latencias) for _ in range(leitores)),
+            *(logar(http, base, email, senha, fim, status) for _ in range(logins)),
+        )
+    return latencias, status
+
+
+async def executar(base: str, email: str, senha: str, logins: int, leitores: int, duracao: float):
+    async with httpx.AsyncClient(timeout=60) as http:
+        resposta = await http.post(f"{base}/api/auth/login", data={"username": email, "password": senha})
+        resposta.raise_for_status()
+        token = resposta.json()["access_token"]
+
+    print(f"{'cenário':>16} | {'p50 ms':>8} | {'p95 ms':>8} | {'p99 ms':>8} | logins por status")
+    for nome, n_logins in (("linha de base", 0), (f"{logins} logins", logins)):
+        latencias, status = await rodada(base, email, senha, token, n_logins, leitores, duracao)
+        print(
+            f"{nome:>16} | {percentil(latencias, 50):>8.1f} | {percentil(latencias, 95):>8.1f} | "
+            f"{percentil(latencias, 99):>8.1f} | {dict(status) or '-'}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base", default="http://localhost:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--senha", required=True)
+    parser.add_argument("--logins", type=int, default=50, help="Clientes fazendo login em loop")
+    parser.add_argument("--leitores", type=int, default=4, help="Clientes listando /api/clientes")
+    parser.add_argument("--duracao", type=float, default=20.0)
+    args = parser.parse_args()
+    asyncio.run(executar(args.base, args.email, args.senha, args.logins, args.leitores, args.duracao))
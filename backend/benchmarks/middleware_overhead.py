@@ -0,0 +1,105 @@
+"""
+Overhead da pilha de middlewares em /health e /api/clientes, em processo.
+
+Monta dois apps FastAPI com as mesmas rotas (a de clientes devolve 100
+linhas fixas, sem banco, para isolar o custo dos middlewares):
+
+- legado: headers de segurança e autenticação via @app.middleware("http")
+  (BaseHTTPMiddleware), como antes;
+- atual:  a pilha ASGI pura de app/middleware/pipeline.py.
+
+e mede µs por requisição via httpx.ASGITransport (sem rede):
+
+    python benchmarks/middleware_overhead.py --requisicoes 5000
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from carga_http import percentil
+from app.core.tokens import TokenInvalido, criar_token, verificar_token
+from app.middleware.cors import cors_middleware
+from app.middleware.pipeline import montar_middlewares
+from app.middleware.security import HEADERS_SEGURANCA
+
+CLIENTES = [{"id": str(uuid.uuid4()), "nome": f"Cliente {i}", "tipo": "PF"} for i in range(100)]
+
+
+def _rotas(app: FastAPI) -> FastAPI:
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    @app.get("/api/clientes/")
+    async def clientes(request: Request):
+        return {"tenant_id": request.state.tenant_id, "items": CLIENTES}
+
+    return app
+
+
+def app_legado() -> FastAPI:
+    app = FastAPI(middleware=[cors_middleware()])
+
+    @app.middleware("http")
+    async def add_security_headers(request: Request, call_next):
+        response = await call_next(request)
+        for nome, valor in HEADERS_SEGURANCA:
+            response.headers[nome.decode()] = valor.decode()
+        return response
+
+    @app.middleware("http")
+    async def auth_middleware(request: Request, call_next):
+        token = request.headers.get("Authorization", "")
+        if token.startswith("Bearer "):
+            try:
+                payload = verificar_token(token[7:])
+            except TokenInvalido:
+                return JSONResponse(status_code=401, content={"detail": "Invalid token"})
+            request.state.tenant_id = payload["tenant_id"]
+            request.state.user_id = payload["sub"]
+        return await call_next(request)
+
+    return _rotas(app)
+
+
+def app_atual() -> FastAPI:
+    return _rotas(FastAPI(middleware=montar_middlewares()))
+
+
+async def medir(app: FastAPI, caminho: str, headers: dict, requisicoes: int) -> list[float]:
+    latencias = []
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://teste") as http:
+        for _ in range(50):  # aquecimento
+            await http.get(caminho, headers=headers)
+        for _ in range(requisicoes):
+            inicio = time.perf_counter()
+            resposta = await http.get(caminho, headers=headers)
+            latencias.append((time.perf_counter() - inicio) * 1_000_000)
+            assert resposta.status_code == 200
+    return latencias
+
+
+async def executar(requisicoes: int):
+    headers = {"Authorization": f"Bearer {criar_token(uuid.uuid4(), uuid.uuid4())}"}
+    print(f"{'rota':>14} | {'pilha':>6} | {'média µs':>9} | {'p99 µs':>8}")
+    for caminho in ("/health", "/api/clientes/"):
+        for nome, fabrica in (("legado", app_legado), ("atual", app_atual)):
+            latencias = await medir(fabrica(), caminho, headers, requisicoes)
+            print(f"{caminho:>14} | {nome:>6} | {statistics.fmean(latencias):>9.1f} | {percentil(latencias, 99):>8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requisicoes", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(executar(args.requisicoes))
@@ -0,0 +1,84 @@
+"""
+Compara a latência de página do modo skip/limit (OFFSET) com o modo cursor
+(keyset por created_at, id) em diferentes profundidades.
+
+Popula um tenant de benchmark com N clientes (padrão 1.000.000) via
+generate_series, se ainda não existir, e mede cada página com o
+ClienteRepository real:
+
+    DATABASE_URL=postgresql+psycopg://... python benchmarks/paginacao_keyset.py --linhas 1000000
+
+O esperado é OFFSET crescer linearmente com a profundidade e o cursor ficar
+constante (requer a migration 009_add_keyset_pagination_indexes).
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from app.core.database import AsyncSessionLocal, engine
+from app.repos.cliente_repo import ClienteRepository
+from app.utils.paginacao import codificar_cursor
+
+TENANT_BENCH = uuid.UUID("00000000-0000-0000-0000-00000000b3c4")
+
+
+def popular(linhas: int):
+    with engine.begin() as conn:
+        existentes = conn.execute(
+            text("SELECT count(*) FROM clientes WHERE tenant_id = :t"), {"t": TENANT_BENCH}
+        ).scalar()
+        if existentes >= linhas:
+            return
+        print(f"🌱 Inserindo {linhas - existentes} clientes no tenant de benchmark...")
+        conn.execute(text("INSERT INTO tenants (id, name) VALUES (:t, 'bench') ON CONFLICT DO NOTHING"), {"t": TENANT_BENCH})
+        conn.execute(text("""
+            INSERT INTO clientes (id, tenant_id, nome, tipo, cpf_cnpj, ativo, created_at, updated_at)
+            SELECT gen_random_uuid(), :t, 'Cliente ' || g, 'PF', lpad(g::text, 11, '0'), true,
+                   now() - (g || ' seconds')::interval, now()
+            FROM generate_series(1, :n) AS g
+        """), {"t": TENANT_BENCH, "n": linhas - existentes})
+        conn.execute(text("ANALYZE clientes"))
+
+
+def cursor_na_profundidade(profundidade: int) -> str:
+    with engine.connect() as conn:
+        linha = conn.execute(text("""
+            SELECT created_at, id FROM clientes WHERE tenant_id = :t
+            ORDER BY created_at, id OFFSET :o LIMIT 1
+        """), {"t": TENANT_BENCH, "o": max(profundidade - 1, 0)}).one()
+    return codificar_cursor(linha.created_at, linha.id)
+
+
+async def medir(repeticoes: int, **kwargs) -> float:
+    tempos = []
+    for _ in range(repeticoes):
+        async with AsyncSessionLocal() as db:
+            inicio = time.perf_counter()
+            await ClienteRepository(db).listar(TENANT_BENCH, limit=100, **kwargs)
+            tempos.append((time.perf_counter() - inicio) * 1000)
+    return sorted(tempos)[len(tempos) // 2]
+
+
+async def executar(linhas: int, repeticoes: int):
+    popular(linhas)
+    print(f"{'profundidade':>12} | {'offset (ms)':>11} | {'cursor (ms)':>11}")
+    for profundidade in (0, 1_000, 10_000, 100_000, linhas // 2, linhas - 100):
+        cursor = cursor_na_profundidade(profundidade) if profundidade else ""
+        t_offset = await medir(repeticoes, skip=profundidade)
+        t_cursor = await medir(repeticoes, cursor=cursor)
+        print(f"{profundidade:>12,} | {t_offset:>11.2f} | {t_cursor:>11.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--linhas", type=int, default=1_000_000)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(executar(args.linhas, args.repeticoes))
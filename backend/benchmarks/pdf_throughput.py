@@ -0,0 +1,82 @@
+"""
+Vazão de renderização de PDFs de pedidos, em PDFs/s por core.
+
+Renderiza um pedido sintético (sem banco) em N processos e compara:
+
+- frio:   um DocumentoService novo por PDF (Environment, template e fontes
+          recarregados a cada render — o comportamento antigo da rota);
+- quente: um DocumentoService por processo, aquecido no início, como nos
+          workers da fila `pdf` (app/tasks/pdf.py).
+
+    python benchmarks/pdf_throughput.py --processos 4 --pdfs 200 --itens 30
+"""
+import argparse
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.documento_service import DocumentoService
+
+_servico: DocumentoService | None = None
+
+
+def pedido_sintetico(itens: int) -> SimpleNamespace:
+    cliente = SimpleNamespace(
+        nome="Marcenaria Exemplo Ltda", email="contato@exemplo.com",
+        telefone_ddd="(11) 99999-0000", endereco="Rua das Madeiras, 123", updated_at=datetime.utcnow()
+    )
+    return SimpleNamespace(
+        id=uuid.uuid4(), tenant_id=uuid.uuid4(), numero="2024-0001", status="Aguardando Aprovação",
+        prazo_execucao_dias=30, validade_orcamento_dias=15, updated_at=datetime.utcnow(), cliente=cliente,
+        valor_subtotal=Decimal("12500.00"), valor_desconto=Decimal("500.00"), valor_total=Decimal("12000.00"),
+        itens=[
+            SimpleNamespace(titulo=f"Item {i}", descricao="Armário planejado em MDF 18mm", valor=Decimal("416.66"))
+            for i in range(itens)
+        ],
+    )
+
+
+def _iniciar_quente():
+    global _servico
+    _servico = DocumentoService()
+    _servico.aquecer()
+
+
+def _render_quente(pedido) -> int:
+    return len(_servico.gerar_pdf_pedido(pedido))
+
+
+def _render_frio(pedido) -> int:
+    return len(DocumentoService().gerar_pdf_pedido(pedido))
+
+
+def medir(modo: str, processos: int, pdfs: int, pedido) -> float:
+    inicializador = _iniciar_quente if modo == "quente" else None
+    render = _render_quente if modo == "quente" else _render_frio
+    with ProcessPoolExecutor(max_workers=processos, initializer=inicializador) as pool:
+        # Primeira rodada só para subir os processos (e aquecer, no modo quente)
+        list(pool.map(render, [pedido] * processos))
+        inicio = time.perf_counter()
+        list(pool.map(render, [pedido] * pdfs))
+        return pdfs / (time.perf_counter() - inicio)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processos", type=int, default=os.cpu_count())
+    parser.add_argument("--pdfs", type=int, default=200)
+    parser.add_argument("--itens", type=int, default=30)
+    args = parser.parse_args()
+
+    pedido = pedido_sintetico(args.itens)
+    print(f"{'modo':>6} | {'PDFs/s':>8} | {'PDFs/s/core':>11}")
+    for modo in ("frio", "quente"):
+        vazao = medir(modo, args.processos, args.pdfs, pedido)
+        print(f"{modo:>6} | {vazao:>8.1f} | {vazao / args.processos:>11.1f}")
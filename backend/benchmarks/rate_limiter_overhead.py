@@ -0,0 +1,57 @@
+"""
+Custo por requisição do rate limiter (um EVALSHA do script Lua por checagem).
+
+Chama verificar_limite em sequência e com concorrência, com identidades
+distintas para nunca bater no limite, e imprime média/p50/p99 por checagem.
+A meta é ficar abaixo de 0,5 ms com o Redis na mesma rede:
+
+    REDIS_URL=redis://localhost:6379/1 python benchmarks/rate_limiter_overhead.py --checagens 20000
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from carga_http import percentil
+from app.middleware.rate_limiter import verificar_limite
+
+
+async def checar(latencias: list[float], indice: int):
+    inicio = time.perf_counter()
+    await verificar_limite(f"bench:{indice % 1000}", "GET /api/clientes/", 1_000_000)
+    latencias.append((time.perf_counter() - inicio) * 1000)
+
+
+async def executar(checagens: int, concorrencia: int):
+    await checar([], 0)  # carrega o script (SCRIPT LOAD) fora da medição
+
+    sequencial: list[float] = []
+    for i in range(checagens):
+        await checar(sequencial, i)
+
+    concorrente: list[float] = []
+    inicio = time.perf_counter()
+    for lote in range(0, checagens, concorrencia):
+        await asyncio.gather(*(checar(concorrente, i) for i in range(lote, min(lote + concorrencia, checagens))))
+    vazao = checagens / (time.perf_counter() - inicio)
+
+    print(f"{'modo':>12} | {'média ms':>8} | {'p50 ms':>7} | {'p99 ms':>7}")
+    for nome, latencias in (("sequencial", sequencial), (f"{concorrencia} conc.", concorrente)):
+        print(f"{nome:>12} | {statistics.fmean(latencias):>8.3f} | "
+              f"{percentil(latencias, 50):>7.3f} | {percentil(latencias, 99):>7.3f}")
+    print(f"Vazão com concorrência: {vazao:,.0f} checagens/s")
+    if statistics.fmean(sequencial) >= 0.5:
+        print("❌ Overhead médio acima de 0,5 ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--checagens", type=int, default=20_000)
+    parser.add_argument("--concorrencia", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(executar(args.checagens, args.concorrencia))
@@ -0,0 +1,59 @@
+"""
+Distribuição das leituras entre primário e réplicas (DATABASE_REPLICA_URLS).
+
+Dispara carga (carga_http.executar) contra rotas GET e compara, antes e
+depois, as transações de cada banco em pg_stat_database. Pensado para a
+réplica local (make replica-local: app_db e app_db_replica na mesma
+instância, então os dois contadores aparecem na mesma view):
+
+    # API com DATABASE_REPLICA_URLS=...app_db_replica, em outro terminal
+    DATABASE_URL=postgresql+psycopg://.../app_db python benchmarks/replicas_leitura.py \\
+        --url http://localhost:8000 --token "$TOKEN" --bancos app_db app_db_replica
+
+Com o roteamento ativo, as transações das rotas GET aparecem no banco da
+réplica; as do primário ficam só com autenticação e escritas.
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from app.core.database import engine
+from carga_http import executar
+
+ROTAS = ["/api/clientes/", "/api/pedidos/", "/api/financeiro/dashboard", "/api/financeiro/fluxo-caixa?agrupamento=semana"]
+
+
+def transacoes(bancos: list[str]) -> dict:
+    with engine.connect() as conn:
+        linhas = conn.execute(text("""
+            SELECT datname, xact_commit + xact_rollback FROM pg_stat_database WHERE datname = ANY(:bancos)
+        """), {"bancos": bancos}).all()
+    return dict(linhas)
+
+
+async def rodar(url: str, token: str, concorrencia: int, duracao: float, bancos: list[str]):
+    antes = transacoes(bancos)
+    for rota in ROTAS:
+        resultado = await executar(url + rota, token, concorrencia, duracao)
+        print(f"{rota:>50} | {resultado['requisicoes']:>6} req | p50 {resultado['p50_ms']:.1f} ms | erros {resultado['erros']}")
+    # pg_stat_database é atualizado com atraso de até ~1 s (stats_fetch_consistency)
+    await asyncio.sleep(1.5)
+    depois = transacoes(bancos)
+    for banco in bancos:
+        print(f"{banco:>20}: {depois.get(banco, 0) - antes.get(banco, 0):>8} transações")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--token", required=True)
+    parser.add_argument("--concorrencia", type=int, default=20)
+    parser.add_argument("--duracao", type=float, default=10.0)
+    parser.add_argument("--bancos", nargs="+", default=["app_db", "app_db_replica"])
+    args = parser.parse_args()
+    asyncio.run(rodar(args.url, args.token, args.concorrencia, args.duracao, args.bancos))
@@ -0,0 +1,105 @@
+"""
+Tempo de serialização de listagens por 1.000 linhas (app.core.serializacao).
+
+Usa linhas em memória com os atributos dos modelos ORM (sem banco) e compara:
+
+- legado: XRead.from_attributes por linha, revalidação contra o
+  response_model, jsonable_encoder e json.dumps (caminho padrão do FastAPI);
+- atual:  validar_lista (TypeAdapter em cache) + orjson via RespostaJSON.
+
+    python benchmarks/serializacao.py --linhas 1000 --repeticoes 50
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.core.serializacao import para_json, validar_lista
+from app.schemas.compromisso import CompromissoRead
+from app.schemas.pedido import PedidoRead
+
+
+def compromissos(n: int) -> list:
+    agora = datetime(2024, 3, 1, 8, 0)
+    tenant_id = uuid.uuid4()
+    return [
+        SimpleNamespace(
+            id=uuid.uuid4(), tenant_id=tenant_id, titulo=f"Medição {i}", descricao="Medir cozinha",
+            tipo="Medição", status="Agendado", data_hora_inicio=agora + timedelta(hours=i),
+            data_hora_fim=agora + timedelta(hours=i, minutes=90), local="Cliente", endereco="Rua A, 10",
+            observacoes=None, cliente_id=uuid.uuid4(), pedido_id=uuid.uuid4(),
+            versao=1, created_at=agora, updated_at=agora,
+        )
+        for i in range(n)
+    ]
+
+
+def pedidos(n: int, itens_por_pedido: int = 5) -> list:
+    agora = datetime(2024, 3, 1, 8, 0)
+    tenant_id = uuid.uuid4()
+    linhas = []
+    for i in range(n):
+        pedido_id = uuid.uuid4()
+        itens = [
+            SimpleNamespace(
+                id=uuid.uuid4(), pedido_id=pedido_id, descricao=f"Módulo {j}", quantidade=Decimal("2.000"),
+                unidade="un", preco_unitario=Decimal("850.00"), observacoes=None, created_at=agora, updated_at=agora,
+            )
+            for j in range(itens_por_pedido)
+        ]
+        linhas.append(SimpleNamespace(
+            id=pedido_id, tenant_id=tenant_id, cliente_id=uuid.uuid4(), numero=f"P-{i:05d}", status="Aprovado",
+            referencia=None, validade_orcamento_dias=30, prazo_execucao_dias=45, data_inicio=date(2024, 3, 1),
+            data_fim_prevista=date(2024, 4, 15), data_fim_real=None, valor_subtotal=Decimal("8500.00"),
+            valor_desconto=Decimal("0"), valor_total=Decimal("8500.00"), versao=1, created_at=agora, updated_at=agora,
+            itens=itens,
+        ))
+    return linhas
+
+
+def legado(modelo, linhas: list) -> bytes:
+    modelos = [modelo.model_validate(linha) for linha in linhas]
+    revalidados = TypeAdapter(List[modelo]).validate_python(modelos, from_attributes=True)
+    return json.dumps(jsonable_encoder(revalidados)).encode()
+
+
+def atual(modelo, linhas: list) -> bytes:
+    return para_json(validar_lista(modelo, linhas))
+
+
+def medir(funcao, modelo, linhas: list, repeticoes: int) -> float:
+    funcao(modelo, linhas)  # aquecimento (cria o TypeAdapter em cache)
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao(modelo, linhas)
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos) * 1000 * 1000 / len(linhas)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--linhas", type=int, default=1_000)
+    parser.add_argument("--repeticoes", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'listagem':>22} | {'legado ms/1k':>12} | {'atual ms/1k':>11} | {'ganho':>6}")
+    for nome, modelo, linhas in (
+        ("compromissos", CompromissoRead, compromissos(args.linhas)),
+        ("pedidos (5 itens)", PedidoRead, pedidos(args.linhas)),
+    ):
+        t_legado = medir(legado, modelo, linhas, args.repeticoes)
+        t_atual = medir(atual, modelo, linhas, args.repeticoes)
+        print(f"{nome:>22} | {t_legado:>12.2f} | {t_atual:>11.2f} | {t_legado / t_atual:>5.1f}x")
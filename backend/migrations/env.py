@@ -9,6 +9,7 @@ from app.models.user import User
 from app.models.cliente import Cliente
 from app.models.pedido import Pedido
 from app.models.compromisso import Compromisso
+from app.models.venda_mensal import VendaMensal
 
 config = context.config
 
@@ -0,0 +1,45 @@
+"""Add keyset pagination indexes
+
+Revision ID: 009_add_keyset_pagination_indexes
+Revises: 008_add_rls_policies
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '009_add_keyset_pagination_indexes'
+down_revision: Union[str, Sequence[str], None] = '008_add_rls_policies'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Índices que servem o ORDER BY (created_at, id) das listagens por tenant,
+# tanto no modo cursor quanto no skip/limit.
+INDICES = [
+    ('ix_clientes_tenant_created_id', 'clientes', ['tenant_id', 'created_at', 'id']),
+    ('ix_pedidos_tenant_created_id', 'pedidos', ['tenant_id', 'created_at', 'id']),
+    ('ix_pagamentos_tenant_created_id', 'pagamentos', ['tenant_id', 'created_at', 'id']),
+    ('ix_compromissos_tenant_created_id', 'compromissos', ['tenant_id', 'created_at', 'id']),
+    ('ix_parcelas_tenant_pedido_created_id', 'parcelas', ['tenant_id', 'pedido_id', 'created_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY não pode rodar dentro de transação
+    with op.get_context().autocommit_block():
+        for nome, tabela, colunas in INDICES:
+            op.create_index(nome, tabela, colunas, unique=False,
+                            postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for nome, tabela, _ in reversed(INDICES):
+            op.drop_index(nome, table_name=tabela,
+                          postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,58 @@
+"""Add tenant-first composite and partial indexes
+
+Revision ID: 010_add_tenant_composite_indexes
+Revises: 009_add_keyset_pagination_indexes
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '010_add_tenant_composite_indexes'
+down_revision: Union[str, Sequence[str], None] = '009_add_keyset_pagination_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (nome, tabela, colunas, kwargs extras)
+# parcelas (tenant_id, pedido_id) já é coberto pelo prefixo de
+# ix_parcelas_tenant_pedido_created_id (migration 009).
+INDICES = [
+    # Pagamentos de um pedido
+    ('ix_pagamentos_tenant_pedido', 'pagamentos', ['tenant_id', 'pedido_id'], {}),
+    # Agenda: filtros por período e vínculos com cliente/pedido
+    ('ix_compromissos_tenant_inicio', 'compromissos', ['tenant_id', 'data_hora_inicio'], {}),
+    ('ix_compromissos_tenant_cliente', 'compromissos', ['tenant_id', 'cliente_id'], {}),
+    ('ix_compromissos_tenant_pedido', 'compromissos', ['tenant_id', 'pedido_id'], {}),
+    # Pedidos de um cliente
+    ('ix_pedidos_tenant_cliente', 'pedidos', ['tenant_id', 'cliente_id'], {}),
+    # Dashboard financeiro: filtros por status e período
+    ('ix_pedidos_tenant_status_created', 'pedidos', ['tenant_id', 'status', 'created_at'], {}),
+    # Dashboard financeiro: somas de pedidos não cancelados sem visitar a tabela
+    ('ix_pedidos_tenant_created_nao_cancelados', 'pedidos', ['tenant_id', 'created_at'], {
+        'postgresql_include': ['valor_total'],
+        'postgresql_where': sa.text("status <> 'Cancelado'"),
+    }),
+    # selectinload(Pedido.itens) busca por pedido_id IN (...)
+    ('ix_itens_pedido_pedido', 'itens_pedido', ['pedido_id'], {}),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY não pode rodar dentro de transação
+    with op.get_context().autocommit_block():
+        for nome, tabela, colunas, extras in INDICES:
+            op.create_index(nome, tabela, colunas, unique=False,
+                            postgresql_concurrently=True, if_not_exists=True, **extras)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for nome, tabela, _, _ in reversed(INDICES):
+            op.drop_index(nome, table_name=tabela,
+                          postgresql_concurrently=True, if_exists=True)
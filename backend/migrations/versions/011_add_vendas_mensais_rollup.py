@@ -0,0 +1,97 @@
+"""Add vendas_mensais rollup maintained by triggers on pedidos
+
+Revision ID: 011_add_vendas_mensais_rollup
+Revises: 010_add_tenant_composite_indexes
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '011_add_vendas_mensais_rollup'
+down_revision: Union[str, Sequence[str], None] = '010_add_tenant_composite_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('vendas_mensais',
+    sa.Column('tenant_id', sa.UUID(), nullable=False),
+    sa.Column('mes', sa.Date(), nullable=False),
+    sa.Column('status', sa.String(length=50), nullable=False),
+    sa.Column('qtd_pedidos', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('valor_total', sa.Numeric(precision=14, scale=2), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('tenant_id', 'mes', 'status')
+    )
+
+    op.execute("""
+        -- Mês de referência de um pedido (mesma regra do backfill em FinanceiroRepository)
+        CREATE FUNCTION vendas_mensais_mes(p_created_at timestamp) RETURNS date
+        LANGUAGE sql IMMUTABLE AS $$
+            SELECT date_trunc('month', COALESCE(p_created_at, 'epoch'::timestamp))::date
+        $$;
+
+        -- Soma um delta (+1/-1 pedido, +/- valor) no bucket (tenant, mês, status)
+        CREATE FUNCTION vendas_mensais_aplicar(p_tenant_id uuid, p_created_at timestamp, p_status text,
+                                               p_qtd integer, p_valor numeric) RETURNS void
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO vendas_mensais AS v (tenant_id, mes, status, qtd_pedidos, valor_total)
+            VALUES (p_tenant_id, vendas_mensais_mes(p_created_at), COALESCE(p_status, ''), p_qtd, COALESCE(p_valor, 0))
+            ON CONFLICT (tenant_id, mes, status) DO UPDATE
+               SET qtd_pedidos = v.qtd_pedidos + EXCLUDED.qtd_pedidos,
+                   valor_total = v.valor_total + EXCLUDED.valor_total;
+        END;
+        $$;
+
+        CREATE FUNCTION pedidos_atualizar_vendas_mensais() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM vendas_mensais_aplicar(OLD.tenant_id, OLD.created_at, OLD.status::text, -1, -OLD.valor_total);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                PERFORM vendas_mensais_aplicar(NEW.tenant_id, NEW.created_at, NEW.status::text, 1, NEW.valor_total);
+            END IF;
+            RETURN NULL;
+        END;
+        $$;
+
+        CREATE TRIGGER trg_pedidos_vendas_mensais_ins_del
+        AFTER INSERT OR DELETE ON pedidos
+        FOR EACH ROW EXECUTE FUNCTION pedidos_atualizar_vendas_mensais();
+
+        -- Só reage quando algo que afeta o rollup muda (status, valor, mês ou tenant)
+        CREATE TRIGGER trg_pedidos_vendas_mensais_upd
+        AFTER UPDATE OF tenant_id, status, valor_total, created_at ON pedidos
+        FOR EACH ROW
+        WHEN (OLD.tenant_id IS DISTINCT FROM NEW.tenant_id
+              OR OLD.status IS DISTINCT FROM NEW.status
+              OR OLD.valor_total IS DISTINCT FROM NEW.valor_total
+              OR vendas_mensais_mes(OLD.created_at) IS DISTINCT FROM vendas_mensais_mes(NEW.created_at))
+        EXECUTE FUNCTION pedidos_atualizar_vendas_mensais();
+
+        -- Backfill inicial
+        INSERT INTO vendas_mensais (tenant_id, mes, status, qtd_pedidos, valor_total)
+        SELECT tenant_id, vendas_mensais_mes(created_at), COALESCE(status::text, ''),
+               count(*), COALESCE(sum(valor_total), 0)
+        FROM pedidos
+        GROUP BY 1, 2, 3;
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("""
+        DROP TRIGGER trg_pedidos_vendas_mensais_upd ON pedidos;
+        DROP TRIGGER trg_pedidos_vendas_mensais_ins_del ON pedidos;
+        DROP FUNCTION pedidos_atualizar_vendas_mensais();
+        DROP FUNCTION vendas_mensais_aplicar(uuid, timestamp, text, integer, numeric);
+        DROP FUNCTION vendas_mensais_mes(timestamp);
+    """)
+    op.drop_table('vendas_mensais')
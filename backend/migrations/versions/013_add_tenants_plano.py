@@ -0,0 +1,27 @@
+"""Add tenants.plano (cota de rate limit por plano)
+
+Revision ID: 013_add_tenants_plano
+Revises: 012_add_compromissos_periodo_gist
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '013_add_tenants_plano'
+down_revision: Union[str, Sequence[str], None] = '012_add_compromissos_periodo_gist'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Default constante: ADD COLUMN não reescreve a tabela no PostgreSQL 11+
+    op.execute("ALTER TABLE tenants ADD COLUMN IF NOT EXISTS plano varchar(50) NOT NULL DEFAULT 'padrao'")
+
+
+def downgrade() -> None:
+    op.drop_column('tenants', 'plano')
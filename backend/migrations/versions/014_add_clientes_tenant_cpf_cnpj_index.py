@@ -0,0 +1,33 @@
+"""Add clientes (tenant_id, cpf_cnpj) index (merge da importação em massa)
+
+Revision ID: 014_add_clientes_tenant_cpf_cnpj_index
+Revises: 013_add_tenants_plano
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '014_add_clientes_tenant_cpf_cnpj_index'
+down_revision: Union[str, Sequence[str], None] = '013_add_tenants_plano'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Não é UNIQUE: bases antigas podem ter o mesmo CPF/CNPJ repetido no tenant
+    with op.get_context().autocommit_block():
+        op.create_index('ix_clientes_tenant_cpf_cnpj', 'clientes', ['tenant_id', 'cpf_cnpj'], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_clientes_tenant_cpf_cnpj', table_name='clientes',
+                      postgresql_concurrently=True, if_exists=True)
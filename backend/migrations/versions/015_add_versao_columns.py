@@ -0,0 +1,33 @@
+"""Add versao (controle otimista de concorrência)
+
+Revision ID: 015_add_versao_columns
+Revises: 014_add_clientes_tenant_cpf_cnpj_index
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '015_add_versao_columns'
+down_revision: Union[str, Sequence[str], None] = '014_add_clientes_tenant_cpf_cnpj_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABELAS = ['clientes', 'pedidos', 'pagamentos', 'parcelas', 'compromissos']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Default constante: ADD COLUMN não reescreve a tabela no PostgreSQL 11+
+    for tabela in TABELAS:
+        op.execute(f"ALTER TABLE {tabela} ADD COLUMN IF NOT EXISTS versao integer NOT NULL DEFAULT 1")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for tabela in reversed(TABELAS):
+        op.drop_column(tabela, 'versao')
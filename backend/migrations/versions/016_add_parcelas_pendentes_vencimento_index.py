@@ -0,0 +1,38 @@
+"""Add partial index on pending parcelas by due date (varredura de atrasadas)
+
+Revision ID: 016_add_parcelas_pendentes_vencimento_index
+Revises: 015_add_versao_columns
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '016_add_parcelas_pendentes_vencimento_index'
+down_revision: Union[str, Sequence[str], None] = '015_add_versao_columns'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Só as pendentes entram no índice: a varredura de app.tasks.parcelas lê
+    # "pendente e vencida" sem tocar nas pagas, que são a maioria da tabela.
+    # O predicado tem que ser o mesmo texto da consulta (status::text).
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_parcelas_pendentes_vencimento
+            ON parcelas (data_vencimento, id)
+            WHERE status::text = 'Pendente'
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_parcelas_pendentes_vencimento', table_name='parcelas',
+                      postgresql_concurrently=True, if_exists=True)
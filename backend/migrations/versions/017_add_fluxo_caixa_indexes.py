@@ -0,0 +1,48 @@
+"""Add covering partial indexes for the cash-flow projection
+
+Revision ID: 017_add_fluxo_caixa_indexes
+Revises: 016_add_parcelas_pendentes_vencimento_index
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '017_add_fluxo_caixa_indexes'
+down_revision: Union[str, Sequence[str], None] = '016_add_parcelas_pendentes_vencimento_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# GET /financeiro/fluxo-caixa lê só (data, valor) do tenant: com INCLUDE e o
+# mesmo predicado de status da consulta, vira index-only scan.
+INDICES = [
+    ('ix_parcelas_tenant_vencimento_em_aberto', 'parcelas', ['tenant_id', 'data_vencimento'], {
+        'postgresql_include': ['valor_parcela'],
+        'postgresql_where': sa.text("status::text IN ('Pendente', 'Atrasada')"),
+    }),
+    ('ix_pagamentos_tenant_data_pagos', 'pagamentos', ['tenant_id', 'data_pagamento'], {
+        'postgresql_include': ['valor'],
+        'postgresql_where': sa.text("status::text = 'Pago'"),
+    }),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY não pode rodar dentro de transação
+    with op.get_context().autocommit_block():
+        for nome, tabela, colunas, extras in INDICES:
+            op.create_index(nome, tabela, colunas, unique=False,
+                            postgresql_concurrently=True, if_not_exists=True, **extras)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for nome, tabela, _, _ in reversed(INDICES):
+            op.drop_index(nome, table_name=tabela,
+                          postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,47 @@
+import argparse
+import asyncio
+import sys
+import os
+from uuid import UUID
+
+# Adiciona o diretório atual ao path para importar os módulos da app
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import AsyncSessionLocal
+from app.repos.financeiro_repo import FinanceiroRepository
+
+
+async def reconstruir(tenant_id: UUID | None):
+    async with AsyncSessionLocal() as db:
+        buckets = await FinanceiroRepository(db).reconstruir_rollup(tenant_id)
+    print(f"✅ Rollup vendas_mensais reconstruído ({buckets} buckets)")
+
+
+async def verificar(tenant_id: UUID | None) -> bool:
+    async with AsyncSessionLocal() as db:
+        divergencias = await FinanceiroRepository(db).verificar_rollup(tenant_id)
+    if not divergencias:
+        print("✅ Rollup vendas_mensais consistente com pedidos")
+        return True
+    print(f"❌ {len(divergencias)} bucket(s) divergentes:")
+    for d in divergencias:
+        print(f"   {d.tenant_id} {d.mes:%Y-%m} {d.status!r}: "
+              f"qtd {d.qtd_rollup} (esperado {d.qtd_esperada}), "
+              f"valor {d.valor_rollup} (esperado {d.valor_esperado})")
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manutenção do rollup mensal de vendas (dashboard financeiro).")
+    parser.add_argument("comando", choices=["reconstruir", "verificar"])
+    parser.add_argument("--tenant", type=UUID, default=None, help="Restringe a um tenant (padrão: todos)")
+    args = parser.parse_args()
+
+    if args.comando == "reconstruir":
+        asyncio.run(reconstruir(args.tenant))
+    elif not asyncio.run(verificar(args.tenant)):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
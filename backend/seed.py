@@ -34,7 +34,7 @@ def seed():
                 cnpj="00.000.000/0001-00",
                 email_suporte=tenant_email,
                 telefone="11999999999",
-                plano="Pro",
+                plano="pro",
                 ativo=True
             )
             db.add(tenant)
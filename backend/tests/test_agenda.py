@@ -0,0 +1,103 @@
+from datetime import datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from app.utils.agenda import calcular_janelas_livres, para_utc_sem_fuso
+
+EXPEDIENTE = (time(8), time(18))
+
+
+def _janelas(ocupados, inicio, fim, minutos=60, fim_de_semana=False):
+    return calcular_janelas_livres(ocupados, inicio, fim, timedelta(minutes=minutos), *EXPEDIENTE, fim_de_semana)
+
+
+class TestJanelasLivres:
+    def test_dia_livre(self):
+        # 2026-03-02 é uma segunda-feira
+        assert _janelas([], datetime(2026, 3, 2), datetime(2026, 3, 2, 23)) == [
+            (datetime(2026, 3, 2, 8), datetime(2026, 3, 2, 18))
+        ]
+
+    def test_ocupados_sobrepostos_e_duracao_minima(self):
+        ocupados = [
+            (datetime(2026, 3, 2, 9), datetime(2026, 3, 2, 11)),
+            (datetime(2026, 3, 2, 10), datetime(2026, 3, 2, 12)),  # sobrepõe o anterior
+            (datetime(2026, 3, 2, 12, 30), datetime(2026, 3, 2, 17)),  # sobra 30 min antes: curto demais
+        ]
+        assert _janelas(ocupados, datetime(2026, 3, 2), datetime(2026, 3, 2, 23)) == [
+            (datetime(2026, 3, 2, 8), datetime(2026, 3, 2, 9)),
+            (datetime(2026, 3, 2, 17), datetime(2026, 3, 2, 18)),
+        ]
+
+    def test_compromisso_atravessando_dias(self):
+        ocupados = [(datetime(2026, 3, 2, 16), datetime(2026, 3, 3, 10))]
+        assert _janelas(ocupados, datetime(2026, 3, 2), datetime(2026, 3, 3, 23)) == [
+            (datetime(2026, 3, 2, 8), datetime(2026, 3, 2, 16)),
+            (datetime(2026, 3, 3, 10), datetime(2026, 3, 3, 18)),
+        ]
+
+    def test_fim_de_semana(self):
+        # 2026-03-07/08: sábado e domingo
+        sabado, domingo = datetime(2026, 3, 7), datetime(2026, 3, 8, 23)
+        assert _janelas([], sabado, domingo) == []
+        assert len(_janelas([], sabado, domingo, fim_de_semana=True)) == 2
+
+    def test_periodo_corta_o_expediente(self):
+        assert _janelas([], datetime(2026, 3, 2, 15), datetime(2026, 3, 2, 16, 30)) == [
+            (datetime(2026, 3, 2, 15), datetime(2026, 3, 2, 16, 30))
+        ]
+
+
+class TestFusoDoExpediente:
+    """O expediente é local ao fuso; período, ocupados e janelas seguem em UTC."""
+
+    def _janelas(self, ocupados, inicio, fim, fuso):
+        return calcular_janelas_livres(
+            ocupados, inicio, fim, timedelta(hours=1), *EXPEDIENTE, fuso=ZoneInfo(fuso)
+        )
+
+    def test_sao_paulo_desloca_o_expediente_para_utc(self):
+        # 08:00-18:00 em São Paulo (UTC-3) = 11:00-21:00 UTC
+        ocupados = [(datetime(2026, 3, 2, 19), datetime(2026, 3, 2, 20))]  # 16h-17h locais
+        assert self._janelas(ocupados, datetime(2026, 3, 2, 3), datetime(2026, 3, 3, 3), "America/Sao_Paulo") == [
+            (datetime(2026, 3, 2, 11), datetime(2026, 3, 2, 19)),
+            (datetime(2026, 3, 2, 20), datetime(2026, 3, 2, 21)),
+        ]
+
+    def test_dia_da_semana_e_o_local(self):
+        # Sábado 07/03 até 03:00 UTC ainda é sexta em São Paulo: a sexta fecha
+        # às 21:00 UTC e o sábado local fica de fora
+        inicio, fim = datetime(2026, 3, 6, 12), datetime(2026, 3, 8, 12)
+        assert self._janelas([], inicio, fim, "America/Sao_Paulo") == [
+            (datetime(2026, 3, 6, 12), datetime(2026, 3, 6, 21)),
+        ]
+
+    def test_horario_de_verao(self):
+        # Nova York muda de UTC-5 para UTC-4 em 08/03/2026
+        inicio, fim = datetime(2026, 3, 6), datetime(2026, 3, 10)
+        assert self._janelas([], inicio, fim, "America/New_York") == [
+            (datetime(2026, 3, 6, 13), datetime(2026, 3, 6, 23)),
+            (datetime(2026, 3, 9, 12), datetime(2026, 3, 9, 22)),
+        ]
+
+
+class TestParaUtcSemFuso:
+    def test_com_fuso_vira_utc(self):
+        local = datetime(2026, 3, 2, 10, tzinfo=timezone(timedelta(hours=-3)))
+        assert para_utc_sem_fuso(local) == datetime(2026, 3, 2, 13)
+
+    def test_sem_fuso_e_none_passam(self):
+        assert para_utc_sem_fuso(datetime(2026, 3, 2, 10)) == datetime(2026, 3, 2, 10)
+        assert para_utc_sem_fuso(None) is None
+
+
+class TestCustoDaVarredura:
+    def test_intervalo_longo_nao_faz_revarrer_os_anteriores(self):
+        # Um compromisso de 30 dias e vários curtos dentro dele: unidos, viram um só
+        inicio = datetime(2026, 3, 2)
+        ocupados = [(inicio, inicio + timedelta(days=30))] + [
+            (inicio + timedelta(hours=h), inicio + timedelta(hours=h, minutes=30)) for h in range(1, 200)
+        ]
+        assert _janelas(ocupados, inicio, inicio + timedelta(days=31, hours=23)) == [
+            (datetime(2026, 4, 1, 8), datetime(2026, 4, 1, 18)),
+            (datetime(2026, 4, 2, 8), datetime(2026, 4, 2, 18)),
+        ]
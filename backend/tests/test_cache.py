@@ -0,0 +1,74 @@
+import asyncio
+import uuid
+
+from app.core import cache
+from app.core.cache import CacheTenant
+
+TENANT = uuid.uuid4()
+
+
+class _RedisFalso:
+    def __init__(self):
+        self.dados = {}
+
+    async def get(self, chave):
+        return self.dados.get(chave)
+
+    async def set(self, chave, valor, nx=False, px=None, ex=None):
+        if nx and chave in self.dados:
+            return None
+        self.dados[chave] = valor
+        return True
+
+    async def delete(self, chave):
+        self.dados.pop(chave, None)
+
+
+class TestSingleFlight:
+    def _cache(self, monkeypatch):
+        redis = _RedisFalso()
+        monkeypatch.setattr(cache, "get_redis", lambda: redis)
+        return CacheTenant("teste", ttl=60)
+
+    def test_cancelar_o_lider_nao_cancela_quem_aguarda(self, monkeypatch):
+        cache_tenant = self._cache(monkeypatch)
+        chamadas = []
+
+        async def calcular():
+            chamadas.append(1)
+            await asyncio.sleep(0.05)
+            return {"total": 1}
+
+        async def cenario():
+            lider = asyncio.create_task(cache_tenant.obter_ou_calcular(TENANT, calcular))
+            await asyncio.sleep(0.01)
+            aguardando = [asyncio.create_task(cache_tenant.obter_ou_calcular(TENANT, calcular)) for _ in range(3)]
+            await asyncio.sleep(0.01)
+            lider.cancel()  # cliente desconectou
+            resultados = await asyncio.gather(*aguardando)
+            assert lider.cancelled()
+            return resultados
+
+        assert asyncio.run(cenario()) == [{"total": 1}] * 3
+        assert len(chamadas) == 1
+
+    def test_falha_do_lider_faz_um_dos_que_aguardam_recalcular(self, monkeypatch):
+        cache_tenant = self._cache(monkeypatch)
+        chamadas = []
+
+        async def calcular():
+            chamadas.append(1)
+            await asyncio.sleep(0.02)
+            if len(chamadas) == 1:
+                raise RuntimeError("conexão perdida")
+            return {"total": 2}
+
+        async def cenario():
+            tarefas = [asyncio.create_task(cache_tenant.obter_ou_calcular(TENANT, calcular)) for _ in range(4)]
+            # O lock do cálculo que falhou é liberado: o recálculo não espera ele expirar
+            return await asyncio.wait_for(asyncio.gather(*tarefas, return_exceptions=True), timeout=1)
+
+        resultados = asyncio.run(cenario())
+        assert isinstance(resultados[0], RuntimeError)
+        assert resultados[1:] == [{"total": 2}] * 3
+        assert len(chamadas) == 2
@@ -0,0 +1,55 @@
+import asyncio
+import uuid
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from app.schemas.cliente import ClienteCreate
+from app.services.cliente_service import ClienteService
+
+
+class _RepoFalso:
+    def __init__(self):
+        self.criados = []
+
+    async def criar(self, tenant_id, schema):
+        self.criados.append(schema)
+        agora = datetime.utcnow()
+        return {**schema.model_dump(), "id": uuid.uuid4(), "tenant_id": tenant_id, "ativo": True,
+                "versao": 1, "created_at": agora, "updated_at": agora}
+
+
+def _post(dados: dict):
+    repo = _RepoFalso()
+    asyncio.run(ClienteService(repo).criar_cliente(uuid.uuid4(), ClienteCreate.model_validate(dados)))
+    return repo.criados[0]
+
+
+def _importacao(dados: dict):
+    return ClienteService(_RepoFalso())._validar_lote([(2, dados)])
+
+
+class TestDocumentoCliente:
+    """POST e importação normalizam e validam CPF/CNPJ da mesma forma."""
+
+    def test_mascara_e_tipo_minusculo(self):
+        dados = {"nome": "Ana", "tipo": "pf", "cpf_cnpj": "123.456.789-01"}
+        criado = _post(dados)
+        registros, erros = _importacao(dados)
+        assert (criado.tipo.value, criado.cpf_cnpj) == ("PF", "12345678901")
+        assert not erros
+        assert registros[0][2:4] == ("PF", "12345678901")
+
+    @pytest.mark.parametrize("tipo, documento, mensagem", [
+        ("PF", "123.456.789-0", "CPF deve ter 11 dígitos"),
+        ("pj", "12.345.678/0001-9", "CNPJ deve ter 14 dígitos"),
+    ])
+    def test_mesma_regra_de_tamanho(self, tipo, documento, mensagem):
+        dados = {"nome": "Ana", "tipo": tipo, "cpf_cnpj": documento}
+        with pytest.raises(HTTPException) as exc:
+            _post(dados)
+        assert exc.value.status_code == 400 and exc.value.detail == mensagem
+        registros, erros = _importacao(dados)
+        assert not registros
+        assert erros[0].erros == [mensagem]
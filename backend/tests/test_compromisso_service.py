@@ -0,0 +1,54 @@
+import asyncio
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.schemas.compromisso import CompromissoUpdate
+from app.services.compromisso_service import CompromissoService
+
+
+class _RepoFalso:
+    def __init__(self):
+        self.consultas = []
+
+    async def listar_por_periodo(self, tenant_id, data_inicio, data_fim):
+        self.consultas.append((data_inicio, data_fim))
+        return []
+
+    async def obter_por_id(self, tenant_id, compromisso_id):
+        return SimpleNamespace(
+            data_hora_inicio=datetime(2026, 3, 2, 9), data_hora_fim=datetime(2026, 3, 2, 10), status="Agendado"
+        )
+
+    async def atualizar(self, tenant_id, compromisso_id, schema):
+        return None  # linha excluída antes do UPDATE
+
+
+class TestListarPorPeriodo:
+    def test_periodo_invertido_e_400_sem_consultar(self):
+        repo = _RepoFalso()
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(CompromissoService(repo).listar_por_periodo(
+                uuid.uuid4(), datetime(2026, 3, 3), datetime(2026, 3, 2)
+            ))
+        assert exc.value.status_code == 400
+        assert repo.consultas == []
+
+    def test_periodo_valido_consulta(self):
+        repo = _RepoFalso()
+        asyncio.run(CompromissoService(repo).listar_por_periodo(
+            uuid.uuid4(), datetime(2026, 3, 2), datetime(2026, 3, 3)
+        ))
+        assert repo.consultas == [(datetime(2026, 3, 2), datetime(2026, 3, 3))]
+
+
+class TestAtualizarCompromisso:
+    def test_excluido_durante_a_edicao_e_404(self):
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(CompromissoService(_RepoFalso()).atualizar_compromisso(
+                uuid.uuid4(), uuid.uuid4(), CompromissoUpdate(titulo="Medição")
+            ))
+        assert exc.value.status_code == 404
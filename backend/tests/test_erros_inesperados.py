@@ -0,0 +1,42 @@
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.middleware.pipeline import montar_middlewares
+
+ORIGEM = "http://localhost:5173"
+
+
+def _app() -> FastAPI:
+    app = FastAPI(middleware=montar_middlewares())
+
+    @app.get("/quebra")
+    async def quebra():
+        raise RuntimeError("bug")
+
+    @app.get("/stream-quebra")
+    async def stream_quebra():
+        async def corpo():
+            yield b"a"
+            raise RuntimeError("bug no meio")
+        return StreamingResponse(corpo())
+
+    return app
+
+
+class TestErrosInesperados:
+    def test_500_com_cors_e_headers_de_seguranca(self):
+        resposta = TestClient(_app()).get("/quebra", headers={"Origin": ORIGEM})
+        assert resposta.status_code == 500
+        assert resposta.json() == {"detail": "Internal Server Error"}
+        assert resposta.headers["access-control-allow-origin"] == ORIGEM
+        assert resposta.headers["x-content-type-options"] == "nosniff"
+
+    def test_erro_depois_do_inicio_da_resposta_e_relancado(self):
+        client = TestClient(_app())
+        try:
+            client.get("/stream-quebra")
+        except RuntimeError as exc:
+            assert str(exc) == "bug no meio"
+        else:
+            raise AssertionError("o erro do streaming deveria chegar ao servidor")
@@ -0,0 +1,53 @@
+import uuid
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.dependencies import get_current_tenant_id
+from app.routes import exportacao
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(exportacao.router, prefix="/api")
+    app.dependency_overrides[get_current_tenant_id] = lambda: uuid.uuid4()
+    return TestClient(app)
+
+
+class TestExportacaoFiltros:
+    """Filtros inválidos respondem 400 antes de o stream (e o 200) começar."""
+
+    def test_status_invalido(self, client):
+        resposta = client.get("/api/export/parcelas", params={"status": "Pago"})
+        assert resposta.status_code == 400
+        assert "Paga" in resposta.json()["detail"]
+
+    def test_periodo_invertido(self, client):
+        resposta = client.get("/api/export/pedidos", params={"data_inicio": "2026-02-01", "data_fim": "2026-01-01"})
+        assert resposta.status_code == 400
+
+
+@pytest.fixture
+def client_documentos():
+    try:
+        from app.routes import documentos
+    except OSError:  # WeasyPrint sem as bibliotecas do sistema (Pango); a imagem do backend as instala
+        pytest.skip("WeasyPrint indisponível")
+    app = FastAPI()
+    app.include_router(documentos.router, prefix="/api")
+    app.dependency_overrides[get_current_tenant_id] = lambda: uuid.uuid4()
+    return TestClient(app)
+
+
+class TestExportacaoZipFiltros:
+    def test_status_invalido(self, client_documentos):
+        resposta = client_documentos.get("/api/documentos/pedidos/exportar", params={"status": "Pago"})
+        assert resposta.status_code == 400
+
+    def test_periodo_invertido(self, client_documentos):
+        resposta = client_documentos.get(
+            "/api/documentos/pedidos/exportar", params={"data_inicio": "2026-02-01", "data_fim": "2026-01-01"}
+        )
+        assert resposta.status_code == 400
@@ -0,0 +1,51 @@
+from datetime import date
+
+import numpy as np
+
+from app.utils.fluxo_caixa import inicios_dos_periodos, somar_por_periodo
+
+
+def _datas(inicios):
+    return [str(d) for d in inicios]
+
+
+class TestIniciosDosPeriodos:
+    def test_dia(self):
+        assert len(inicios_dos_periodos(date(2026, 3, 1), date(2026, 4, 1), "dia")) == 31
+
+    def test_semana_comeca_na_segunda(self):
+        # 2026-03-01 é domingo: primeiro período parcial, depois segundas-feiras
+        inicios = inicios_dos_periodos(date(2026, 3, 1), date(2026, 3, 20), "semana")
+        assert _datas(inicios) == ["2026-03-01", "2026-03-02", "2026-03-09", "2026-03-16"]
+
+    def test_semana_iniciando_numa_segunda(self):
+        inicios = inicios_dos_periodos(date(2026, 3, 2), date(2026, 3, 10), "semana")
+        assert _datas(inicios) == ["2026-03-02", "2026-03-09"]
+
+    def test_mes(self):
+        inicios = inicios_dos_periodos(date(2026, 11, 15), date(2027, 2, 1), "mes")
+        assert _datas(inicios) == ["2026-11-15", "2026-12-01", "2027-01-01"]
+
+
+class TestSomarPorPeriodo:
+    def test_soma_por_semana_e_ignora_fora_da_janela(self):
+        inicio, fim = date(2026, 3, 1), date(2026, 3, 20)
+        inicios = inicios_dos_periodos(inicio, fim, "semana")
+        total_dias = (fim - inicio).days
+        # deslocamentos: dia 0 (dom), 1 e 7 (2ª semana), 8 (3ª), 18 (4ª), -1 e 19 fora
+        dias = np.array([0, 1, 7, 8, 18, -1, 19], dtype=np.int64)
+        centavos = np.array([100, 250, 50, 1, 999, 7, 7], dtype=np.int64)
+        somas = somar_por_periodo(dias, centavos, inicios, total_dias)
+        assert somas.dtype == np.int64
+        assert somas.tolist() == [100, 300, 1, 999]
+
+    def test_sem_linhas(self):
+        inicios = inicios_dos_periodos(date(2026, 1, 1), date(2026, 4, 1), "mes")
+        vazio = np.array([], dtype=np.int64)
+        assert somar_por_periodo(vazio, vazio, inicios, 90).tolist() == [0, 0, 0]
+
+    def test_centavos_grandes_exatos(self):
+        inicios = inicios_dos_periodos(date(2026, 1, 1), date(2026, 1, 3), "dia")
+        centavos = np.array([2**52, 1, 3], dtype=np.int64)
+        somas = somar_por_periodo(np.array([0, 0, 1], dtype=np.int64), centavos, inicios, 2)
+        assert somas.tolist() == [2**52 + 1, 3]
@@ -0,0 +1,95 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+from starlette.middleware import Middleware
+
+from app.config import settings
+from app.core.instrumentacao_sql import ConsultasRequisicao, OrcamentoConsultasExcedido, formato_statement, instrumentar
+from app.middleware.instrumentacao_sql import InstrumentacaoSQLMiddleware
+
+
+@pytest.fixture
+def banco():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    instrumentar(engine)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE pedidos (id INTEGER PRIMARY KEY, cliente_id INTEGER)"))
+        conn.execute(text("CREATE TABLE clientes (id INTEGER PRIMARY KEY, nome TEXT)"))
+        for i in range(10):
+            conn.execute(text("INSERT INTO clientes VALUES (:i, 'Cliente ' || :i)"), {"i": i})
+            conn.execute(text("INSERT INTO pedidos VALUES (:i, :i)"), {"i": i})
+    return engine
+
+
+@pytest.fixture
+def client(banco):
+    app = FastAPI(middleware=[Middleware(InstrumentacaoSQLMiddleware)])
+
+    @app.get("/pedidos")
+    async def pedidos_n_mais_1():
+        # N+1 proposital: um SELECT por pedido para buscar o cliente
+        with banco.connect() as conn:
+            linhas = conn.execute(text("SELECT id, cliente_id FROM pedidos")).all()
+            return [
+                conn.execute(text("SELECT nome FROM clientes WHERE id = :id"), {"id": cliente_id}).scalar()
+                for _, cliente_id in linhas
+            ]
+
+    @app.get("/pedidos-join")
+    async def pedidos_com_join():
+        with banco.connect() as conn:
+            return conn.execute(text("SELECT c.nome FROM pedidos p JOIN clientes c ON c.id = p.cliente_id")).scalars().all()
+
+    return TestClient(app)
+
+
+@pytest.fixture
+def orcamento(monkeypatch):
+    monkeypatch.setattr(settings, "SQL_ORCAMENTO_ROTAS", {"GET /pedidos": 3, "GET /pedidos-join": 3})
+
+
+class TestOrcamentoEstrito:
+    def test_n_mais_1_falha_no_modo_estrito(self, client, orcamento, monkeypatch):
+        monkeypatch.setattr(settings, "SQL_ORCAMENTO_ESTRITO", True)
+        with pytest.raises(OrcamentoConsultasExcedido, match=r"GET /pedidos: 11 consultas \(orçamento 3\)"):
+            client.get("/pedidos")
+
+    def test_dentro_do_orcamento_passa(self, client, orcamento, monkeypatch):
+        monkeypatch.setattr(settings, "SQL_ORCAMENTO_ESTRITO", True)
+        resposta = client.get("/pedidos-join")
+        assert resposta.status_code == 200
+        assert 'desc="1 consultas"' in resposta.headers["server-timing"]
+
+    def test_sem_modo_estrito_so_registra(self, client, orcamento, monkeypatch):
+        monkeypatch.setattr(settings, "SQL_ORCAMENTO_ESTRITO", False)
+        resposta = client.get("/pedidos")
+        assert resposta.status_code == 200
+        assert 'desc="11 consultas"' in resposta.headers["server-timing"]
+
+
+class TestFormatoStatement:
+    def test_placeholders_de_cada_driver(self):
+        esperado = "SELECT * FROM clientes WHERE tenant_id = ? AND id = ?"
+        for sql in (
+            "SELECT * FROM clientes WHERE tenant_id = $1 AND id = $2",
+            "SELECT * FROM clientes WHERE tenant_id = %(tenant_id)s AND id = %(id_1)s",
+            "SELECT * FROM clientes WHERE tenant_id = %s AND id = %s",
+            "SELECT *\n  FROM clientes\n WHERE tenant_id = ?   AND id = ?",
+        ):
+            assert formato_statement(sql) == esperado
+
+    def test_listas_in_de_qualquer_tamanho(self):
+        um = formato_statement("SELECT * FROM itens_pedido WHERE pedido_id IN ($1::UUID)")
+        tres = formato_statement("SELECT * FROM itens_pedido WHERE pedido_id IN ($1::UUID, $2::UUID, $3::UUID)")
+        assert um == tres == "SELECT * FROM itens_pedido WHERE pedido_id IN (?...)"
+
+    def test_suspeitas_n_mais_1(self, monkeypatch):
+        monkeypatch.setattr(settings, "SQL_N_MAIS_1_REPETICOES", 3)
+        registro = ConsultasRequisicao()
+        for i in range(4):
+            registro.registrar(f"SELECT nome FROM clientes WHERE id = ${i + 1}", 1.0)
+        registro.registrar("SELECT 1", 0.5)
+        assert registro.quantidade == 5
+        assert registro.suspeitas_n_mais_1() == [("SELECT nome FROM clientes WHERE id = ?", 4)]
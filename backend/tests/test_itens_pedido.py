@@ -0,0 +1,53 @@
+import uuid
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from app.utils.itens_pedido import comparar_itens, valor_item
+
+
+def _item(id=None, descricao="Porta", quantidade="2", preco="10.00", **extra):
+    return SimpleNamespace(
+        id=id, descricao=descricao, quantidade=Decimal(quantidade), unidade="un",
+        preco_unitario=Decimal(preco), observacoes=extra.get("observacoes")
+    )
+
+
+class TestValorItem:
+    def test_arredonda_ao_centavo(self):
+        assert valor_item(Decimal("3"), Decimal("0.335")) == Decimal("1.01")
+
+    def test_sem_quantidade_ou_preco(self):
+        assert valor_item(None, Decimal("10")) == 0
+        assert valor_item(Decimal("1"), None) == 0
+
+
+class TestCompararItens:
+    def test_sem_mudancas(self):
+        a = _item(uuid.uuid4())
+        diff = comparar_itens([a], [_item(a.id)])
+        assert diff.vazio
+        assert diff.delta_subtotal == 0
+
+    def test_atualiza_insere_e_remove(self):
+        mantido, alterado, removido = _item(uuid.uuid4()), _item(uuid.uuid4()), _item(uuid.uuid4(), preco="5.00")
+        diff = comparar_itens(
+            [mantido, alterado, removido],
+            [_item(mantido.id), _item(alterado.id, quantidade="3"), _item(preco="7.50")]
+        )
+        assert [d["id"] for d in diff.atualizar] == [alterado.id]
+        assert diff.atualizar[0]["quantidade"] == Decimal("3")
+        assert len(diff.inserir) == 1 and "id" not in diff.inserir[0]
+        assert diff.remover == [removido.id]
+        # +10 (2 -> 3 unidades) +15 (novo) -10 (removido)
+        assert diff.delta_subtotal == Decimal("15.00")
+
+    def test_id_de_outro_pedido(self):
+        with pytest.raises(ValueError):
+            comparar_itens([_item(uuid.uuid4())], [_item(uuid.uuid4())])
+
+    def test_id_repetido(self):
+        a = _item(uuid.uuid4())
+        with pytest.raises(ValueError):
+            comparar_itens([a], [_item(a.id), _item(a.id, quantidade="5")])
@@ -0,0 +1,39 @@
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.utils.paginacao import codificar_cursor, decodificar_cursor, separar_pagina
+
+
+class TestCursor:
+    def test_ida_e_volta(self):
+        created_at, id = datetime(2026, 3, 1, 12, 30, 15, 123456), uuid.uuid4()
+        cursor = codificar_cursor(created_at, id)
+        assert "=" not in cursor  # sem padding: vai direto na query string
+        assert decodificar_cursor(cursor) == (created_at, id)
+
+    @pytest.mark.parametrize("cursor", ["", "nao-e-base64!", "e30", codificar_cursor(datetime(2026, 1, 1), uuid.uuid4())[:-3]])
+    def test_cursor_invalido(self, cursor):
+        with pytest.raises(HTTPException) as exc:
+            decodificar_cursor(cursor)
+        assert exc.value.status_code == 400
+
+
+class TestSepararPagina:
+    @staticmethod
+    def _linhas(n):
+        return [SimpleNamespace(created_at=datetime(2026, 1, 1, 0, i), id=uuid.uuid4()) for i in range(n)]
+
+    def test_com_proxima_pagina(self):
+        linhas = self._linhas(4)
+        itens, proximo = separar_pagina(linhas, 3)
+        assert itens == linhas[:3]
+        assert decodificar_cursor(proximo) == (linhas[2].created_at, linhas[2].id)
+
+    def test_ultima_pagina(self):
+        linhas = self._linhas(3)
+        assert separar_pagina(linhas, 3) == (linhas, None)
+        assert separar_pagina([], 3) == ([], None)
@@ -0,0 +1,55 @@
+import os
+import uuid
+
+import pytest
+
+from app.core.pdf_cache import CachePDF
+
+T = uuid.uuid4()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return CachePDF(str(tmp_path), max_bytes=1000)
+
+
+def _tamanho_em_disco(diretorio) -> int:
+    return sum(os.path.getsize(os.path.join(raiz, nome)) for raiz, _, nomes in os.walk(diretorio) for nome in nomes)
+
+
+class TestCachePDF:
+    def test_grava_e_le(self, cache):
+        pedido = uuid.uuid4()
+        cache.gravar(T, pedido, "v1", b"%PDF-1")
+        assert cache.obter(T, pedido, "v1") == b"%PDF-1"
+        assert cache.obter(T, pedido, "v2") is None
+
+    def test_versao_nova_substitui_a_antiga(self, cache):
+        pedido = uuid.uuid4()
+        cache.gravar(T, pedido, "v1", b"a" * 100)
+        cache.gravar(T, pedido, "v2", b"b" * 50)
+        assert cache.obter(T, pedido, "v1") is None
+        assert cache._total == 50 == _tamanho_em_disco(cache.diretorio)
+
+    def test_contador_sem_percorrer_a_arvore(self, cache, monkeypatch):
+        cache.gravar(T, uuid.uuid4(), "v1", b"x" * 100)  # primeira gravação: conta o diretório
+        percorridas = []
+        original = cache._evictar
+        monkeypatch.setattr(cache, "_evictar", lambda: percorridas.append(1) or original())
+        pedidos = [uuid.uuid4() for _ in range(5)]
+        for pedido in pedidos:
+            cache.gravar(T, pedido, "v1", b"x" * 100)
+        assert percorridas == []
+        cache.invalidar(T, pedidos[0])
+        assert cache._total == 500 == _tamanho_em_disco(cache.diretorio)
+
+    def test_evicta_os_menos_usados_ao_passar_do_limite(self, cache):
+        pedidos = [uuid.uuid4() for _ in range(4)]
+        for i, pedido in enumerate(pedidos):
+            cache.gravar(T, pedido, "v1", b"x" * 300)
+            caminho = os.path.join(cache._diretorio_pedido(T, pedido), "v1.pdf")
+            os.utime(caminho, (1000 + i, 1000 + i))  # mtime crescente: o primeiro é o menos usado
+        # 1200 > 1000: apaga até ficar em no máximo 900
+        assert cache.obter(T, pedidos[0], "v1") is None
+        assert all(cache.obter(T, p, "v1") for p in pedidos[1:])
+        assert cache._total == 900 == _tamanho_em_disco(cache.diretorio)
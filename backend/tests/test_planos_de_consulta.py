@@ -0,0 +1,199 @@
+"""
+Regressão de planos de consulta (EXPLAIN) dos repositórios.
+
+Cada caso executa uma consulta de leitura contra o PostgreSQL de
+DATABASE_URL (com as migrations aplicadas), captura o SQL realmente emitido
+(SELECT e WITH) e roda EXPLAIN (FORMAT JSON) sobre ele: falha se algum plano
+tiver Seq Scan numa tabela da aplicação.
+
+A checagem roda com enable_seqscan=off: o Seq Scan só aparece se não existir
+índice utilizável, o que torna o resultado independente do volume de dados.
+Sem banco acessível, o módulo é pulado.
+
+    DATABASE_URL=postgresql+psycopg://... alembic upgrade head
+    DATABASE_URL=postgresql+psycopg://... pytest tests/test_planos_de_consulta.py
+"""
+import asyncio
+import json
+import os
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+
+from app.core.database import AsyncSessionLocal, async_engine, engine
+from app.repos.cliente_repo import ClienteRepository
+from app.repos.compromisso_repo import CompromissoRepository
+from app.repos.exportacao_repo import ExportacaoRepository
+from app.repos.financeiro_repo import FinanceiroRepository
+from app.repos.pagamento_repo import PagamentoRepository
+from app.repos.pedido_repo import PedidoRepository
+from app.services.financeiro_service import FinanceiroService
+from app.utils.paginacao import codificar_cursor
+
+TABELAS = {"clientes", "pedidos", "itens_pedido", "pagamentos", "parcelas", "compromissos", "vendas_mensais"}
+TENANTS = [uuid.UUID(int=0xE0 + i) for i in range(3)]
+T = TENANTS[0]
+ID = uuid.uuid4()
+CURSOR = codificar_cursor(datetime.utcnow(), uuid.uuid4())
+INICIO, FIM = datetime.utcnow(), datetime.utcnow() + timedelta(days=30)
+LINHAS = int(os.getenv("PLANOS_LINHAS", "1000"))  # clientes/pedidos por tenant
+
+
+CONSULTAS = {
+    "ClienteRepository.listar": lambda db: ClienteRepository(db).listar(T, limit=100),
+    "ClienteRepository.listar (cursor)": lambda db: ClienteRepository(db).listar(T, limit=100, cursor=CURSOR),
+    "ClienteRepository.obter_por_id": lambda db: ClienteRepository(db).obter_por_id(T, ID),
+    "PedidoRepository.listar": lambda db: PedidoRepository(db).listar(T, limit=100),
+    "PedidoRepository.listar (cursor)": lambda db: PedidoRepository(db).listar(T, limit=100, cursor=CURSOR),
+    "PedidoRepository.obter_por_id": lambda db: PedidoRepository(db).obter_por_id(T, ID, com_cliente=True),
+    "PedidoRepository.listar_para_exportacao": lambda db: PedidoRepository(db).listar_para_exportacao(
+        T, INICIO.date(), FIM.date(), status="Aprovado", cliente_id=ID
+    ),
+    "PedidoRepository.listar_para_exportacao (cursor)": lambda db: PedidoRepository(db).listar_para_exportacao(
+        T, cursor=CURSOR
+    ),
+    "PagamentoRepository.listar_pagamentos": lambda db: PagamentoRepository(db).listar_pagamentos(T, ID, limit=100),
+    "PagamentoRepository.listar_pagamentos (cursor)": lambda db: PagamentoRepository(db).listar_pagamentos(T, limit=100, cursor=CURSOR),
+    "PagamentoRepository.obter_pagamento_por_id": lambda db: PagamentoRepository(db).obter_pagamento_por_id(T, ID),
+    "PagamentoRepository.listar_parcelas_por_pedido": lambda db: PagamentoRepository(db).listar_parcelas_por_pedido(T, ID, limit=100),
+    "PagamentoRepository.obter_parcela_por_id": lambda db: PagamentoRepository(db).obter_parcela_por_id(T, ID),
+    "CompromissoRepository.listar": lambda db: CompromissoRepository(db).listar(T, limit=100, data_inicio=INICIO, data_fim=FIM),
+    "CompromissoRepository.listar (cliente)": lambda db: CompromissoRepository(db).listar(T, limit=100, cliente_id=ID),
+    "CompromissoRepository.obter_por_id": lambda db: CompromissoRepository(db).obter_por_id(T, ID),
+    "CompromissoRepository.listar_por_periodo": lambda db: CompromissoRepository(db).listar_por_periodo(T, INICIO, FIM),
+    "CompromissoRepository.obter_conflito": lambda db: CompromissoRepository(db).obter_conflito(T, INICIO, FIM, ID),
+    "CompromissoRepository.listar_intervalos_ocupados": lambda db: CompromissoRepository(db).listar_intervalos_ocupados(T, INICIO, FIM),
+    "FinanceiroRepository.colunas_fluxo_caixa": lambda db: FinanceiroRepository(db).colunas_fluxo_caixa(T, INICIO.date(), FIM.date()),
+    # Direto no cálculo: pelo obter_dashboard o cache Redis esconderia as consultas
+    "FinanceiroService._calcular_dashboard": lambda db: FinanceiroService(FinanceiroRepository(db))._calcular_dashboard(T),
+    "ExportacaoRepository.consulta (pedidos)": lambda db: db.execute(
+        ExportacaoRepository(db).consulta("pedidos", T, status="Aprovado", data_inicio=INICIO.date(), data_fim=FIM.date())
+    ),
+    "ExportacaoRepository.consulta (pagamentos)": lambda db: db.execute(
+        ExportacaoRepository(db).consulta("pagamentos", T, pedido_id=ID, status="Pago")
+    ),
+    "ExportacaoRepository.consulta (parcelas)": lambda db: db.execute(
+        ExportacaoRepository(db).consulta("parcelas", T, cliente_id=ID, status="Pendente")
+    ),
+}
+
+
+def _primeiro_rotulo(conn, tabela: str, coluna: str) -> str:
+    """Expressão SQL com um valor válido para colunas ENUM (nomes de tipo variam)."""
+    udt = conn.execute(text("""
+        SELECT udt_name FROM information_schema.columns
+        WHERE table_name = :tabela AND column_name = :coluna
+    """), {"tabela": tabela, "coluna": coluna}).scalar()
+    return f'(enum_range(NULL::"{udt}"))[1]'
+
+
+def popular(linhas: int):
+    """Popula alguns tenants com dados sintéticos (idempotente por tenant)."""
+    with engine.begin() as conn:
+        status_pedido = _primeiro_rotulo(conn, "pedidos", "status")
+        metodo = _primeiro_rotulo(conn, "pagamentos", "metodo")
+        status_pagamento = _primeiro_rotulo(conn, "pagamentos", "status")
+        status_parcela = _primeiro_rotulo(conn, "parcelas", "status")
+        for tenant in TENANTS:
+            if conn.execute(text("SELECT 1 FROM clientes WHERE tenant_id = :t LIMIT 1"), {"t": tenant}).first():
+                continue
+            p = {"t": tenant, "n": linhas}
+            conn.execute(text("INSERT INTO tenants (id, name) VALUES (:t, 'planos') ON CONFLICT DO NOTHING"), p)
+            conn.execute(text("""
+                INSERT INTO clientes (id, tenant_id, nome, tipo, cpf_cnpj, ativo, created_at, updated_at)
+                SELECT gen_random_uuid(), :t, 'Cliente ' || g, 'PF', lpad(g::text, 11, '0'), true,
+                       now() - (g || ' minutes')::interval, now()
+                FROM generate_series(1, :n) g
+            """), p)
+            conn.execute(text(f"""
+                INSERT INTO pedidos (id, tenant_id, cliente_id, numero, status, valor_total, created_at, updated_at)
+                SELECT gen_random_uuid(), c.tenant_id, c.id, 'P-' || row_number() OVER (), {status_pedido},
+                       100, c.created_at, now()
+                FROM clientes c WHERE c.tenant_id = :t
+            """), p)
+            conn.execute(text("""
+                INSERT INTO itens_pedido (id, tenant_id, pedido_id, descricao, quantidade, unidade, preco_unitario, created_at, updated_at)
+                SELECT gen_random_uuid(), tenant_id, id, 'Item', 1, 'un', 100, created_at, now()
+                FROM pedidos WHERE tenant_id = :t
+            """), p)
+            conn.execute(text(f"""
+                INSERT INTO pagamentos (id, tenant_id, pedido_id, valor, data_pagamento, metodo, status, created_at, updated_at)
+                SELECT gen_random_uuid(), tenant_id, id, 50, created_at, {metodo}, {status_pagamento}, created_at, now()
+                FROM pedidos WHERE tenant_id = :t
+            """), p)
+            conn.execute(text(f"""
+                INSERT INTO parcelas (id, tenant_id, pedido_id, numero_parcela, valor_parcela, data_vencimento, status, created_at, updated_at)
+                SELECT gen_random_uuid(), tenant_id, id, 1, 50, created_at::date + 30, {status_parcela}, created_at, now()
+                FROM pedidos WHERE tenant_id = :t
+            """), p)
+            conn.execute(text("""
+                INSERT INTO compromissos (id, tenant_id, cliente_id, pedido_id, titulo, tipo, status,
+                                          data_hora_inicio, data_hora_fim, created_at, updated_at)
+                SELECT gen_random_uuid(), tenant_id, cliente_id, id, 'Visita', 'Visita', 'Agendado',
+                       created_at + interval '1 day', created_at + interval '1 day 2 hours', created_at, now()
+                FROM pedidos WHERE tenant_id = :t
+            """), p)
+        # Os inserts acima passam pelos triggers do rollup (migration 011)
+        for tabela in sorted(TABELAS):
+            conn.execute(text(f"ANALYZE {tabela}"))
+
+
+def _seq_scans(no: dict) -> list[str]:
+    encontrados = []
+    if no.get("Node Type") == "Seq Scan" and no.get("Relation Name") in TABELAS:
+        encontrados.append(no["Relation Name"])
+    for filho in no.get("Plans", []):
+        encontrados.extend(_seq_scans(filho))
+    return encontrados
+
+
+@pytest.fixture(scope="module", autouse=True)
+def banco_populado():
+    try:
+        with engine.connect():
+            pass
+    except OperationalError:
+        pytest.skip("PostgreSQL de DATABASE_URL indisponível")
+    popular(LINHAS)
+
+
+async def _planos(consulta) -> list[tuple[str, list[str]]]:
+    capturadas: list[tuple[str, object]] = []
+
+    def capturar(conn, cursor, statement, parameters, context, executemany):
+        inicio = statement.lstrip()[:4].upper()
+        if inicio in ("SELE", "WITH") and "set_config" not in statement:
+            capturadas.append((statement, parameters))
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", capturar)
+    try:
+        async with AsyncSessionLocal(info={"tenant_id": str(T)}) as db:
+            await consulta(db)
+            await db.rollback()
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", capturar)
+
+    planos = []
+    try:
+        async with async_engine.connect() as conn:
+            await conn.exec_driver_sql("SET enable_seqscan = off")
+            for statement, parameters in capturadas:
+                plano = (await conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters)).scalar()
+                plano = json.loads(plano) if isinstance(plano, str) else plano
+                planos.append((statement, _seq_scans(plano[0]["Plan"])))
+            await conn.rollback()
+    finally:
+        # Cada caso roda no seu próprio event loop (asyncio.run)
+        await async_engine.dispose()
+    return planos
+
+
+@pytest.mark.parametrize("nome", list(CONSULTAS))
+def test_sem_seq_scan(nome):
+    planos = asyncio.run(_planos(CONSULTAS[nome]))
+    assert planos, f"{nome} não emitiu nenhuma consulta"
+    for statement, tabelas in planos:
+        assert not tabelas, f"Seq Scan em {', '.join(sorted(set(tabelas)))}: {statement.strip()[:300]}"
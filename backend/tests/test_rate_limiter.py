@@ -0,0 +1,141 @@
+import asyncio
+
+from fastapi import Depends, FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+from starlette.middleware import Middleware
+from starlette.requests import Request
+
+from app.middleware import rate_limiter
+from app.middleware.rate_limiter import RateLimitHeadersMiddleware, ResultadoLimite, limitar_requisicao
+
+
+def _app() -> FastAPI:
+    app = FastAPI(middleware=[Middleware(RateLimitHeadersMiddleware)], dependencies=[Depends(limitar_requisicao)])
+
+    @app.get("/modelo")
+    async def modelo():
+        return {"ok": True}
+
+    @app.get("/texto")
+    async def texto():
+        return PlainTextResponse("ok")
+
+    @app.get("/stream")
+    async def stream():
+        return StreamingResponse(iter([b"a", b"b"]), media_type="text/plain")
+
+    return app
+
+
+class TestRateLimitHeaders:
+    def test_headers_em_qualquer_tipo_de_resposta(self, monkeypatch):
+        async def verificar(identidade, rota, limite):
+            return ResultadoLimite(True, limite, 41, 17)
+
+        monkeypatch.setattr(rate_limiter, "verificar_limite", verificar)
+        client = TestClient(_app())
+        for caminho in ("/modelo", "/texto", "/stream"):
+            resposta = client.get(caminho)
+            assert resposta.status_code == 200
+            assert resposta.headers["x-ratelimit-remaining"] == "41"
+            assert resposta.headers["x-ratelimit-reset"] == "17"
+            assert resposta.headers["x-ratelimit-limit"] == "60"
+
+    def test_429_com_retry_after(self, monkeypatch):
+        async def verificar(identidade, rota, limite):
+            return ResultadoLimite(False, limite, 0, 9)
+
+        monkeypatch.setattr(rate_limiter, "verificar_limite", verificar)
+        resposta = TestClient(_app()).get("/texto")
+        assert resposta.status_code == 429
+        assert resposta.headers["retry-after"] == "9"
+        assert resposta.headers["x-ratelimit-remaining"] == "0"
+
+
+class TestCota:
+    @staticmethod
+    def _request(plano=None):
+        estado = {"tenant_id": "t1", "plano": plano} if plano else {}
+        return Request({"type": "http", "state": estado, "client": ("10.0.0.1", 1234), "headers": []})
+
+    def test_cota_do_plano_sem_override(self):
+        assert rate_limiter._cota(self._request("pro"), "GET /api/clientes/") == ("t:t1", 1800)
+        assert rate_limiter._cota(self._request("padrao"), "GET /api/clientes/") == ("t:t1", 600)
+        assert rate_limiter._cota(self._request(), "GET /api/clientes/") == ("ip:10.0.0.1", 60)
+
+    def test_override_da_rota_por_plano(self):
+        rota = "GET /api/export/{entidade}"
+        assert rate_limiter._cota(self._request("pro"), rota)[1] == 30
+        assert rate_limiter._cota(self._request("padrao"), rota)[1] == 10
+        # Plano sem entrada na rota usa a entrada "padrao" da rota
+        assert rate_limiter._cota(self._request("enterprise"), rota)[1] == 10
+        assert rate_limiter._cota(self._request(), "POST /api/auth/login")[1] == 20
+
+
+class _RedisFalso:
+    def __init__(self):
+        self.dados = {}
+
+    async def get(self, chave):
+        return self.dados.get(chave)
+
+    async def set(self, chave, valor, ex=None):
+        self.dados[chave] = valor
+
+    async def delete(self, chave):
+        self.dados.pop(chave, None)
+
+
+class TestPlanoDoServidor:
+    """A cota segue o plano atual do tenant, não o claim do JWT (válido por 8 dias)."""
+
+    def _limites(self, monkeypatch, planos_no_banco):
+        redis = _RedisFalso()
+        consultas = []
+        limites = []
+
+        async def plano_no_banco(tenant_id):
+            consultas.append(tenant_id)
+            return planos_no_banco[-1]
+
+        async def verificar(identidade, rota, limite):
+            limites.append(limite)
+            return ResultadoLimite(True, limite, limite - 1, 60)
+
+        monkeypatch.setattr(rate_limiter, "get_redis", lambda: redis)
+        monkeypatch.setattr(rate_limiter, "_plano_no_banco", plano_no_banco)
+        monkeypatch.setattr(rate_limiter, "verificar_limite", verificar)
+        return redis, consultas, limites
+
+    @staticmethod
+    def _app_com_claim(plano_do_token: str) -> FastAPI:
+        app = _app()
+
+        @app.middleware("http")
+        async def autenticado(request, call_next):
+            request.state.tenant_id = "t1"
+            request.state.plano = plano_do_token
+            return await call_next(request)
+
+        return app
+
+    def test_upgrade_vale_sem_novo_login(self, monkeypatch):
+        planos = ["pro"]
+        _, consultas, limites = self._limites(monkeypatch, planos)
+        client = TestClient(self._app_com_claim("padrao"))
+        client.get("/texto")
+        client.get("/texto")
+        assert limites == [1800, 1800]
+        assert consultas == ["t1"]  # segunda requisição: cache no Redis
+
+    def test_invalidar_aplica_na_proxima_requisicao(self, monkeypatch):
+        planos = ["pro"]
+        _, consultas, limites = self._limites(monkeypatch, planos)
+        client = TestClient(self._app_com_claim("pro"))
+        client.get("/texto")
+        planos.append("padrao")  # downgrade
+        asyncio.run(rate_limiter.invalidar_plano("t1"))
+        client.get("/texto")
+        assert limites == [1800, 600]
+        assert len(consultas) == 2
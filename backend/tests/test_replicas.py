@@ -0,0 +1,32 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import database
+from app.core.database import TenantSession, async_engine, no_primario
+
+REPLICA = object()
+
+
+class _Roteador:
+    def escolher(self):
+        return REPLICA
+
+
+def _sessao() -> AsyncSession:
+    db = AsyncSession(bind=async_engine, sync_session_class=TenantSession)
+    db.info.update({"permite_replica": True, "somente_leitura": True})
+    return db
+
+
+class TestRoteamentoReplicas:
+    def test_leitura_vai_para_replica(self, monkeypatch):
+        monkeypatch.setattr(database, "roteador_replicas", _Roteador())
+        assert _sessao().sync_session.get_bind(clause=select(1)) is REPLICA
+
+    def test_no_primario_ignora_replica(self, monkeypatch):
+        monkeypatch.setattr(database, "roteador_replicas", _Roteador())
+        db = _sessao()
+        with no_primario(db):
+            assert db.sync_session.get_bind(clause=select(1)) is async_engine.sync_engine
+        assert db.info["permite_replica"] is True
+        assert db.sync_session.get_bind(clause=select(1)) is REPLICA
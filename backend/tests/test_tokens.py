@@ -0,0 +1,71 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from jose import jwt
+
+from app.config import settings
+from app.core import tokens
+from app.core.tokens import TokenInvalido, _CacheClaims, criar_token, verificar_token
+
+
+@pytest.fixture(autouse=True)
+def cache_limpo():
+    tokens.limpar_cache_tokens()
+    yield
+    tokens.limpar_cache_tokens()
+
+
+def _token_sem_kid() -> str:
+    claims = {"exp": datetime.utcnow() + timedelta(minutes=5), "sub": "u1", "tenant_id": "t1"}
+    return jwt.encode(claims, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+class TestKid:
+    def test_token_com_kid(self):
+        assert verificar_token(criar_token("u1", "t1", plano="pro"))["plano"] == "pro"
+
+    def test_sem_kid_recusado_por_padrao(self, monkeypatch):
+        monkeypatch.setattr(settings, "JWT_ACEITAR_SEM_KID", False)
+        with pytest.raises(TokenInvalido):
+            verificar_token(_token_sem_kid())
+
+    def test_sem_kid_aceito_na_transicao(self, monkeypatch):
+        monkeypatch.setattr(settings, "JWT_ACEITAR_SEM_KID", True)
+        assert verificar_token(_token_sem_kid())["sub"] == "u1"
+
+    def test_kid_desconhecido(self):
+        token = jwt.encode({"sub": "u1"}, "outra", algorithm=settings.ALGORITHM, headers={"kid": "antiga"})
+        with pytest.raises(TokenInvalido):
+            verificar_token(token)
+
+
+class TestCacheClaims:
+    def test_guarda_e_obtem(self):
+        cache = _CacheClaims(tamanho=2)
+        cache.guardar(b"a", {"sub": "1"}, time.time() + 60)
+        assert cache.obter(b"a") == {"sub": "1"}
+        assert cache.obter(b"b") is None
+
+    def test_expirado_sai_do_cache(self):
+        cache = _CacheClaims(tamanho=2)
+        cache.guardar(b"a", {"sub": "1"}, time.time() - 1)
+        assert cache.obter(b"a") is None
+        assert len(cache._itens) == 0
+
+    def test_lru_descarta_o_menos_usado(self):
+        cache = _CacheClaims(tamanho=2)
+        exp = time.time() + 60
+        cache.guardar(b"a", {"sub": "a"}, exp)
+        cache.guardar(b"b", {"sub": "b"}, exp)
+        cache.obter(b"a")  # "b" passa a ser o menos usado
+        cache.guardar(b"c", {"sub": "c"}, exp)
+        assert cache.obter(b"b") is None
+        assert cache.obter(b"a") == {"sub": "a"}
+        assert cache.obter(b"c") == {"sub": "c"}
+
+    def test_limpar(self):
+        cache = _CacheClaims(tamanho=2)
+        cache.guardar(b"a", {"sub": "a"}, time.time() + 60)
+        cache.limpar()
+        assert cache.obter(b"a") is None
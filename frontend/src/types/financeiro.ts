@@ -4,6 +4,7 @@ export interface DashboardData {
         qtd_pedidos: number;
         ticket_medio: number;
     };
+    pedidos_por_status: Record<string, number>;
     grafico: {
         mes: string;
         total: number;